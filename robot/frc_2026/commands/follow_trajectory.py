@@ -0,0 +1,115 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Drive the XRP along a time parameterized Trajectory.
+#
+# Each loop the reference for the elapsed time comes from a TrajectoryCursor (so
+# the cost per loop does not depend on the trajectory length), a Ramsete
+# controller corrects for the odometry error and the result is applied as open
+# loop wheel outputs, scaled by the free wheel speed (wheel_outputs()). The
+# drive has no velocity loop, so that scaling is what the tracking relies on;
+# 'python -m lib_6107.trajectory.follower' checks it on the drivetrain model.
+#
+import logging
+
+from typing import Optional
+
+from wpilib import Timer
+from wpimath.geometry import Pose2d, Rotation2d
+
+from frc_2026.subsystems.xrp_differential_drive import XrpDifferentialDriveSubsystem
+from lib_6107.commands.profiled_command import ProfiledCommand
+from lib_6107.telemetry.recorder import TelemetryChannel, TelemetryRecorder
+from lib_6107.trajectory.follower import RamseteController, TrajectoryCursor
+from lib_6107.trajectory.generator import Trajectory
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_CHANNEL = "follower/reference"
+
+
+class FollowTrajectory(ProfiledCommand):
+    """
+    Follow a trajectory with a Ramsete controller on the drive odometry
+    """
+    def __init__(self, drive: XrpDifferentialDriveSubsystem, trajectory: Trajectory,
+                 telemetry: Optional[TelemetryRecorder] = None, reset_pose: bool = True,
+                 controller: Optional[RamseteController] = None, name: str = "FollowTrajectory"):
+        """
+        :param drive:      Drive subsystem
+        :param trajectory: Trajectory to follow, in field coordinates
+        :param telemetry:  Recorder for the reference pose ('follower/reference')
+        :param reset_pose: Reset the odometry to the start of the trajectory when the command starts
+        :param controller: Tracking controller, defaults to RamseteController()
+        :param name:       Command name
+        """
+        super().__init__()
+        self.setName(name)
+
+        self._drive = drive
+        self._cursor = TrajectoryCursor(trajectory)
+        self._start_pose = (float(trajectory.x[0]), float(trajectory.y[0]), float(trajectory.theta[0]))
+        self._controller = controller or RamseteController()
+        self._reset_pose = reset_pose
+        self._start_time = 0.0
+
+        self._reference_channel: Optional[TelemetryChannel] = None
+        if telemetry is not None:
+            self._reference_channel = (telemetry.channels.get(REFERENCE_CHANNEL) or
+                                       telemetry.register(REFERENCE_CHANNEL, width=3))
+
+        self.addRequirements(drive)
+
+    @property
+    def elapsed(self) -> float:
+        return Timer.getFPGATimestamp() - self._start_time
+
+    def initialize(self) -> None:
+        self._start_time = Timer.getFPGATimestamp()
+        self._cursor.reset()
+
+        if self._reset_pose:
+            x, y, theta = self._start_pose
+            self._drive.reset_pose(Pose2d(x, y, Rotation2d(theta)))
+
+    def execute(self) -> None:
+        x_ref, y_ref, theta_ref, v_ref, omega_ref = self._cursor.sample(self.elapsed)
+
+        pose = self._drive.pose
+        velocity, omega = self._controller.calculate(pose.X(), pose.Y(), pose.rotation().radians(),
+                                                     x_ref, y_ref, theta_ref, v_ref, omega_ref)
+        self._drive.drive_speeds(velocity, omega)
+
+        if self._reference_channel is not None:
+            self._reference_channel.write((x_ref, y_ref, theta_ref))
+
+    def isFinished(self) -> bool:
+        return self.elapsed >= self._cursor.duration
+
+    def end(self, interrupted: bool) -> None:
+        self._drive.stop()
+
+    def get_state(self) -> tuple:
+        """
+        Progress along the trajectory, for a simulation checkpoint
+        """
+        return (self.elapsed,)
+
+    def set_state(self, state: tuple) -> None:
+        (elapsed,) = state
+        self._start_time = Timer.getFPGATimestamp() - elapsed
+        self._cursor.seek(elapsed)
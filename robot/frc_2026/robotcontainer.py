@@ -15,16 +15,30 @@
 #    Jemison High School - Huntsville Alabama                              #
 # ------------------------------------------------------------------------ #
 
+import atexit
 import logging
 import time
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
+from commands2 import CommandScheduler
 from commands2.command import Command
-from wpilib import RobotBase, DriverStation, Joystick
-
+from pathplannerlib.auto import AutoBuilder
+from pathplannerlib.config import ModuleConfig, RobotConfig
+from pathplannerlib.controller import PPLTVController
+from wpilib import RobotBase, DriverStation, Joystick, SmartDashboard, Timer
+from wpimath.geometry import Pose2d, Rotation2d
+from wpimath.system.plant import DCMotor
+
+from frc_2026.commands.follow_trajectory import FollowTrajectory
 from frc_2026.constants import IOConstants
 from frc_2026.subsystems.xrp_differential_drive import XrpDifferentialDriveSubsystem
+from lib_6107.autonomous.constants import AutonomousConstants
+from lib_6107.autonomous.library import AutonomousEntry, AutonomousLibrary, best_candidate, build_command
+from lib_6107.constants import XrpConstants
+from lib_6107.telemetry.loop_timing import get_loop_timer
+from lib_6107.telemetry.recorder import TelemetryRecorder, open_telemetry
+from lib_6107.trajectory.pathplanner import load_path_trajectory
 
 logger = logging.getLogger(__name__)
 
@@ -38,28 +52,47 @@ class RobotContainer:
     def __init__(self) -> None:
         logger.info("__init__: entry")
 
-        self.start_time = time.time()       # Will be useful for logging / telemetry message in the future
+        # Use the FPGA timestamp rather than the wall clock so that elapsed times follow the
+        # simulated clock when the simulation is paused or stepped faster than real time
+        self.start_time = Timer.getFPGATimestamp()  # Will be useful for logging / telemetry message in the future
 
         if RobotBase.isSimulation():
             # The Joystick outputs warnings while running under the simulator
             DriverStation.silenceJoystickConnectionWarning(True)
 
-        # Command(s) to run when in Autonomous Mode
+        # Command(s) to run when in Autonomous Mode, and the library label it was built from
         self._autonomous_command: Optional[Command] = None
+        self._autonomous_label: Optional[str] = None
+
+        # Telemetry recorder, the subsystems register their channels with it
+        self._telemetry: Optional[TelemetryRecorder] = open_telemetry(f"robot-{time.strftime('%Y%m%d-%H%M%S')}.xtlm")
+        if self._telemetry is not None:
+            self._telemetry.start()
+            atexit.register(self._telemetry.close)
 
         # Initialize the robot's subsystems
         self._drive = XrpDifferentialDriveSubsystem()
+        if self._telemetry is not None:
+            self._drive.register_telemetry(self._telemetry)
+
+        # Time each subsystem's periodic() as its own loop phase
+        loop_timer = get_loop_timer()
+        for subsystem in (self._drive,):
+            subsystem.periodic = loop_timer.wrap(f"{subsystem.getName()}.periodic", subsystem.periodic)
 
-        # Initialize and then configure the controllers
-        self._driver_controller, self._operator_controller = self._configure_controller()
         # Initialize and then configure the controller
         self._driver_controller: Joystick = self._configure_controller()    # If single joystick
 
         # TODO: Register the commands
 
-        # TODO: Initialize the dashboard
+        # Autonomous routines. Only the deploy folder is listed here, the routine selected
+        # in the chooser is built in the background while the robot is disabled
+        self._configure_autobuilder()
+        self._autonomous = AutonomousLibrary(build=self._build_autonomous)
+        atexit.register(self._autonomous.close)
 
-        # TODO: Preload/parse the pathfinder command
+        # TODO: Initialize the dashboard
+        SmartDashboard.putData(AutonomousConstants.Library.ChooserKey, self._autonomous.chooser)
 
         # TODO: Perform any other variable/object initialization
 
@@ -71,11 +104,19 @@ class RobotContainer:
     def drive(self) -> XrpDifferentialDriveSubsystem:
         return self._drive
 
+    @property
+    def telemetry(self) -> Optional[TelemetryRecorder]:
+        return self._telemetry
+
+    @property
+    def autonomous(self) -> AutonomousLibrary:
+        return self._autonomous
+
     def set_start_time(self):  # call in teleopInit and autonomousInit in the robot
-        self.start_time = time.time()
+        self.start_time = Timer.getFPGATimestamp()
 
     def get_enabled_time(self):  # call when we want to know the start/elapsed time for status and debug messages
-        return time.time() - self.start_time
+        return Timer.getFPGATimestamp() - self.start_time
 
     @property
     def elapsed_time(self) -> float:
@@ -86,18 +127,159 @@ class RobotContainer:
         """
         return self.get_enabled_time() - self.start_time
 
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        Snapshot the robot side state for a simulation checkpoint: the scheduled
+        commands, the start time and the drive motor outputs.
+
+        Scheduled commands are saved by their named_commands() name and restarted on
+        restore(). A command that keeps progress in its own attributes can provide
+        get_state()/set_state() and that progress is saved and restored with it.
+        """
+        scheduler = CommandScheduler.getInstance()
+        commands = tuple((name, command.get_state() if hasattr(command, "get_state") else None)
+                         for name, command in self.named_commands().items() if scheduler.isScheduled(command))
+
+        pose = self._drive.pose
+        return {
+            "start_time": self.start_time,
+            "commands": commands,
+            "motors": (self._drive.left_motor.get(), self._drive.right_motor.get()),
+            "pose": (pose.X(), pose.Y(), pose.rotation().radians()),
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a checkpoint() snapshot.
+
+        The command names are matched against the commands this container knows
+        about. An autonomous routine that has not been selected in this process (a
+        checkpoint loaded from disk) is looked up in the autonomous library.
+        """
+        scheduler = CommandScheduler.getInstance()
+        scheduler.cancelAll()
+
+        known = self.named_commands()
+        for name, command_state in state["commands"]:
+            command = known.get(name)
+            if command is None and name in self._autonomous.entries:
+                command = self._autonomous.get_command(name)
+                if command is not None:
+                    self._autonomous_command, self._autonomous_label = command, name
+
+            if command is None:
+                logger.warning(f"restore: unknown command '{name}' not rescheduled")
+                continue
+
+            scheduler.schedule(command)
+            if command_state is not None and hasattr(command, "set_state"):
+                command.set_state(command_state)
+
+        self.start_time = state["start_time"]
+        left, right = state["motors"]
+        self._drive.left_motor.set(left)
+        self._drive.right_motor.set(right)
+
+        # After the commands, which may have reset the odometry when they were rescheduled
+        if "pose" in state:
+            x, y, theta = state["pose"]
+            self._drive.reset_pose(Pose2d(x, y, Rotation2d(theta)))
+
+    def named_commands(self) -> Dict[str, Command]:
+        """
+        Commands owned by this container, by name. The autonomous command is named by
+        its autonomous library label, so it can be rebuilt from the name.
+        """
+        commands = {}
+        default = self._drive.getDefaultCommand()
+        if default is not None:
+            commands[default.getName()] = default
+
+        if self._autonomous_command is not None:
+            commands[self._autonomous_label] = self._autonomous_command
+
+        return commands
+
     def get_autonomous_command(self) -> Optional[Command]:
         """
-        Get the Autonomous command to run.
+        Get the Autonomous command to run, as chosen by select_autonomous_command().
+
+        :return: Autonomous command to run.
+        """
+        return self._autonomous_command
 
-        Once we start working with PathPlanner, there is an AutoBuilder component that
-        creates fully autonomous routines from paths and auto files created in the
-        PathPlanner GUI.
+    def select_autonomous_command(self) -> Optional[Command]:
+        """
+        Pick up the routine selected on the dashboard. Call from autonomousInit; the
+        command is normally already built by prewarm_autonomous().
 
         :return: Autonomous command to run.
         """
+        self._autonomous_label = self._autonomous.selected
+        self._autonomous_command = self._autonomous.get_command(self._autonomous_label)
         return self._autonomous_command
 
+    def prewarm_autonomous(self) -> None:
+        """
+        Build the selected autonomous routine in the background. Call while disabled.
+        """
+        self._autonomous.prewarm()
+
+    def _build_autonomous(self, entry: AutonomousEntry) -> Command:
+        """
+        Build an autonomous routine. Runs on the library's background thread.
+
+        Single paths are followed with our own trajectory generator and follower
+        (the trajectory comes from the trajectory cache after the first build),
+        autos go through PathPlanner's AutoBuilder. For a route the candidate paths
+        are ranked first and the best one is followed.
+        """
+        if entry.kind == AutonomousEntry.ROUTE:
+            entry = best_candidate(entry)
+
+        if entry.kind == AutonomousEntry.PATH:
+            trajectory = load_path_trajectory(entry.path)
+            return FollowTrajectory(self._drive, trajectory, self._telemetry, name=entry.name)
+
+        return build_command(entry)
+
+    def _configure_autobuilder(self) -> None:
+        """
+        Configure PathPlanner's AutoBuilder to drive our drivetrain.
+
+        The robot settings from the PathPlanner GUI are used if they were deployed,
+        otherwise they are derived from XrpConstants.
+        """
+        try:
+            robot_config = RobotConfig.fromGUISettings()
+
+        except (OSError, ValueError, KeyError) as e:
+            logger.info(f"No PathPlanner robot settings deployed ({e}), using XrpConstants")
+
+            # The XrpConstants motor values are at the gearbox output, which is the wheel
+            motor = DCMotor(XrpConstants.Motor.Voltage, XrpConstants.Motor.StallTorque,
+                            XrpConstants.Motor.StallCurrent, XrpConstants.Motor.FreeCurrent,
+                            XrpConstants.Motor.FreeSpeed, XrpConstants.Motor.MotorCount)
+
+            mass = XrpConstants.Physical.MassWithBatteries
+            moment_of_inertia = mass * (XrpConstants.Physical.RobotLength ** 2 +
+                                        XrpConstants.Physical.RobotWidth ** 2) / 12
+
+            module = ModuleConfig(XrpConstants.Physical.WheelDiameter / 2, self._drive.free_speed, 1.0,
+                                  motor, XrpConstants.Motor.StallCurrent, 1)
+            robot_config = RobotConfig(mass, moment_of_inertia, module,
+                                       trackwidthMeters=XrpConstants.Physical.TrackWidth)
+
+        drive = self._drive
+        AutoBuilder.configure(lambda: drive.pose,
+                              drive.reset_pose,
+                              lambda: drive.chassis_speeds,
+                              drive.drive_chassis_speeds,
+                              PPLTVController(0.020, drive.free_speed),
+                              robot_config,
+                              lambda: False,        # The XRP field is not mirrored between alliances
+                              drive)
+
     def _configure_controller(self) -> Joystick:
         """
         Use this command to configure your robot controller(s)
@@ -16,16 +16,28 @@
 # ------------------------------------------------------------------------ #
 
 import logging
+import math
+import time
 
-from typing import Dict
+from typing import Dict, Optional
+
+import numpy as np
 
 from commands2 import Subsystem, RunCommand
-from wpilib import Joystick, RobotBase
+from wpilib import Encoder, Joystick, RobotBase
 from wpilib.drive import DifferentialDrive
-from xrp import XRPMotor
+from wpimath.geometry import Pose2d, Rotation2d
+from wpimath.kinematics import (ChassisSpeeds, DifferentialDriveKinematics, DifferentialDriveOdometry,
+                                DifferentialDriveWheelSpeeds)
+from xrp import XRPGyro, XRPMotor
 from lib_6107.constants import XrpConstants
+from lib_6107.simulation.xrp_model import XrpDriveModel
+from lib_6107.telemetry.hot_log import HotLogger
+from lib_6107.telemetry.recorder import TelemetryChannel, TelemetryRecorder
+from lib_6107.trajectory.follower import wheel_outputs
 
 logger = logging.getLogger(__name__)
+_hot_log = HotLogger(logger)        # For the drive methods called every robot loop
 
 
 class XrpDifferentialDriveSubsystem(Subsystem):
@@ -47,12 +59,37 @@ class XrpDifferentialDriveSubsystem(Subsystem):
         # Create the DifferentialDrive object
         self._drive: DifferentialDrive = DifferentialDrive(self._left_motor, self._right_motor)
 
-        # # TODO: Resolve what we want to do here
-        # # During simulation, we may want to interact with the encoders
-        # # for each motor so we can simulate movement in the sim
-        # if RobotBase.isSimulation():        #  or not RobotBase.isReal():
-        #     self._left_motor.reset_encoder_position()
-        #     self._right_motor.reset_encoder_position()
+        # Wheel speed at full output, what drive_speeds() scales the wheel speeds by
+        self._free_speed: float = XrpDriveModel().free_wheel_speed
+
+        # Wheel encoders. In simulation, physics.py drives these from the simulated wheel travel
+        distance_per_pulse = (math.pi * XrpConstants.Physical.WheelDiameter /
+                              XrpConstants.EncoderChannel.CountsPerRevolution)
+
+        self._left_encoder: Encoder = Encoder(XrpConstants.EncoderChannel.LeftChannel_A,
+                                              XrpConstants.EncoderChannel.LeftChannel_B)
+        self._right_encoder: Encoder = Encoder(XrpConstants.EncoderChannel.RightChannel_A,
+                                               XrpConstants.EncoderChannel.RightChannel_B)
+        self._left_encoder.setDistancePerPulse(distance_per_pulse)
+        self._right_encoder.setDistancePerPulse(distance_per_pulse)
+        self._odometry: Optional[DifferentialDriveOdometry] = None
+        self.reset_encoders()
+
+        # The gyro on the XRP controller board. In simulation, physics.py drives it from the chassis motion
+        self._gyro: XRPGyro = XRPGyro()
+
+        # Pose estimate from the wheel encoders and the gyro, updated in periodic()
+        self._kinematics = DifferentialDriveKinematics(XrpConstants.Physical.TrackWidth)
+        self._odometry = DifferentialDriveOdometry(self.heading, self.left_distance, self.right_distance)
+
+        # perf_counter() time of the last non-zero output, for the autonomous start latency
+        self._output_time = 0.0
+
+        # Telemetry channels, see register_telemetry()
+        self._output_channel: Optional[TelemetryChannel] = None
+        self._distance_channel: Optional[TelemetryChannel] = None
+        self._heading_channel: Optional[TelemetryChannel] = None
+        self._pose_channel: Optional[TelemetryChannel] = None
 
         # Define the default command for this subsystem
         # self._controller = Joystick(0)
@@ -78,6 +115,94 @@ class XrpDifferentialDriveSubsystem(Subsystem):
     def right_motor(self) -> XRPMotor:
         return self._right_motor
 
+    @property
+    def free_speed(self) -> float:
+        """
+        Wheel speed (m/s) at full motor output, the top speed of the drivetrain
+        """
+        return self._free_speed
+
+    @property
+    def left_encoder(self) -> Encoder:
+        return self._left_encoder
+
+    @property
+    def right_encoder(self) -> Encoder:
+        return self._right_encoder
+
+    @property
+    def left_distance(self) -> float:
+        """
+        Distance (meters) the left wheel has travelled since the last encoder reset
+        """
+        return self._left_encoder.getDistance()
+
+    @property
+    def right_distance(self) -> float:
+        """
+        Distance (meters) the right wheel has travelled since the last encoder reset
+        """
+        return self._right_encoder.getDistance()
+
+    @property
+    def gyro(self) -> XRPGyro:
+        return self._gyro
+
+    @property
+    def heading(self) -> Rotation2d:
+        """
+        Robot heading, counter-clockwise positive. The XRPGyro, like other FRC
+        gyros, is positive clockwise.
+        """
+        return Rotation2d.fromDegrees(-self._gyro.getAngleZ())
+
+    @property
+    def pose(self) -> Pose2d:
+        """
+        Odometry pose estimate, as of the last periodic()
+        """
+        return self._odometry.getPose()
+
+    def reset_pose(self, pose: Pose2d) -> None:
+        """
+        Reset the odometry to a known pose (such as the start of an autonomous path)
+        """
+        self._odometry.resetPosition(self.heading, self.left_distance, self.right_distance, pose)
+
+    @property
+    def chassis_speeds(self) -> ChassisSpeeds:
+        """
+        Robot relative speeds measured by the wheel encoders
+        """
+        return self._kinematics.toChassisSpeeds(
+            DifferentialDriveWheelSpeeds(self._left_encoder.getRate(), self._right_encoder.getRate()))
+
+    @property
+    def output_time(self) -> float:
+        """
+        time.perf_counter() value of the last non-zero drive output
+        """
+        return self._output_time
+
+    def register_telemetry(self, recorder: TelemetryRecorder) -> None:
+        """
+        Register the drive telemetry channels, periodic() then records them every loop
+        """
+        self._output_channel = recorder.register("drive/output", np.float32, width=2)
+        self._distance_channel = recorder.register("drive/distance", np.float64, width=2)
+        self._heading_channel = recorder.register("drive/heading", np.float64)
+        self._pose_channel = recorder.register("drive/pose", np.float64, width=3)
+
+    def reset_encoders(self) -> None:
+        """
+        Zero both wheel encoders
+        """
+        self._left_encoder.reset()
+        self._right_encoder.reset()
+
+        # Keep the pose estimate, otherwise the odometry sees the wheels jump back to zero
+        if self._odometry is not None:
+            self._odometry.resetPosition(self.heading, 0.0, 0.0, self._odometry.getPose())
 
     def arcadeDrive(self, speed, rotation, square_inputs=False) -> None:
         """
@@ -92,8 +217,11 @@ class XrpDifferentialDriveSubsystem(Subsystem):
                                [-1.0..1.0]. Counterclockwise is positive.
         :param square_inputs: If set, decreases the input sensitivity at low speeds.
         """
+        if _hot_log.enabled and (speed or rotation):
+            _hot_log.log("arcadeDrive", speed=speed, rotation=rotation, square_inputs=square_inputs)
+
         if speed or rotation:
-            logger.info(f"arcadeDrive: entry, speed: {speed}, rotation: {rotation}, square_inputs: {square_inputs}")
+            self._output_time = time.perf_counter()
 
         self._drive.arcadeDrive(speed, rotation, squareInputs=square_inputs)
 
@@ -107,7 +235,11 @@ class XrpDifferentialDriveSubsystem(Subsystem):
                               [-1.0..1.0]. Forward is positive.
         :param square_inputs: If set, decreases the input sensitivity at low speeds.
         """
-        # logger.info(f"tankDrive: entry, speed: {left_speed}/{right_speed}, square_inputs: {square_inputs}")
+        if _hot_log.enabled:
+            _hot_log.log("tankDrive", left_speed=left_speed, right_speed=right_speed, square_inputs=square_inputs)
+
+        if left_speed or right_speed:
+            self._output_time = time.perf_counter()
 
         self._drive.tankDrive(left_speed, right_speed, squareInputs=square_inputs)
 
@@ -127,10 +259,38 @@ class XrpDifferentialDriveSubsystem(Subsystem):
                                     turn-in-place maneuvers. zRotation will control
                                     turning rate instead of curvature.
         """
-        logger.info(f"curvatureDrive: entry, speed: {speed}, rotation: {rotation}, allow_turn_in_place: {allow_turn_in_place}")
+        if _hot_log.enabled:
+            _hot_log.log("curvatureDrive", speed=speed, rotation=rotation, allow_turn_in_place=allow_turn_in_place)
+
+        if speed or rotation:
+            self._output_time = time.perf_counter()
 
         self._drive.curvatureDrive(speed, rotation, allow_turn_in_place)
 
+    def drive_chassis_speeds(self, speeds: ChassisSpeeds, feedforwards=None) -> None:
+        """
+        Drive at robot relative chassis speeds. This is the output PathPlanner's
+        AutoBuilder drives with.
+
+        :param speeds:       Robot relative speeds
+        :param feedforwards: PathPlanner's per wheel feedforwards, not used
+        """
+        self.drive_speeds(speeds.vx, speeds.omega)
+
+    def drive_speeds(self, velocity: float, omega: float) -> None:
+        """
+        Drive at a chassis velocity and turn rate.
+
+        The XRP has no velocity control on the motors, so the wheel speeds are
+        scaled by the free wheel speed (the speed at full output) and applied open
+        loop, see wheel_outputs().
+
+        :param velocity: Forward speed in m/s
+        :param omega:    Turn rate in radians per second, counter-clockwise positive
+        """
+        left, right = wheel_outputs(velocity, omega, self._free_speed, XrpConstants.Physical.TrackWidth)
+        self.tankDrive(left, right)
+
     def stop(self) -> None:
         """
         Stop the motors
@@ -143,4 +303,12 @@ class XrpDifferentialDriveSubsystem(Subsystem):
         """
         Called periodically by the scheduler
         """
-        self._counter += 1
\ No newline at end of file
+        self._counter += 1
+
+        pose = self._odometry.update(self.heading, self.left_distance, self.right_distance)
+
+        if self._output_channel is not None:
+            self._output_channel.write((self._left_motor.get(), self._right_motor.get()))
+            self._distance_channel.write((self._left_encoder.getDistance(), self._right_encoder.getDistance()))
+            self._heading_channel.write(math.radians(-self._gyro.getAngleZ()))
+            self._pose_channel.write((pose.X(), pose.Y(), pose.rotation().radians()))
\ No newline at end of file
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Headless, faster-than-real-time driver for MyRobot + PhysicsEngine.
+#
+# The GUI simulator (python -m robotpy sim) runs the robot loop against the wall
+# clock, so a 150 second match takes 150 seconds.  This driver pauses the WPILib
+# simulated clock and steps the robot loop, the command scheduler and the physics
+# engine itself in fixed 20 ms increments, as fast as the CPU allows or paced to
+# a speed factor.
+#
+#   python headless.py --mode match --speed unbounded --deterministic
+#   python headless.py --mode teleop --duration 10 --speed 10x
+#
+# A session recorded by the physics engine (SimConstants.RecordSession or the
+# XRP_RECORD_SESSION environment variable) can be replayed and compared tick by
+# tick against the current robot code:
+#
+#   python headless.py --replay session.xrps
+#
+import argparse
+import logging
+import math
+import os
+import random
+import sys
+import time
+
+from typing import Callable, Optional, Tuple
+
+import hal
+import numpy as np
+import wpilib.simulation
+
+from commands2 import CommandScheduler
+from wpilib import Field2d, Timer
+from wpilib.simulation import DriverStationSim
+from wpimath.geometry import Pose2d, Transform2d, Twist2d
+from wpimath.kinematics import ChassisSpeeds
+
+from frc_2026.constants import IOConstants
+from lib_6107.simulation.checkpoint import SimCheckpoint
+from lib_6107.simulation.constants import SimConstants
+from lib_6107.simulation.session_log import SessionMode, read_session
+
+logger = logging.getLogger(__name__)
+
+# Joystick axes used by the keyboard/joystick in the simulator
+JOYSTICK_X_AXIS = 0
+JOYSTICK_Y_AXIS = 1
+
+InputSource = Callable[[float], Tuple[float, float]]    # sim time -> (joystick x, joystick y)
+
+
+class HeadlessPhysicsInterface:
+    """
+    Minimal stand-in for pyfrc's PhysicsInterface so that the PhysicsEngine in
+    physics.py can run without the simulator GUI.
+    """
+    def __init__(self):
+        self.field = Field2d()
+
+    def drive(self, speeds: ChassisSpeeds, tm_diff: float) -> Pose2d:
+        """
+        Move the robot using the chassis speeds over the given time
+        """
+        twist = Twist2d(speeds.vx * tm_diff, speeds.vy * tm_diff, speeds.omega * tm_diff)
+        pose = self.field.getRobotPose().exp(twist)
+        self.field.setRobotPose(pose)
+        return pose
+
+    def move_robot(self, transform: Transform2d) -> Pose2d:
+        """
+        Move the robot by a transform relative to its current pose
+        """
+        pose = self.field.getRobotPose().transformBy(transform)
+        self.field.setRobotPose(pose)
+        return pose
+
+    def get_pose(self) -> Pose2d:
+        return self.field.getRobotPose()
+
+
+class HeadlessSimulation:
+    """
+    Runs MyRobot and PhysicsEngine on a simulated clock with a fixed time step.
+    """
+    class Mode:
+        DISABLED = "disabled"
+        AUTONOMOUS = "autonomous"
+        TELEOP = "teleop"
+        TEST = "test"
+
+    def __init__(self, period: float = 0.020, speed_factor: Optional[float] = None,
+                 deterministic: bool = False, seed: int = 0):
+        """
+        :param period:        Robot loop period in seconds
+        :param speed_factor:  Simulated seconds per wall-clock second (1.0 is real time).
+                              None runs as fast as the CPU allows.
+        :param deterministic: If set, seed the random number generators so repeated
+                              runs produce identical results
+        :param seed:          Seed to use in deterministic mode
+        """
+        if period <= 0:
+            raise ValueError(f"period must be positive, got {period}")
+
+        if speed_factor is not None and speed_factor <= 0:
+            raise ValueError(f"speed_factor must be positive, got {speed_factor}")
+
+        self._period = period
+        self._speed_factor = speed_factor
+        self._deterministic = deterministic
+        self._seed = seed
+
+        self._robot = None
+        self._physics = None
+        self._physics_interface: Optional[HeadlessPhysicsInterface] = None
+        self._mode = self.Mode.DISABLED
+        self._time = 0.0
+        self._ticks = 0
+        self._wall_start = 0.0
+
+    @property
+    def robot(self) -> "MyRobot":
+        return self._robot
+
+    @property
+    def physics(self) -> "PhysicsEngine":
+        return self._physics
+
+    @property
+    def time(self) -> float:
+        """
+        Simulated seconds since start()
+        """
+        return self._time
+
+    @property
+    def ticks(self) -> int:
+        return self._ticks
+
+    @property
+    def pose(self) -> Pose2d:
+        return self._physics_interface.get_pose()
+
+    def start(self) -> None:
+        """
+        Initialize the HAL, construct the robot and the physics engine and run
+        the robot's one time initialization.
+        """
+        # Imported here so that the HAL is initialized before any robot objects are created
+        from robot import MyRobot
+        from physics import PhysicsEngine
+
+        if self._deterministic:
+            random.seed(self._seed)
+            np.random.seed(self._seed)
+
+        if not hal.initialize(500, 0):
+            raise RuntimeError("HAL initialization failed")
+
+        # All robot time now comes from the simulated clock
+        wpilib.simulation.pauseTiming()
+
+        DriverStationSim.setDsAttached(True)
+        self._apply_mode()
+
+        self._robot = MyRobot()
+        self._robot.robotInit()
+        self._robot._simulationInit()
+
+        self._physics_interface = HeadlessPhysicsInterface()
+        self._physics = PhysicsEngine(self._physics_interface, self._robot)
+
+        self._wall_start = time.perf_counter()
+
+    def close(self) -> None:
+        """
+        Stop the robot and release the scheduler state
+        """
+        if self._robot is not None:
+            CommandScheduler.getInstance().cancelAll()
+            self._robot.endCompetition()
+            self._robot = None
+
+        wpilib.simulation.resumeTiming()
+
+    def set_mode(self, mode: str) -> None:
+        """
+        Change the robot mode. The robot sees the change on the next step()
+
+        :param mode: One of the HeadlessSimulation.Mode values
+        """
+        self._mode = mode
+        self._apply_mode()
+
+    @staticmethod
+    def set_joystick(x: float, y: float, port: int = IOConstants.DRIVER_CONTROLLER_PORT) -> None:
+        """
+        Set the driver joystick axes as if the driver had moved the stick
+        """
+        DriverStationSim.setJoystickAxis(port, JOYSTICK_X_AXIS, x)
+        DriverStationSim.setJoystickAxis(port, JOYSTICK_Y_AXIS, y)
+
+    def step(self) -> None:
+        """
+        Run one robot loop: mode periodic + robotPeriodic, the command scheduler,
+        the physics engine and then advance the simulated clock one period.
+        """
+        DriverStationSim.notifyNewData()
+
+        self._robot._loopFunc()
+        CommandScheduler.getInstance().run()
+        self._physics.update_sim(self._time, self._period)
+
+        wpilib.simulation.stepTiming(self._period)
+        self._time += self._period
+        self._ticks += 1
+
+        if self._speed_factor is not None:
+            self._pace()
+
+    def checkpoint(self) -> SimCheckpoint:
+        """
+        Snapshot the simulation so it can be continued from this moment with restore()
+        """
+        return SimCheckpoint(self._time, self._ticks, self._mode, Timer.getFPGATimestamp(),
+                             self._physics.checkpoint(), self._robot.container.checkpoint())
+
+    def restore(self, checkpoint: SimCheckpoint) -> None:
+        """
+        Continue the simulation from a checkpoint.
+
+        If the robot was in a different mode, it sees a mode change on the next
+        step() and runs the init method of the checkpoint's mode.
+        """
+        self.set_mode(checkpoint.mode)
+
+        # Rewind the simulated clock: restart it at zero (still paused) and step forward
+        wpilib.simulation.restartTiming()
+        wpilib.simulation.pauseTiming()
+        wpilib.simulation.stepTiming(checkpoint.fpga_time)
+
+        self._time = checkpoint.time
+        self._ticks = checkpoint.ticks
+        if self._speed_factor is not None:
+            self._wall_start = time.perf_counter() - self._time / self._speed_factor
+
+        self._physics.restore(checkpoint.physics)
+        self._robot.container.restore(checkpoint.container)
+
+    def run(self, duration: float, mode: Optional[str] = None,
+            inputs: Optional[InputSource] = None) -> None:
+        """
+        Run the robot for the given amount of simulated time
+
+        :param duration: Simulated seconds to run
+        :param mode:     Mode to run in, defaults to the current mode
+        :param inputs:   Optional callable returning the driver joystick (x, y) for a sim time
+        """
+        if mode is not None:
+            self.set_mode(mode)
+
+        steps = int(math.ceil(duration / self._period - 1e-9))
+        for _ in range(steps):
+            if inputs is not None:
+                self.set_joystick(*inputs(self._time))
+            self.step()
+
+    def run_match(self, autonomous: float = 15.0, teleop: float = 135.0,
+                  inputs: Optional[InputSource] = None) -> None:
+        """
+        Run a full match: autonomous, a short disabled gap, then teleop
+        """
+        self.run(self._period, self.Mode.DISABLED)
+        self.run(autonomous, self.Mode.AUTONOMOUS)
+        self.run(self._period, self.Mode.DISABLED)
+        self.run(teleop, self.Mode.TELEOP, inputs=inputs)
+        self.run(self._period, self.Mode.DISABLED)
+
+    def _apply_mode(self) -> None:
+        mode = self._mode
+        DriverStationSim.setEnabled(mode != self.Mode.DISABLED)
+        DriverStationSim.setAutonomous(mode == self.Mode.AUTONOMOUS)
+        DriverStationSim.setTest(mode == self.Mode.TEST)
+
+    def _pace(self) -> None:
+        """
+        Sleep until the wall clock catches up with the simulated clock / speed factor
+        """
+        target = self._wall_start + self._time / self._speed_factor
+        delay = target - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ReplayReport:
+    """
+    Differences between a recorded session and its replay
+    """
+    # Pose (m) and motor output differences below this are treated as identical
+    TOLERANCE = 1e-6
+
+    def __init__(self, recorded: np.ndarray, x: np.ndarray, y: np.ndarray,
+                 left_output: np.ndarray, right_output: np.ndarray):
+        self.ticks = len(recorded)
+        position_error = np.hypot(x - recorded["x"], y - recorded["y"])
+        output_error = np.maximum(np.abs(left_output - recorded["left_output"]),
+                                  np.abs(right_output - recorded["right_output"]))
+
+        self.max_position_error = float(position_error.max()) if self.ticks else 0.0
+        self.final_position_error = float(position_error[-1]) if self.ticks else 0.0
+        self.max_output_error = float(output_error.max()) if self.ticks else 0.0
+
+        diverged = np.flatnonzero((position_error > self.TOLERANCE) | (output_error > self.TOLERANCE))
+        self.first_divergence: Optional[int] = int(diverged[0]) if len(diverged) else None
+        self.first_divergence_time: Optional[float] = \
+            float(recorded["time"][self.first_divergence]) if self.first_divergence is not None else None
+
+    @property
+    def identical(self) -> bool:
+        return self.first_divergence is None
+
+    def __str__(self) -> str:
+        lines = [f"Replayed {self.ticks} ticks",
+                 f"  max position error:   {self.max_position_error:.6f} m",
+                 f"  final position error: {self.final_position_error:.6f} m",
+                 f"  max output error:     {self.max_output_error:.6f}"]
+        if self.identical:
+            lines.append("  replay matches the recording")
+        else:
+            lines.append(f"  first divergence at tick {self.first_divergence} "
+                         f"(t = {self.first_divergence_time:.3f} s)")
+        return "\n".join(lines)
+
+
+_SESSION_MODES = {
+    SessionMode.DISABLED: HeadlessSimulation.Mode.DISABLED,
+    SessionMode.AUTONOMOUS: HeadlessSimulation.Mode.AUTONOMOUS,
+    SessionMode.TELEOP: HeadlessSimulation.Mode.TELEOP,
+    SessionMode.TEST: HeadlessSimulation.Mode.TEST,
+}
+
+
+def replay_session(path: str, period: float = 0.020, speed_factor: Optional[float] = None,
+                   seed: int = 0) -> ReplayReport:
+    """
+    Drive a fresh simulation with the modes and joystick inputs of a recorded
+    session and compare the motor outputs and poses against the recording
+
+    :param path:         Session file written by the physics engine
+    :param period:       Robot loop period, must match the recording
+    :param speed_factor: Pacing, None runs as fast as possible
+    :param seed:         Seed for the deterministic simulation
+    """
+    recorded = read_session(path)
+
+    # Do not record the replay over the session being replayed
+    SimConstants.RecordSession = None
+    os.environ.pop("XRP_RECORD_SESSION", None)
+
+    count = len(recorded)
+    x, y = np.empty(count), np.empty(count)
+    left_output, right_output = np.empty(count), np.empty(count)
+
+    # Plain lists are much cheaper to index per tick than the memory mapped records
+    modes = recorded["mode"].tolist()
+    joystick_x = recorded["joystick_x"].tolist()
+    joystick_y = recorded["joystick_y"].tolist()
+
+    sim = HeadlessSimulation(period=period, speed_factor=speed_factor, deterministic=True, seed=seed)
+    sim.start()
+    try:
+        drive = sim.robot.container.drive
+        mode = None
+        for tick in range(count):
+            if modes[tick] != mode:
+                mode = modes[tick]
+                sim.set_mode(_SESSION_MODES.get(mode, HeadlessSimulation.Mode.DISABLED))
+
+            sim.set_joystick(joystick_x[tick], joystick_y[tick])
+            sim.step()
+
+            pose = sim.pose
+            x[tick], y[tick] = pose.X(), pose.Y()
+            left_output[tick] = drive.left_motor.get()
+            right_output[tick] = drive.right_motor.get()
+
+    finally:
+        sim.close()
+
+    return ReplayReport(recorded, x, y, left_output, right_output)
+
+
+def parse_speed(value: str) -> Optional[float]:
+    """
+    Parse a speed factor such as '1x', '10', or 'unbounded'
+    """
+    value = value.strip().lower()
+    if value in ("unbounded", "max", "inf", "0"):
+        return None
+
+    factor = float(value[:-1] if value.endswith("x") else value)
+    if factor <= 0:
+        raise argparse.ArgumentTypeError(f"speed factor must be positive: {value}")
+    return factor
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run MyRobot + PhysicsEngine headless on a simulated clock")
+    parser.add_argument("--mode", default="match",
+                        choices=("match", HeadlessSimulation.Mode.AUTONOMOUS, HeadlessSimulation.Mode.TELEOP,
+                                 HeadlessSimulation.Mode.TEST, HeadlessSimulation.Mode.DISABLED),
+                        help="Mode to run, 'match' runs 15 s autonomous then 135 s teleop")
+    parser.add_argument("--duration", type=float, default=15.0,
+                        help="Simulated seconds to run (ignored for 'match')")
+    parser.add_argument("--speed", type=parse_speed, default=None,
+                        help="Speed factor: 1x, 10x, ... or 'unbounded' (default)")
+    parser.add_argument("--period", type=float, default=0.020, help="Robot loop period in seconds")
+    parser.add_argument("--deterministic", action="store_true", help="Seed random number generators")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for --deterministic")
+    parser.add_argument("--backend", default=SimConstants.PhysicsBackend,
+                        choices=(SimConstants.Backend.Analytic, SimConstants.Backend.DrivetrainSim,
+                                 SimConstants.Backend.Integrated),
+                        help="Physics backend to simulate the drivetrain with")
+    parser.add_argument("--replay", metavar="FILE", help="Replay a recorded session and report any divergence")
+    parser.add_argument("--log-level", default="WARNING", help="Python logging level")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper())
+    SimConstants.PhysicsBackend = args.backend
+
+    if args.replay:
+        report = replay_session(args.replay, period=args.period, speed_factor=args.speed, seed=args.seed)
+        print(report)
+        return 0 if report.identical else 1
+
+    sim = HeadlessSimulation(period=args.period, speed_factor=args.speed,
+                             deterministic=args.deterministic, seed=args.seed)
+    sim.start()
+    wall_start = time.perf_counter()
+    try:
+        if args.mode == "match":
+            sim.run_match()
+        else:
+            sim.run(args.duration, args.mode)
+
+        pose = sim.pose
+        backend_report = sim.physics.backend.report()
+
+    finally:
+        sim.close()
+
+    wall = time.perf_counter() - wall_start
+    print(f"Simulated {sim.time:.2f} s ({sim.ticks} ticks) in {wall:.3f} s "
+          f"({sim.time / wall if wall > 0 else math.inf:.1f}x real time)")
+    print(f"Physics backend {backend_report}")
+    print(f"Final pose: x: {pose.X():.3f} m, y: {pose.Y():.3f} m, heading: {pose.rotation().degrees():.1f} deg")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
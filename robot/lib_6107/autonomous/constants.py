@@ -0,0 +1,39 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Constants for source in this subdirectory will go here
+
+class AutonomousConstants:
+    """
+    Constants for the autonomous routine library in lib_6107.autonomous
+    """
+    class Library:
+        Directory = "pathplanner"       # PathPlanner project folder in the deploy directory
+        ChooserKey = "Autonomous"       # SmartDashboard key of the autonomous chooser
+        NoAutonomous = "None"           # Chooser entry that runs nothing (the default)
+        PathSuffix = " (path)"          # Added to single paths in the chooser to tell them from autos
+        BuildWorkers = 1                # Background threads that parse and build routines
+        KeepBuilt = 4                   # Built routines kept, least recently selected are dropped
+
+    class Routes:
+        Separator = " via "             # Paths named '<route> via <variant>' are alternatives for one route
+        RouteSuffix = " (best route)"   # Added to routes in the chooser
+        ScoreWorkers = 4                # Threads that score the candidate paths of a route
+        MinClearance = 0.03             # Meters between the robot footprint and the nearest wall for a
+                                        # path to count as safe
+        EnergyWeight = 0.0              # Seconds one joule is worth in the ranking, 0 picks the fastest
+                                        # safe path
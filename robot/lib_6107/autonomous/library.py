@@ -0,0 +1,297 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Library of the PathPlanner autos and paths in the deploy directory.
+#
+# Loading every routine when the robot starts gets slower with each auto we add,
+# and building one in autonomousInit delays the first motor output by the parse
+# and build time. Instead:
+#
+#   - At startup the deploy folder is only listed. Nothing is opened or parsed.
+#   - While disabled, prewarm() builds the routine selected in the chooser on a
+#     background thread (and again whenever the selection changes).
+#   - autonomousInit calls get_command(), which hands back the built Command.
+#
+# Paths named '<route> via <variant>' are also offered together as one route. Building
+# a route ranks its candidate paths (routes.py) and builds the best one, so the
+# choice is made while disabled as well.
+#
+# The time from get_command() to the first drive output is measured so that a
+# routine that was not ready in time shows up in the log.
+#
+import logging
+import os
+import time
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from commands2.command import Command
+from pathplannerlib.auto import AutoBuilder, PathPlannerAuto
+from pathplannerlib.path import PathPlannerPath
+from wpilib import SendableChooser, getDeployDirectory
+
+from lib_6107.autonomous.constants import AutonomousConstants
+from lib_6107.autonomous.routes import get_route_evaluator
+from lib_6107.telemetry.loop_timing import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class AutonomousEntry(NamedTuple):
+    name: str               # PathPlanner name, the file name without its suffix, or the route name
+    kind: str               # AutonomousEntry.AUTO, PATH or ROUTE
+    path: str               # File in the deploy directory, the paths folder for a route
+    candidates: Tuple["AutonomousEntry", ...] = ()     # The alternative paths of a route
+
+    AUTO = "auto"
+    PATH = "path"
+    ROUTE = "route"
+
+
+def build_command(entry: AutonomousEntry) -> Command:
+    """
+    Parse a PathPlanner auto or path and build its command. AutoBuilder has to be configured first.
+    """
+    if entry.kind == AutonomousEntry.AUTO:
+        return PathPlannerAuto(entry.name)
+
+    if entry.kind == AutonomousEntry.ROUTE:
+        entry = best_candidate(entry)
+
+    return AutoBuilder.followPath(PathPlannerPath.fromPathFile(entry.name))
+
+
+def best_candidate(entry: AutonomousEntry) -> AutonomousEntry:
+    """
+    The candidate path the route evaluator ranks first for a route
+    """
+    best = get_route_evaluator().rank(entry.name, entry.candidates)[0]
+    return next(candidate for candidate in entry.candidates if candidate.path == best.path)
+
+
+def index_directory(directory: str) -> Dict[str, AutonomousEntry]:
+    """
+    Chooser label -> entry for every auto, path and route in a PathPlanner project
+    folder. Only the directory listings are read.
+    """
+    entries = {}
+    for kind, folder, suffix, label_suffix in ((AutonomousEntry.AUTO, "autos", ".auto", ""),
+                                               (AutonomousEntry.PATH, "paths", ".path",
+                                                AutonomousConstants.Library.PathSuffix)):
+        try:
+            with os.scandir(os.path.join(directory, folder)) as it:
+                for file in it:
+                    if file.name.endswith(suffix) and file.is_file():
+                        name = file.name[:-len(suffix)]
+                        entries[name + label_suffix] = AutonomousEntry(name, kind, file.path)
+
+        except FileNotFoundError:
+            pass
+
+    # Group the '<route> via <variant>' paths
+    routes: Dict[str, List[AutonomousEntry]] = {}
+    for entry in entries.values():
+        route, separator, _ = entry.name.partition(AutonomousConstants.Routes.Separator)
+        if entry.kind == AutonomousEntry.PATH and separator and route:
+            routes.setdefault(route, []).append(entry)
+
+    for route, candidates in routes.items():
+        entries[route + AutonomousConstants.Routes.RouteSuffix] = AutonomousEntry(
+            route, AutonomousEntry.ROUTE, os.path.join(directory, "paths"),
+            tuple(sorted(candidates, key=lambda candidate: candidate.name)))
+
+    return entries
+
+
+class AutonomousLibrary:
+    """
+    Indexes the autonomous routines at startup and builds the selected one in the background
+    """
+    def __init__(self, directory: Optional[str] = None,
+                 build: Callable[[AutonomousEntry], Command] = build_command,
+                 workers: int = AutonomousConstants.Library.BuildWorkers,
+                 keep: int = AutonomousConstants.Library.KeepBuilt):
+        """
+        :param directory: PathPlanner project folder, defaults to the one in the deploy directory
+        :param build:     Builds the command for an entry, called on a background thread
+        :param workers:   Background build threads
+        :param keep:      Built routines to keep, least recently selected are dropped
+        """
+        self._directory = directory or os.path.join(getDeployDirectory(), AutonomousConstants.Library.Directory)
+        self._build = build
+        self._workers = workers
+        self._keep = max(keep, 1)
+
+        start = time.perf_counter()
+        self._entries = index_directory(self._directory)
+        logger.info(f"Indexed {len(self._entries)} autonomous routines in {self._directory} "
+                    f"in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+        self._built: "OrderedDict[str, Future]" = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._chooser: Optional[SendableChooser] = None
+
+        self._enabled_at: Optional[float] = None    # perf_counter() of get_command(), until the first output
+        self.start_latency = LatencyHistogram(maximum=10.0)    # get_command() to first drive output
+
+    @property
+    def labels(self) -> List[str]:
+        return sorted(self._entries)
+
+    @property
+    def entries(self) -> Dict[str, AutonomousEntry]:
+        return self._entries
+
+    @property
+    def chooser(self) -> SendableChooser:
+        """
+        Dashboard chooser of the routine labels. The options are strings so the chooser
+        does not hold (or need) any built commands.
+        """
+        if self._chooser is None:
+            chooser = SendableChooser()
+            chooser.setDefaultOption(AutonomousConstants.Library.NoAutonomous, AutonomousConstants.Library.NoAutonomous)
+            for label in self.labels:
+                chooser.addOption(label, label)
+            self._chooser = chooser
+
+        return self._chooser
+
+    @property
+    def selected(self) -> str:
+        """
+        Label selected in the chooser
+        """
+        if self._chooser is None:
+            return AutonomousConstants.Library.NoAutonomous
+
+        return self._chooser.getSelected() or AutonomousConstants.Library.NoAutonomous
+
+    def is_ready(self, label: Optional[str] = None) -> bool:
+        """
+        True if the routine (default: the selected one) has been built
+        """
+        future = self._built.get(label or self.selected)
+        return future is not None and future.done()
+
+    def prewarm(self, label: Optional[str] = None) -> None:
+        """
+        Start building the routine (default: the selected one) if it has not been
+        built yet. Cheap enough to call from every disabledPeriodic().
+        """
+        label = label or self.selected
+        future = self._built.get(label)
+        if future is not None:
+            self._built.move_to_end(label)
+            return
+
+        entry = self._entries.get(label)
+        if entry is None:
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="autonomous-build")
+
+        future = self._executor.submit(self._timed_build, entry)
+        future.add_done_callback(lambda done: self._build_failed(label, done))
+        self._built[label] = future
+
+        while len(self._built) > self._keep:
+            _, dropped = self._built.popitem(last=False)
+            dropped.cancel()
+
+    def _timed_build(self, entry: AutonomousEntry) -> Command:
+        start = time.perf_counter()
+        command = self._build(entry)
+        logger.info(f"Built {entry.kind} '{entry.name}' in {(time.perf_counter() - start) * 1e3:.1f} ms")
+        return command
+
+    def _build_failed(self, label: str, future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Building autonomous routine '{label}' failed: {future.exception()}")
+
+    def get_command(self, label: Optional[str] = None) -> Optional[Command]:
+        """
+        The command for the routine (default: the selected one), for autonomousInit.
+
+        A prewarmed routine is returned as is. Otherwise it is built now, which delays
+        the start of autonomous by the build time.
+        """
+        self._enabled_at = time.perf_counter()
+
+        label = label or self.selected
+        if label not in self._entries:
+            if label != AutonomousConstants.Library.NoAutonomous:
+                logger.error(f"Unknown autonomous routine '{label}'")
+            self._enabled_at = None
+            return None
+
+        future = self._built.get(label)
+        if future is None:
+            logger.warning(f"Autonomous routine '{label}' was not prewarmed, building it now")
+            future = Future()
+            try:
+                future.set_result(self._timed_build(self._entries[label]))
+
+            except Exception as e:
+                future.set_exception(e)
+                self._build_failed(label, future)
+
+            self._built[label] = future
+
+        elif not future.done():
+            logger.warning(f"Autonomous routine '{label}' is still being built, waiting for it")
+
+        try:
+            return future.result()
+
+        except Exception:
+            # Already logged. Drop it so the next prewarm() tries again
+            del self._built[label]
+            self._enabled_at = None
+            return None
+
+    def output_started(self, output_time: float) -> Optional[float]:
+        """
+        Call every autonomous loop with the perf_counter() time of the latest drive
+        output. Records the delay from get_command() to the first output.
+
+        :return: The delay in seconds, on the first output only
+        """
+        if self._enabled_at is None or output_time < self._enabled_at:
+            return None
+
+        latency = output_time - self._enabled_at
+        self._enabled_at = None
+        self.start_latency.record(latency)
+        logger.info(f"First autonomous output {latency * 1e3:.1f} ms after enable")
+        return latency
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def report(self) -> str:
+        latency = self.start_latency
+        text = f"Autonomous library: {len(self._entries)} routines, {sum(f.done() for f in self._built.values())} built"
+        if latency.count:
+            text += (f", enable to first output: mean {latency.mean * 1e3:.1f} ms, "
+                     f"max {latency.max * 1e3:.1f} ms over {latency.count} starts")
+        return text
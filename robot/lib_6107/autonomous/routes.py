@@ -0,0 +1,253 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Ranking of alternative paths for the same autonomous route.
+#
+# PathPlanner paths named '<route> via <variant>' are candidates for one route.
+# Each candidate is turned into a trajectory (through the trajectory cache) and
+# scored with the internal models instead of the simulator:
+#
+#   - time:       trajectory duration
+#   - energy:     electrical energy from the XrpDriveModel, the voltage each side
+#                 needs to follow the trajectory's wheel speeds and accelerations
+#   - clearance:  closest approach of the robot footprint to a field wall
+#
+# A RoutePolicy turns the scores into a ranking, by default "fastest safe route":
+# the quickest candidate that keeps the minimum clearance. The candidates are
+# scored in parallel on a thread pool; the autonomous library does this while the
+# robot is disabled so the choice is made by the time it is enabled.
+#
+import atexit
+import logging
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from wpilib import getDeployDirectory
+
+from lib_6107.autonomous.constants import AutonomousConstants
+from lib_6107.constants import XrpConstants
+from lib_6107.simulation.constants import SimConstants
+from lib_6107.simulation.field_geometry import FieldGeometry
+from lib_6107.simulation.xrp_model import XrpDriveModel
+from lib_6107.trajectory.generator import Trajectory, TrajectoryConstraints
+from lib_6107.trajectory.navgrid import footprint_radius
+from lib_6107.trajectory.pathplanner import load_path_trajectory
+
+logger = logging.getLogger(__name__)
+
+
+class RouteScore(NamedTuple):
+    name: str               # Candidate path name
+    path: str               # .path file
+    time: float             # Seconds to drive the path
+    energy: float           # Joules drawn from the battery
+    clearance: float        # Closest approach (m) of the robot footprint to a wall, negative if it hits
+
+    def __str__(self) -> str:
+        return f"'{self.name}': {self.time:.2f} s, {self.energy:.2f} J, {self.clearance * 100:.1f} cm clearance"
+
+
+def trajectory_energy(trajectory: Trajectory, model: Optional[XrpDriveModel] = None) -> float:
+    """
+    Electrical energy (J) drawn by the drive motors and the electronics while
+    following the trajectory. Braking is not counted as putting energy back.
+    """
+    model = model or XrpDriveModel()
+    t = trajectory.t
+    if len(t) < 2:
+        return 0.0
+
+    half_track = model.track_width / 2
+    alpha = np.gradient(trajectory.omega, t)
+
+    energy = XrpConstants.Battery.ElectronicsCurrent * model.nominal_voltage * trajectory.duration
+    for sign in (-1.0, 1.0):
+        speed = trajectory.v + sign * half_track * trajectory.omega
+        acceleration = trajectory.a + sign * half_track * alpha
+
+        # dv/dt = k_drive V - k_emf v, solved for the voltage this side needs
+        voltage = (acceleration + model.k_emf * speed) / model.k_drive
+        power = np.maximum(voltage * model.current(speed, voltage), 0.0)
+        energy += float(np.sum((power[1:] + power[:-1]) * np.diff(t)) / 2)
+
+    return energy
+
+
+def trajectory_clearance(trajectory: Trajectory, field: FieldGeometry) -> float:
+    """
+    Smallest distance (m) between the robot footprint and any field wall along the trajectory
+    """
+    segments = field.segments
+    if not len(segments):
+        return np.inf
+
+    px = trajectory.x[:, np.newaxis]
+    py = trajectory.y[:, np.newaxis]
+    x1, y1, x2, y2 = segments[:, 0], segments[:, 1], segments[:, 2], segments[:, 3]
+    dx, dy = x2 - x1, y2 - y1
+
+    # Closest point on each segment to each sample, (samples, segments)
+    length2 = np.maximum(dx * dx + dy * dy, 1e-12)
+    fraction = np.clip(((px - x1) * dx + (py - y1) * dy) / length2, 0.0, 1.0)
+    distance = np.hypot(px - (x1 + fraction * dx), py - (y1 + fraction * dy))
+
+    return float(distance.min()) - footprint_radius(0.0)
+
+
+class RoutePolicy:
+    """
+    How the candidates of a route are ranked.
+
+    Candidates that keep min_clearance come first, ordered by
+    time + energy_weight * energy. The rest follow, the most clearance first.
+    """
+    __slots__ = ("min_clearance", "energy_weight")
+
+    def __init__(self, min_clearance: float = AutonomousConstants.Routes.MinClearance,
+                 energy_weight: float = AutonomousConstants.Routes.EnergyWeight):
+        """
+        :param min_clearance: Meters the robot footprint has to stay away from the walls
+        :param energy_weight: Seconds one joule is worth, 0 ranks the safe candidates by time only
+        """
+        self.min_clearance = min_clearance
+        self.energy_weight = energy_weight
+
+    def is_safe(self, score: RouteScore) -> bool:
+        return score.clearance >= self.min_clearance
+
+    def cost(self, score: RouteScore) -> float:
+        return score.time + self.energy_weight * score.energy
+
+    def rank(self, scores: Sequence[RouteScore]) -> List[RouteScore]:
+        return sorted(scores, key=lambda score: (0, self.cost(score)) if self.is_safe(score)
+                      else (1, -score.clearance))
+
+
+class RouteEvaluator:
+    """
+    Scores the candidate paths of a route on a thread pool and ranks them
+    """
+    def __init__(self, field: Optional[FieldGeometry] = None, policy: Optional[RoutePolicy] = None,
+                 constraints: Optional[TrajectoryConstraints] = None,
+                 workers: int = AutonomousConstants.Routes.ScoreWorkers):
+        """
+        :param field:       Walls for the clearance, defaults to the deployed field file
+        :param policy:      Ranking, defaults to the fastest safe candidate
+        :param constraints: Limits the trajectories are generated with
+        :param workers:     Scoring threads
+        """
+        self._field = field or self._load_field()
+        self._policy = policy or RoutePolicy()
+        self._constraints = constraints or TrajectoryConstraints()
+        self._model = XrpDriveModel()
+        self._workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.rankings: Dict[str, List[RouteScore]] = {}     # Route name -> latest ranking
+
+    @staticmethod
+    def _load_field() -> FieldGeometry:
+        path = os.path.join(getDeployDirectory(), SimConstants.FieldFile)
+        try:
+            return FieldGeometry.load(path)
+
+        except FileNotFoundError:
+            logger.warning(f"Field file {path} not found, route clearance is only checked against the "
+                           f"{SimConstants.FieldWidth} x {SimConstants.FieldHeight} m boundary")
+            return FieldGeometry(SimConstants.FieldWidth, SimConstants.FieldHeight)
+
+    @property
+    def policy(self) -> RoutePolicy:
+        return self._policy
+
+    @policy.setter
+    def policy(self, policy: RoutePolicy) -> None:
+        self._policy = policy
+
+    def score(self, name: str, path: str) -> RouteScore:
+        """
+        Score one candidate path
+        """
+        trajectory = load_path_trajectory(path, self._constraints)
+        return RouteScore(name, path, trajectory.duration, trajectory_energy(trajectory, self._model),
+                          trajectory_clearance(trajectory, self._field))
+
+    def rank(self, route: str, candidates: Sequence) -> List[RouteScore]:
+        """
+        Score the candidates in parallel and rank them. Candidates that fail to
+        load are logged and left out.
+
+        :param route:      Route name, the ranking is kept in rankings[route]
+        :param candidates: Entries with a name and a path (AutonomousEntry)
+
+        :raises ValueError: if no candidate could be scored
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="route-score")
+
+        start = time.perf_counter()
+        futures = [(candidate, self._executor.submit(self.score, candidate.name, candidate.path))
+                   for candidate in candidates]
+
+        scores = []
+        for candidate, future in futures:
+            try:
+                scores.append(future.result())
+
+            except Exception as e:
+                logger.error(f"Scoring '{candidate.name}' for route '{route}' failed: {e}")
+
+        if not scores:
+            raise ValueError(f"Route '{route}' has no usable candidate paths")
+
+        ranking = self._policy.rank(scores)
+        self.rankings[route] = ranking
+
+        logger.info(f"Ranked {len(scores)} candidates for route '{route}' in "
+                    f"{(time.perf_counter() - start) * 1e3:.1f} ms:")
+        for place, score in enumerate(ranking, start=1):
+            logger.info(f"  {place}. {score}{'' if self._policy.is_safe(score) else ' (unsafe)'}")
+
+        return ranking
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def report(self) -> str:
+        choices = ", ".join(f"{route} -> '{ranking[0].name}'" for route, ranking in self.rankings.items())
+        return f"Route evaluator: {len(self.rankings)} routes ranked" + (f" ({choices})" if choices else "")
+
+
+_evaluator: Optional[RouteEvaluator] = None
+
+
+def get_route_evaluator() -> RouteEvaluator:
+    """
+    The shared RouteEvaluator
+    """
+    global _evaluator
+    if _evaluator is None:
+        _evaluator = RouteEvaluator()
+        atexit.register(_evaluator.close)
+    return _evaluator
@@ -8,11 +8,11 @@
 #
 from typing import Optional
 
-import commands2
-from wpilib import SmartDashboard
+from lib_6107.commands.profiled_command import ProfiledCommand
+from lib_6107.telemetry.publisher import get_dashboard
 
 
-class CommandTemplate(commands2.Command):  # change the name for your command
+class CommandTemplate(ProfiledCommand):  # change the name for your command
     """
     TODO: Describe this class here
     """
@@ -33,8 +33,8 @@ class CommandTemplate(commands2.Command):  # change the name for your command
         """
         self.start_time = round(self.container.get_enabled_time(), 2)
         print(f"{self.indent * '    '}** Started {self.getName()} at {self.start_time} s **", flush=True)
-        SmartDashboard.putString("alert",
-                                 f"** Started {self.getName()} at {self.start_time - self.container.get_enabled_time():2.2f} s **")
+        get_dashboard().publish_string("alert",
+                                       f"** Started {self.getName()} at {self.start_time - self.container.get_enabled_time():2.2f} s **")
 
     def execute(self) -> None:
         pass
@@ -48,5 +48,5 @@ class CommandTemplate(commands2.Command):  # change the name for your command
 
         if self.print_end_message:
             print(f"{self.indent * '    '}** {message} {self.getName()} at {end_time:.1f} s after {end_time - self.start_time:.1f} s **")
-            SmartDashboard.putString(f"alert",
-                                     f"** {message} {self.getName()} at {end_time:.1f} s after {end_time - self.start_time:.1f} s **")
+            get_dashboard().publish_string("alert",
+                                           f"** {message} {self.getName()} at {end_time:.1f} s after {end_time - self.start_time:.1f} s **")
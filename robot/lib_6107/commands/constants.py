@@ -15,4 +15,12 @@
 #    Jemison High School - Huntsville Alabama                              #
 # ------------------------------------------------------------------------ #
 #
-# Constants for source in this subdictory will go here
\ No newline at end of file
+# Constants for source in this subdictory will go here
+
+class CommandConstants:
+    """
+    Constants for the commands in lib_6107.commands
+    """
+    class Profiler:
+        Enabled = True                  # Time initialize/execute/end of every ProfiledCommand
+        ReportSize = 10                 # Commands listed in the most expensive commands report
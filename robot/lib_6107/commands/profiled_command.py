@@ -0,0 +1,182 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Command lifecycle profiling.
+#
+# Commands that derive from ProfiledCommand (or add ProfiledCommandMixin ahead of
+# a commands2 command class) have their initialize(), execute() and end() timed.
+# The times are aggregated per command name across the whole session into
+# constant memory histograms, and get_command_profiler().report() lists the most
+# expensive commands:
+#
+#   class DriveDistance(ProfiledCommand):
+#       def execute(self) -> None:
+#           ...
+#
+import functools
+import logging
+import time
+
+from typing import Callable, Dict, List, Optional
+
+import commands2
+
+from lib_6107.commands.constants import CommandConstants
+from lib_6107.telemetry.loop_timing import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("initialize", "execute", "end")
+
+
+class CommandProfile:
+    """
+    Timing of one command (by name) across the session
+    """
+    __slots__ = ("name", "initialize", "execute", "end")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.initialize = LatencyHistogram()
+        self.execute = LatencyHistogram()
+        self.end = LatencyHistogram()
+
+    @property
+    def runs(self) -> int:
+        return self.initialize.count
+
+    @property
+    def total(self) -> float:
+        """
+        Seconds spent in the command's lifecycle methods in total
+        """
+        return self.initialize.total + self.execute.total + self.end.total
+
+
+class CommandProfiler:
+    """
+    Aggregates ProfiledCommand timing by command name
+    """
+    def __init__(self, enabled: bool = CommandConstants.Profiler.Enabled):
+        self.enabled = enabled
+        self._profiles: Dict[str, CommandProfile] = {}
+
+    @property
+    def profiles(self) -> Dict[str, CommandProfile]:
+        return self._profiles
+
+    def record(self, name: str, phase: str, seconds: float) -> None:
+        profile = self._profiles.get(name)
+        if profile is None:
+            profile = self._profiles[name] = CommandProfile(name)
+
+        getattr(profile, phase).record(seconds)
+
+    def most_expensive(self, count: int = CommandConstants.Profiler.ReportSize,
+                       key: Callable[[CommandProfile], float] = lambda profile: profile.total) -> List[CommandProfile]:
+        """
+        Profiles sorted by cost, most expensive first
+
+        :param count: Number of profiles to return
+        :param key:   Cost of a profile, defaults to the total time. For the worst single
+                      loop use 'lambda p: p.execute.max'.
+        """
+        return sorted(self._profiles.values(), key=key, reverse=True)[:count]
+
+    def report(self, count: int = CommandConstants.Profiler.ReportSize) -> str:
+        lines = [f"Most expensive of {len(self._profiles)} commands (ms):",
+                 f"  {'command':>32} {'phase':>10} {'count':>7} {'mean':>8} {'p50':>8} {'p95':>8} "
+                 f"{'p99':>8} {'max':>8}"]
+
+        for profile in self.most_expensive(count):
+            lines.append(f"  {profile.name:>32} {'runs':>10} {profile.runs:7d}   total: {profile.total * 1e3:.2f} ms")
+            for phase in PHASES:
+                h: LatencyHistogram = getattr(profile, phase)
+                if h.count:
+                    lines.append(f"  {'':>32} {phase:>10} {h.count:7d} {h.mean * 1e3:8.3f} "
+                                 f"{h.percentile(50) * 1e3:8.3f} {h.percentile(95) * 1e3:8.3f} "
+                                 f"{h.percentile(99) * 1e3:8.3f} {h.max * 1e3:8.3f}")
+
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        self._profiles.clear()
+
+
+_command_profiler: Optional[CommandProfiler] = None
+
+
+def get_command_profiler() -> CommandProfiler:
+    """
+    The shared CommandProfiler for the robot
+    """
+    global _command_profiler
+    if _command_profiler is None:
+        _command_profiler = CommandProfiler()
+    return _command_profiler
+
+
+def _profiled(phase: str, func: Callable) -> Callable:
+    """
+    Wrap a lifecycle method so its time is recorded. When an override calls
+    super(), only the outermost call is recorded.
+    """
+    clock = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        profiler = get_command_profiler()
+        if not profiler.enabled or self._profiling:
+            return func(self, *args, **kwargs)
+
+        self._profiling = True
+        start = clock()
+        try:
+            return func(self, *args, **kwargs)
+
+        finally:
+            elapsed = clock() - start
+            self._profiling = False
+            profiler.record(self.getName(), phase, elapsed * 1e-9)
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+class ProfiledCommandMixin:
+    """
+    Times initialize(), execute() and end() of every subclass.
+
+    Put the mixin ahead of the commands2 class: class MyGroup(ProfiledCommandMixin, SequentialCommandGroup)
+    """
+    _profiling = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Wrap the methods the class defines as well as the ones it inherits from the
+        # commands2 classes, such as execute() of a command group
+        for phase in PHASES:
+            method = getattr(cls, phase, None)
+            if method is not None and not getattr(method, "__profiled__", False):
+                setattr(cls, phase, _profiled(phase, method))
+
+
+class ProfiledCommand(ProfiledCommandMixin, commands2.Command):
+    """
+    commands2.Command with lifecycle profiling
+    """
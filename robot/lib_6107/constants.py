@@ -60,6 +60,18 @@ class XrpConstants:
         # FreeSpeed = radians_per_second(NoLoadOutputSpeed * (2 * math.pi) / 60)  # ~ 9.42 radians_per_second
         # MotorCount = 1  # Number of motors in a gearbox.
 
+    class Battery:
+        # The XRP runs from 4 AA cells. These values are for NiMH rechargeable cells, which
+        # are ~1.4V each when fully charged and fall off quickly below ~1.1V. The internal
+        # resistance includes the cells, the battery holder springs and the wiring.
+        CellCount = 4
+        CapacityAh = 2.0                  # Amp-hours
+        InternalResistance = 0.25         # Ohms for the whole pack
+        ElectronicsCurrent = 0.1          # Amps drawn by the controller board and Wi-Fi
+
+        # Open circuit cell voltage versus state of charge, (state of charge, volts)
+        CellVoltageCurve = ((0.0, 1.00), (0.05, 1.10), (0.2, 1.20), (0.8, 1.27), (0.95, 1.33), (1.0, 1.40))
+
     class MotorDeviceNumber(IntEnum):
         LeftDeviceNumber = 0
         RightDeviceNumber = 1
@@ -0,0 +1,223 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Vectorized simulation of many XRP drivetrains stepped in lockstep.
+#
+# Unlike physics.py, which advances a single robot through pyfrc/wpilib once per
+# robot loop, this engine keeps the state of N robots in NumPy arrays and steps
+# all of them with a handful of array operations.  It is intended for "what-if"
+# analysis (thousands of drives per autonomous change), not for the GUI simulator.
+#
+import logging
+
+from typing import Optional, Union
+
+import numpy as np
+
+from lib_6107.simulation.xrp_model import XrpDriveModel
+
+logger = logging.getLogger(__name__)
+
+ArrayLike = Union[float, np.ndarray]
+
+
+class BatchDrivetrainSim:
+    """
+    Holds N XRP robot states (pose, wheel speeds, wheel travel and encoder counts)
+    and advances all of them in a single vectorized call to :meth:`step`.
+
+    Motor commands are per-wheel [-1.0..1.0] where positive drives that wheel
+    forward (motor inversion has already been applied).
+    """
+    def __init__(self, count: int, model: Optional[XrpDriveModel] = None, deadband: float = 0.0):
+        """
+        :param count:    Number of robots to simulate
+        :param model:    Drivetrain model, defaults to one built from XrpConstants
+        :param deadband: Motor commands with a magnitude below this are treated as zero
+        """
+        if count <= 0:
+            raise ValueError(f"count must be positive, got {count}")
+
+        self._count = count
+        self._model = model or XrpDriveModel()
+        self._deadband = deadband
+        self._time = 0.0
+
+        # Robot state
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.theta = np.zeros(count)
+        self.left_speed = np.zeros(count)           # m/s
+        self.right_speed = np.zeros(count)          # m/s
+        self.left_distance = np.zeros(count)        # m of wheel travel
+        self.right_distance = np.zeros(count)
+        self.left_counts = np.zeros(count, dtype=np.int64)
+        self.right_counts = np.zeros(count, dtype=np.int64)
+
+        # Scratch buffers so that step() does not allocate (with a scalar voltage)
+        self._left_target = np.empty(count)
+        self._right_target = np.empty(count)
+        self._v = np.empty(count)
+        self._omega = np.empty(count)
+        self._heading = np.empty(count)
+        self._scratch = np.empty(count)
+        self._scratch2 = np.empty(count)
+        self._mask = np.empty(count, dtype=bool)
+
+        # The wheel speed decay only depends on dt, so cache it for the common fixed step
+        self._decay_dt = None
+        self._decay = 1.0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def model(self) -> XrpDriveModel:
+        return self._model
+
+    @property
+    def time(self) -> float:
+        """
+        Simulated time (seconds) since the last reset
+        """
+        return self._time
+
+    @property
+    def pose(self) -> np.ndarray:
+        """
+        Poses of all robots as an (N, 3) array of x, y, theta
+        """
+        return np.column_stack((self.x, self.y, self.theta))
+
+    def reset(self, x: ArrayLike = 0.0, y: ArrayLike = 0.0, theta: ArrayLike = 0.0) -> None:
+        """
+        Reset all robots to a stopped state at the given pose(s).
+
+        :param x:     Starting X (m), scalar or one per robot
+        :param y:     Starting Y (m), scalar or one per robot
+        :param theta: Starting heading (radians), scalar or one per robot
+        """
+        self.x[:] = x
+        self.y[:] = y
+        self.theta[:] = theta
+
+        for array in (self.left_speed, self.right_speed, self.left_distance,
+                      self.right_distance, self.left_counts, self.right_counts):
+            array.fill(0)
+
+        self._time = 0.0
+
+    def step(self, left_command: ArrayLike, right_command: ArrayLike, dt: float,
+             voltage: ArrayLike = None) -> None:
+        """
+        Advance every robot by dt seconds.
+
+        :param left_command:  Left wheel command(s) [-1.0..1.0], scalar or one per robot
+        :param right_command: Right wheel command(s) [-1.0..1.0], scalar or one per robot
+        :param dt:            Time step in seconds
+        :param voltage:       Supply voltage(s), defaults to the motor nominal voltage
+        """
+        model = self._model
+        if voltage is None:
+            voltage = model.nominal_voltage
+
+        # Applied voltage -> steady state wheel speed
+        gain = model.kv * model.wheel_radius * voltage
+        self._command_to_target(left_command, gain, self._left_target)
+        self._command_to_target(right_command, gain, self._right_target)
+
+        # Exact step of the first order wheel dynamics (see XrpDriveModel.speed_decay)
+        if dt != self._decay_dt:
+            self._decay_dt = dt
+            self._decay = model.speed_decay(dt)
+
+        left_speed, right_speed = self.left_speed, self.right_speed
+        v, omega, heading, scratch = self._v, self._omega, self._heading, self._scratch
+
+        # Average speed over the step is used to advance the pose and the wheels
+        #   mean = target + (v0 - target) * (1 - decay) / (k * dt)
+        mean_factor = (1.0 - self._decay) / (model.k_emf * dt) if dt > 0 else 1.0
+
+        np.subtract(left_speed, self._left_target, out=scratch)
+        np.multiply(scratch, mean_factor, out=v)
+        np.add(v, self._left_target, out=v)                      # v = mean left speed
+        np.multiply(scratch, self._decay, out=scratch)
+        np.add(scratch, self._left_target, out=left_speed)
+
+        np.subtract(right_speed, self._right_target, out=scratch)
+        np.multiply(scratch, mean_factor, out=omega)
+        np.add(omega, self._right_target, out=omega)             # omega = mean right speed
+        np.multiply(scratch, self._decay, out=scratch)
+        np.add(scratch, self._right_target, out=right_speed)
+
+        # Wheel travel and quantized encoder counts
+        np.multiply(v, dt, out=scratch)
+        self.left_distance += scratch
+        np.multiply(omega, dt, out=scratch)
+        self.right_distance += scratch
+        np.multiply(self.left_distance, model.counts_per_meter, out=scratch)
+        np.floor(scratch, out=scratch)
+        self.left_counts[:] = scratch
+        np.multiply(self.right_distance, model.counts_per_meter, out=scratch)
+        np.floor(scratch, out=scratch)
+        self.right_counts[:] = scratch
+
+        # Differential drive kinematics: left/right -> chassis v / omega
+        np.subtract(omega, v, out=scratch)                       # right - left
+        np.add(v, omega, out=v)
+        v *= 0.5
+        np.divide(scratch, model.track_width, out=omega)
+
+        self._integrate_pose(v, omega, dt, heading, scratch)
+        self._time += dt
+
+    def _command_to_target(self, command: ArrayLike, gain: ArrayLike, out: np.ndarray) -> None:
+        out[:] = command
+        np.clip(out, -1.0, 1.0, out=out)
+        if self._deadband > 0.0:
+            np.abs(out, out=self._scratch)
+            np.less(self._scratch, self._deadband, out=self._mask)
+            np.putmask(out, self._mask, 0.0)
+        out *= gain
+
+    def _integrate_pose(self, v: np.ndarray, omega: np.ndarray, dt: float,
+                        heading: np.ndarray, scratch: np.ndarray) -> None:
+        """
+        Move each robot along a constant curvature arc (the same twist exponential
+        that Pose2d.exp() uses) so straight lines and pivots are both exact.
+        """
+        # Distance travelled along the arc, projected with the mid-step heading.
+        # chord / arc = sin(d_theta / 2) / (d_theta / 2), which is 1 for a straight line.
+        omega *= dt                                              # omega = d_theta
+        np.multiply(omega, 0.5, out=heading)
+        sine, turning = self._scratch2, self._mask
+        np.sin(heading, out=sine)
+        np.not_equal(heading, 0.0, out=turning)
+        scratch.fill(1.0)
+        np.divide(sine, heading, out=scratch, where=turning)
+        scratch *= v
+        scratch *= dt                                            # chord length
+        heading += self.theta                                    # mid-step heading
+
+        np.cos(heading, out=sine)
+        sine *= scratch
+        self.x += sine
+        np.sin(heading, out=sine)
+        sine *= scratch
+        self.y += sine
+        self.theta += omega
@@ -0,0 +1,106 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Battery model for the XRP supply: open circuit voltage that follows the state
+# of charge, plus an internal resistance that makes the bus voltage sag under load.
+#
+import bisect
+import logging
+
+from typing import Sequence, Tuple
+
+from lib_6107.constants import XrpConstants
+
+logger = logging.getLogger(__name__)
+
+
+class BatterySim:
+    """
+    Simulated XRP battery pack.
+
+    Each tick the total current drawn is used to discharge the pack and to compute
+    the loaded bus voltage:
+
+        V_bus = V_open_circuit(state of charge) - I * R_internal
+    """
+    def __init__(self, cell_count: int = XrpConstants.Battery.CellCount,
+                 capacity_ah: float = XrpConstants.Battery.CapacityAh,
+                 internal_resistance: float = XrpConstants.Battery.InternalResistance,
+                 cell_curve: Sequence[Tuple[float, float]] = XrpConstants.Battery.CellVoltageCurve,
+                 state_of_charge: float = 1.0):
+        """
+        :param cell_count:          Cells in series
+        :param capacity_ah:         Pack capacity in amp-hours
+        :param internal_resistance: Pack internal resistance in ohms
+        :param cell_curve:          (state of charge, cell volts) points, in increasing charge order
+        :param state_of_charge:     Starting charge [0.0..1.0]
+        """
+        if capacity_ah <= 0:
+            raise ValueError(f"capacity_ah must be positive, got {capacity_ah}")
+
+        self._capacity_coulombs = capacity_ah * 3600.0
+        self._resistance = internal_resistance
+        self._curve_soc = [point[0] for point in cell_curve]
+        self._curve_volts = [point[1] * cell_count for point in cell_curve]
+
+        self.state_of_charge = min(max(state_of_charge, 0.0), 1.0)
+        self.current = 0.0                  # Amps drawn during the last tick
+        self.voltage = self.open_circuit_voltage
+        self.energy = 0.0                   # Joules delivered since the last reset_energy()
+
+    @property
+    def open_circuit_voltage(self) -> float:
+        """
+        Unloaded pack voltage at the present state of charge
+        """
+        soc, volts = self._curve_soc, self._curve_volts
+        index = bisect.bisect_left(soc, self.state_of_charge)
+        if index <= 0:
+            return volts[0]
+
+        if index >= len(soc):
+            return volts[-1]
+
+        fraction = (self.state_of_charge - soc[index - 1]) / (soc[index] - soc[index - 1])
+        return volts[index - 1] + fraction * (volts[index] - volts[index - 1])
+
+    def reset_energy(self) -> None:
+        self.energy = 0.0
+
+    def get_state(self) -> tuple:
+        return self.state_of_charge, self.current, self.voltage, self.energy
+
+    def set_state(self, state: tuple) -> None:
+        self.state_of_charge, self.current, self.voltage, self.energy = state
+
+    def update(self, current: float, tm_diff: float) -> float:
+        """
+        Draw current from the pack for one tick
+
+        :param current: Total current drawn in amps (charging is ignored)
+        :param tm_diff: Time step in seconds
+
+        :return: The loaded bus voltage
+        """
+        current = max(current, 0.0)
+        self.current = current
+
+        self.state_of_charge = max(self.state_of_charge - current * tm_diff / self._capacity_coulombs, 0.0)
+        self.voltage = max(self.open_circuit_voltage - current * self._resistance, 0.0)
+        self.energy += self.voltage * current * tm_diff
+
+        return self.voltage
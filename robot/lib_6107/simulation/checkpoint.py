@@ -0,0 +1,98 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Checkpoints of a running simulation.
+#
+# A checkpoint holds everything needed to continue a headless simulation from a
+# given moment: the clock and mode, the physics engine state (pose, drivetrain,
+# sensors, battery) and the robot container state (scheduled commands, start
+# time, motor outputs). Taking and restoring one only copies a few tuples, so
+# search style tools can run many continuations from the same mid-match moment
+# without re-simulating from t=0:
+#
+#   checkpoint = sim.checkpoint()
+#   for candidate in candidates:
+#       sim.restore(checkpoint)
+#       sim.run(5.0, inputs=candidate)
+#
+import logging
+import pickle
+
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+class SimCheckpoint:
+    """
+    Snapshot of a HeadlessSimulation, in memory or saved to disk
+    """
+    __slots__ = ("time", "ticks", "mode", "fpga_time", "physics", "container")
+
+    def __init__(self, time: float, ticks: int, mode: str, fpga_time: float,
+                 physics: Dict[str, Any], container: Dict[str, Any]):
+        """
+        :param time:      Simulated seconds since the simulation started
+        :param ticks:     Robot loops run so far
+        :param mode:      HeadlessSimulation.Mode the robot was in
+        :param fpga_time: FPGA timestamp (seconds) the robot code saw
+        :param physics:   PhysicsEngine.checkpoint() snapshot
+        :param container: RobotContainer.checkpoint() snapshot
+        """
+        self.time = time
+        self.ticks = ticks
+        self.mode = mode
+        self.fpga_time = fpga_time
+        self.physics = physics
+        self.container = container
+
+    def __repr__(self) -> str:
+        return f"SimCheckpoint(time={self.time:.3f}, ticks={self.ticks}, mode={self.mode})"
+
+    def save(self, path: str) -> None:
+        """
+        Write the checkpoint to a file.
+
+        The scheduled commands are already held by name (RobotContainer.named_commands()),
+        so a checkpoint loaded in another process restores them as well.
+        """
+        with open(path, "wb") as f:
+            pickle.dump({"version": CHECKPOINT_VERSION,
+                         "time": self.time,
+                         "ticks": self.ticks,
+                         "mode": self.mode,
+                         "fpga_time": self.fpga_time,
+                         "physics": self.physics,
+                         "container": self.container}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> "SimCheckpoint":
+        """
+        Read a checkpoint written by save()
+
+        :raises ValueError: if the file is from an incompatible version
+        """
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+
+        if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"{path}: not a version {CHECKPOINT_VERSION} simulation checkpoint")
+
+        return cls(data["time"], data["ticks"], data["mode"], data["fpga_time"],
+                   data["physics"], data["container"])
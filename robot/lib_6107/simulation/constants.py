@@ -0,0 +1,55 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Constants for source in this subdirectory will go here
+
+class SimConstants:
+    """
+    Constants that control the robot simulation (physics.py and headless.py)
+    """
+    class Backend:
+        Analytic = "analytic"                   # Fast, unit-free XRP motor/chassis model
+        DrivetrainSim = "drivetrain-sim"        # Full fidelity wpilib DifferentialDrivetrainSim
+        Integrated = "integrated"               # XRP model stepped by a configurable fixed-step integrator
+
+    PhysicsBackend = Backend.Analytic           # Backend used by the PhysicsEngine
+
+    # Integrator for the 'integrated' backend. The XRP wheel time constant is ~1 ms, so the
+    # explicit schemes need ~10 substeps of a 20 ms step to be stable. Run
+    # 'python -m lib_6107.simulation.integrators' to pick the cheapest accurate choice.
+    IntegrationMethod = "semi-implicit"         # 'euler', 'semi-implicit' or 'rk4'
+    IntegrationStep = 0.020                     # Fixed internal step (seconds)
+    IntegrationSubsteps = 10                    # Substeps per internal step
+
+    CostReportInterval = 500                    # Ticks between per-tick cost log messages (10 s at 50 Hz)
+
+    # Field geometry, the file is relative to the deploy directory. If it is missing, an
+    # empty field of the given size is used.
+    FieldFile = "field/xrp_field.json"
+    FieldWidth = 17.5                           # meters
+    FieldHeight = 8.0
+
+    # Simulated XRP gyro error model (degrees per second). Zero gives a perfect gyro.
+    GyroDriftRate = 0.0
+    GyroNoise = 0.0
+    GyroSeed = 0
+
+    BatteryStateOfCharge = 1.0                  # Starting charge of the simulated battery [0.0..1.0]
+
+    # Session file to record every physics tick to, or None. The XRP_RECORD_SESSION environment
+    # variable overrides this. Replay a session with 'python headless.py --replay <file>'.
+    RecordSession = None
@@ -0,0 +1,252 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Field geometry (walls and obstacles) with a uniform-grid spatial hash so that
+# collision queries only look at the segments near the robot.
+#
+# Field files are JSON:
+#
+#   {
+#       "width": 17.5,                      # Field boundary (m), adds the four outer walls
+#       "height": 8.0,
+#       "cell_size": 0.5,                   # Optional spatial hash cell size (m)
+#       "walls": [[x1, y1, x2, y2], ...],   # Individual wall segments
+#       "obstacles": [                      # Closed polygons, one list of [x, y] corners each
+#           [[x1, y1], [x2, y2], [x3, y3], ...]
+#       ]
+#   }
+#
+import json
+import logging
+import math
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from lib_6107.constants import XrpConstants
+
+logger = logging.getLogger(__name__)
+
+Cell = Tuple[int, int]
+
+
+class FieldGeometry:
+    """
+    Walls and obstacles on the field stored as line segments in a spatial hash.
+    """
+    DEFAULT_CELL_SIZE = 0.5
+
+    def __init__(self, width: float, height: float, segments: Optional[Iterable[Sequence[float]]] = None,
+                 cell_size: float = DEFAULT_CELL_SIZE):
+        """
+        :param width:     Field width (X) in meters, the boundary walls are added automatically
+        :param height:    Field height (Y) in meters
+        :param segments:  Additional wall segments as (x1, y1, x2, y2)
+        :param cell_size: Spatial hash cell size in meters
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Field size must be positive, got {width} x {height}")
+
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+
+        self._width = width
+        self._height = height
+        self._cell_size = cell_size
+
+        boundary = [(0.0, 0.0, width, 0.0), (width, 0.0, width, height),
+                    (width, height, 0.0, height), (0.0, height, 0.0, 0.0)]
+
+        self._segments = np.array(boundary + [tuple(map(float, s)) for s in (segments or [])], dtype=float)
+        if self._segments.ndim != 2 or self._segments.shape[1] != 4:
+            raise ValueError("Segments must be (x1, y1, x2, y2)")
+
+        # Plain tuples are much faster than NumPy rows for the scalar collision math
+        self._segment_list: List[Tuple[float, float, float, float]] = [tuple(map(float, s)) for s in self._segments]
+
+        self._grid: Dict[Cell, List[int]] = {}
+        for index, segment in enumerate(self._segment_list):
+            for cell in self._segment_cells(*segment):
+                self._grid.setdefault(cell, []).append(index)
+
+    @classmethod
+    def load(cls, path: str) -> "FieldGeometry":
+        """
+        Load a field from a JSON field file (see the module comment for the layout)
+        """
+        with open(path, "r") as f:
+            data = json.load(f)
+
+        segments = [tuple(wall) for wall in data.get("walls", [])]
+
+        for polygon in data.get("obstacles", []):
+            if len(polygon) < 2:
+                raise ValueError(f"{path}: obstacle needs at least two corners: {polygon}")
+
+            for (x1, y1), (x2, y2) in zip(polygon, polygon[1:] + polygon[:1]):
+                segments.append((x1, y1, x2, y2))
+
+        field = cls(data["width"], data["height"], segments,
+                    cell_size=data.get("cell_size", cls.DEFAULT_CELL_SIZE))
+
+        logger.info(f"Loaded field {path}: {field.width} x {field.height} m, {len(field.segments)} segments")
+        return field
+
+    @property
+    def width(self) -> float:
+        return self._width
+
+    @property
+    def height(self) -> float:
+        return self._height
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell_size
+
+    @property
+    def segments(self) -> np.ndarray:
+        """
+        All wall segments (including the boundary) as an (N, 4) array of x1, y1, x2, y2
+        """
+        return self._segments
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return int(math.floor(x / self._cell_size)), int(math.floor(y / self._cell_size))
+
+    def _segment_cells(self, x1: float, y1: float, x2: float, y2: float) -> Iterable[Cell]:
+        """
+        Cells touched by a segment. Walks the segment's bounding box, which is exact
+        for the axis aligned walls that make up most fields and conservative otherwise.
+        """
+        cx1, cy1 = self._cell(min(x1, x2), min(y1, y2))
+        cx2, cy2 = self._cell(max(x1, x2), max(y1, y2))
+
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                yield cx, cy
+
+    def query(self, x_min: float, y_min: float, x_max: float, y_max: float) -> Set[int]:
+        """
+        Indexes of the segments that may intersect the axis aligned box
+        """
+        cx1, cy1 = self._cell(x_min, y_min)
+        cx2, cy2 = self._cell(x_max, y_max)
+        grid = self._grid
+        found: Set[int] = set()
+
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                indexes = grid.get((cx, cy))
+                if indexes:
+                    found.update(indexes)
+
+        return found
+
+    def resolve(self, x: float, y: float, theta: float,
+                width: float = XrpConstants.Physical.RobotWidth,
+                length: float = XrpConstants.Physical.RobotLength,
+                iterations: int = 4) -> Tuple[float, float, bool]:
+        """
+        Push a robot footprint out of any walls it overlaps.
+
+        The footprint is a rectangle centered on (x, y), with its length along the
+        heading. Each iteration finds the overlapping segments near the robot and
+        applies the smallest translation that separates the footprint from each.
+        Finally the footprint is kept inside the field boundary.
+
+        :param x:          Robot center X (m)
+        :param y:          Robot center Y (m)
+        :param theta:      Robot heading (radians)
+        :param width:      Footprint width (m), side to side
+        :param length:     Footprint length (m), front to back
+        :param iterations: Maximum number of resolution passes
+
+        :return: Resolved (x, y) and True if any collision was found
+        """
+        half_length, half_width = length / 2, width / 2
+        cos_t, sin_t = math.cos(theta), math.sin(theta)
+        ux, uy = cos_t, sin_t                   # Forward axis
+        vx, vy = -sin_t, cos_t                  # Left axis
+
+        # Radius of the footprint's axis aligned bounding box
+        extent_x = half_length * abs(cos_t) + half_width * abs(sin_t)
+        extent_y = half_length * abs(sin_t) + half_width * abs(cos_t)
+
+        collided = False
+        segments = self._segment_list
+
+        for _ in range(iterations):
+            moved = False
+            for index in self.query(x - extent_x, y - extent_y, x + extent_x, y + extent_y):
+                x1, y1, x2, y2 = segments[index]
+                push = self._separation(x, y, ux, uy, vx, vy, half_length, half_width, x1, y1, x2, y2)
+                if push is not None:
+                    x += push[0]
+                    y += push[1]
+                    moved = collided = True
+
+            if not moved:
+                break
+
+        # The boundary walls are thin segments, so a footprint whose center is already
+        # past one gets pushed further out above. Treat the boundary as half-planes.
+        bounded_x = min(max(x, extent_x), self._width - extent_x) if 2 * extent_x < self._width else self._width / 2
+        bounded_y = min(max(y, extent_y), self._height - extent_y) if 2 * extent_y < self._height else self._height / 2
+        if bounded_x != x or bounded_y != y:
+            x, y, collided = bounded_x, bounded_y, True
+
+        return x, y, collided
+
+    @staticmethod
+    def _separation(x: float, y: float, ux: float, uy: float, vx: float, vy: float,
+                    half_length: float, half_width: float,
+                    x1: float, y1: float, x2: float, y2: float) -> Optional[Tuple[float, float]]:
+        """
+        Separating axis test between the footprint and a segment.
+
+        :return: The minimum translation that moves the footprint off the segment, or
+                 None if they do not overlap
+        """
+        dx, dy = x2 - x1, y2 - y1
+        seg_length = math.hypot(dx, dy)
+        if seg_length == 0.0:
+            return None
+
+        best_depth = math.inf
+        best_axis = None
+
+        for ax, ay in ((ux, uy), (vx, vy), (-dy / seg_length, dx / seg_length)):
+            center = x * ax + y * ay
+            radius = half_length * abs(ux * ax + uy * ay) + half_width * abs(vx * ax + vy * ay)
+
+            p1, p2 = x1 * ax + y1 * ay, x2 * ax + y2 * ay
+            seg_min, seg_max = (p1, p2) if p1 < p2 else (p2, p1)
+
+            push_back = center + radius - seg_min        # Overlap if moved toward -axis
+            push_forward = seg_max - (center - radius)   # Overlap if moved toward +axis
+            if push_back <= 0.0 or push_forward <= 0.0:
+                return None                             # Found a separating axis
+
+            if push_back < best_depth:
+                best_depth, best_axis = push_back, (-ax, -ay)
+
+            if push_forward < best_depth:
+                best_depth, best_axis = push_forward, (ax, ay)
+
+        return best_axis[0] * best_depth, best_axis[1] * best_depth
@@ -0,0 +1,327 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Fixed-step integrators for the physics tick.
+#
+# update_sim() is called with whatever tm_diff the loop produced. The integrator
+# here consumes that time in fixed internal steps (carrying any remainder to the
+# next tick) and splits each internal step into N substeps, so accuracy does not
+# drift with loop jitter.
+#
+# Run this module to benchmark the schemes against a fine reference solution:
+#
+#   python -m lib_6107.simulation.integrators --threshold 0.01 --speed 10
+#
+import argparse
+import logging
+import math
+import sys
+import time
+
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from lib_6107.simulation.xrp_model import XrpDriveModel
+
+logger = logging.getLogger(__name__)
+
+# Position error (m) past which a benchmark run is considered to have blown up
+DIVERGED = 1000.0
+
+# Drivetrain state: (x, y, theta, left speed, right speed) and input: (left volts, right volts)
+State = Tuple[float, float, float, float, float]
+Input = Tuple[float, float]
+
+
+class DrivetrainSystem:
+    """
+    Continuous time XRP drivetrain equations for the integrators.
+
+    The state is split into the velocity part (wheel speeds) and the position part
+    (pose) so that the semi-implicit scheme can update them in order.
+    """
+    __slots__ = ("_k_drive", "_k_emf", "_track_width")
+
+    def __init__(self, model: XrpDriveModel = None):
+        model = model or XrpDriveModel()
+        self._k_drive = model.k_drive
+        self._k_emf = model.k_emf
+        self._track_width = model.track_width
+
+    def velocity_rates(self, state: State, u: Input) -> Tuple[float, float]:
+        return (self._k_drive * u[0] - self._k_emf * state[3],
+                self._k_drive * u[1] - self._k_emf * state[4])
+
+    def position_rates(self, state: State) -> Tuple[float, float, float]:
+        v = (state[3] + state[4]) / 2
+        return (v * math.cos(state[2]),
+                v * math.sin(state[2]),
+                (state[4] - state[3]) / self._track_width)
+
+    def derivative(self, state: State, u: Input) -> State:
+        return self.position_rates(state) + self.velocity_rates(state, u)
+
+
+def euler_step(system: DrivetrainSystem, state: State, u: Input, h: float) -> State:
+    """
+    Explicit (forward) Euler: first order, cheapest, only stable for h < 2 * time constant
+    """
+    d = system.derivative(state, u)
+    return tuple(s + h * ds for s, ds in zip(state, d))
+
+
+def semi_implicit_euler_step(system: DrivetrainSystem, state: State, u: Input, h: float) -> State:
+    """
+    Semi-implicit (symplectic) Euler: update the wheel speeds first, then move the
+    pose with the new speeds
+    """
+    dvl, dvr = system.velocity_rates(state, u)
+    vl, vr = state[3] + h * dvl, state[4] + h * dvr
+
+    dx, dy, dtheta = system.position_rates((state[0], state[1], state[2], vl, vr))
+    return state[0] + h * dx, state[1] + h * dy, state[2] + h * dtheta, vl, vr
+
+
+def rk4_step(system: DrivetrainSystem, state: State, u: Input, h: float) -> State:
+    """
+    Classic fourth order Runge-Kutta
+    """
+    half = h / 2
+    k1 = system.derivative(state, u)
+    k2 = system.derivative(tuple(s + half * k for s, k in zip(state, k1)), u)
+    k3 = system.derivative(tuple(s + half * k for s, k in zip(state, k2)), u)
+    k4 = system.derivative(tuple(s + h * k for s, k in zip(state, k3)), u)
+    sixth = h / 6
+    return tuple(s + sixth * (a + 2 * b + 2 * c + d) for s, a, b, c, d in zip(state, k1, k2, k3, k4))
+
+
+StepFunction = Callable[[DrivetrainSystem, State, Input, float], State]
+
+
+class IntegrationMethod:
+    Euler = "euler"
+    SemiImplicit = "semi-implicit"
+    RK4 = "rk4"
+
+
+STEP_FUNCTIONS: Dict[str, StepFunction] = {
+    IntegrationMethod.Euler: euler_step,
+    IntegrationMethod.SemiImplicit: semi_implicit_euler_step,
+    IntegrationMethod.RK4: rk4_step,
+}
+
+
+class FixedStepIntegrator:
+    """
+    Advances a DrivetrainSystem by whatever time each robot tick provides, using a
+    fixed internal step of dt split into substeps.
+
+    Time that does not fill a whole internal step is carried over to the next call,
+    so a jittery loop sees the same trajectory as a perfectly regular one.
+    """
+    def __init__(self, system: DrivetrainSystem, method: str = IntegrationMethod.RK4,
+                 dt: float = 0.020, substeps: int = 1):
+        """
+        :param system:   Equations to integrate
+        :param method:   One of the IntegrationMethod values
+        :param dt:       Fixed internal step in seconds
+        :param substeps: Number of substeps in each internal step
+        """
+        if method not in STEP_FUNCTIONS:
+            raise ValueError(f"Unknown integration method '{method}', expected one of {sorted(STEP_FUNCTIONS)}")
+
+        if dt <= 0 or substeps < 1:
+            raise ValueError(f"dt must be positive and substeps at least 1, got {dt} / {substeps}")
+
+        self._system = system
+        self._method = method
+        self._step = STEP_FUNCTIONS[method]
+        self._dt = dt
+        self._substeps = substeps
+        self._h = dt / substeps
+        self._remainder = 0.0
+
+    @property
+    def method(self) -> str:
+        return self._method
+
+    @property
+    def dt(self) -> float:
+        return self._dt
+
+    @property
+    def substeps(self) -> int:
+        return self._substeps
+
+    @property
+    def remainder(self) -> float:
+        """
+        Time (seconds) carried over to the next advance()
+        """
+        return self._remainder
+
+    @remainder.setter
+    def remainder(self, value: float) -> None:
+        self._remainder = value
+
+    def reset(self) -> None:
+        self._remainder = 0.0
+
+    def advance(self, state: State, u: Input, tm_diff: float) -> State:
+        """
+        Integrate for tm_diff seconds (plus any carried remainder) with a constant input
+
+        :return: The new state
+        """
+        elapsed = self._remainder + tm_diff
+        steps = int(elapsed / self._dt + 1e-9)
+        self._remainder = elapsed - steps * self._dt
+
+        step, system, h = self._step, self._system, self._h
+        for _ in range(steps * self._substeps):
+            state = step(system, state, u, h)
+
+        return state
+
+
+class BenchmarkResult:
+    __slots__ = ("method", "substeps", "tick_time", "final_error", "max_error", "stable")
+
+    def __init__(self, method: str, substeps: int, tick_time: float, final_error: float,
+                 max_error: float):
+        self.method = method
+        self.substeps = substeps
+        self.tick_time = tick_time          # Seconds of CPU per robot tick
+        self.final_error = final_error      # Position error (m) at the end of the run
+        self.max_error = max_error          # Largest position error (m) during the run
+        self.stable = max_error < DIVERGED
+
+    def __repr__(self) -> str:
+        return (f"{self.method:>13} x{self.substeps:<3}: {self.tick_time * 1e6:8.1f} us/tick, "
+                f"final error: {self.final_error:.5f} m, max error: {self.max_error:.5f} m")
+
+
+def _benchmark_inputs(duration: float, period: float, voltage: float) -> List[Input]:
+    """
+    A drive with step changes, a pivot and arcs in both directions
+    """
+    inputs = []
+    for tick in range(int(duration / period)):
+        t = tick * period
+        phase = int(t) % 5
+        if phase == 0:
+            inputs.append((voltage, voltage))
+        elif phase == 1:
+            inputs.append((voltage, 0.4 * voltage))
+        elif phase == 2:
+            inputs.append((-0.5 * voltage, 0.5 * voltage))
+        elif phase == 3:
+            inputs.append((0.3 * voltage, voltage))
+        else:
+            inputs.append((0.0, 0.0))
+    return inputs
+
+
+def benchmark(methods: Sequence[str] = (IntegrationMethod.Euler, IntegrationMethod.SemiImplicit,
+                                        IntegrationMethod.RK4),
+              substeps: Sequence[int] = (1, 2, 5, 10, 20, 40),
+              duration: float = 15.0, period: float = 0.020,
+              model: XrpDriveModel = None) -> List[BenchmarkResult]:
+    """
+    Compare each method / substep count against a finely stepped RK4 reference.
+
+    :return: One BenchmarkResult per combination
+    """
+    model = model or XrpDriveModel()
+    system = DrivetrainSystem(model)
+    inputs = _benchmark_inputs(duration, period, model.nominal_voltage)
+
+    # Reference solution, well below the ~1 ms time constant
+    reference_integrator = FixedStepIntegrator(system, IntegrationMethod.RK4, period, 200)
+    state: State = (0.0, 0.0, 0.0, 0.0, 0.0)
+    reference = []
+    for u in inputs:
+        state = reference_integrator.advance(state, u, period)
+        reference.append(state)
+
+    results = []
+    for method in methods:
+        for count in substeps:
+            integrator = FixedStepIntegrator(system, method, period, count)
+            state = (0.0, 0.0, 0.0, 0.0, 0.0)
+            max_error = 0.0
+            start = time.perf_counter()
+
+            try:
+                for u, ref in zip(inputs, reference):
+                    state = integrator.advance(state, u, period)
+                    error = math.hypot(state[0] - ref[0], state[1] - ref[1])
+                    if not error <= max_error:      # Also catches NaN
+                        max_error = error
+
+            except OverflowError:
+                max_error = math.inf
+
+            elapsed = time.perf_counter() - start
+            final_error = math.hypot(state[0] - reference[-1][0], state[1] - reference[-1][1])
+            if not final_error < DIVERGED:
+                max_error = math.inf
+
+            results.append(BenchmarkResult(method, count, elapsed / len(inputs), final_error, max_error))
+
+    return results
+
+
+def choose(results: Sequence[BenchmarkResult], threshold: float, speed: float,
+           period: float = 0.020) -> BenchmarkResult:
+    """
+    Cheapest scheme whose max position error is under the threshold and whose cost
+    still allows the simulation to run at the given speed factor
+
+    :raises ValueError: if no scheme qualifies
+    """
+    budget = period / speed
+    candidates = [r for r in results if r.stable and r.max_error < threshold and r.tick_time < budget]
+    if not candidates:
+        raise ValueError(f"No integrator keeps the error under {threshold} m within {budget * 1e6:.0f} us/tick")
+
+    return min(candidates, key=lambda r: r.tick_time)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the physics integrators")
+    parser.add_argument("--threshold", type=float, default=0.01, help="Maximum position error (m)")
+    parser.add_argument("--speed", type=float, default=10.0, help="Required simulation speed factor")
+    parser.add_argument("--duration", type=float, default=15.0, help="Simulated seconds to run")
+    args = parser.parse_args(argv)
+
+    results = benchmark(duration=args.duration)
+    for result in results:
+        print(result if result.stable else f"{result.method:>13} x{result.substeps:<3}: unstable")
+
+    try:
+        best = choose(results, args.threshold, args.speed)
+        print(f"\nCheapest under {args.threshold} m at {args.speed}x: {best.method} with {best.substeps} substeps")
+
+    except ValueError as e:
+        print(f"\n{e}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Sensor simulation stage for the physics engine.
+#
+# The physics backends produce wheel surface speeds. The classes here turn those
+# into what the robot code would read from the real hardware and write it into
+# the wpilib simulation devices once per tick.
+#
+import logging
+import math
+import random
+
+from typing import Optional
+
+from wpilib.simulation import EncoderSim, SimDeviceSim
+
+from lib_6107.simulation.xrp_model import XrpDriveModel
+
+logger = logging.getLogger(__name__)
+
+
+class WheelEncoderSim:
+    """
+    Simulated XRP wheel encoder.
+
+    Integrates wheel travel and quantizes it the way the real encoder does: on the
+    motor shaft (12 counts per motor revolution) through the gearbox, giving
+    XrpConstants.EncoderChannel.CountsPerRevolution counts per wheel revolution.
+    """
+    __slots__ = ("_sim", "_counts_per_meter", "_distance_per_pulse", "distance", "rate", "count")
+
+    def __init__(self, channel_a: int, model: XrpDriveModel = None):
+        """
+        :param channel_a: DIO channel A of the encoder the robot code has created
+        :param model:     Drivetrain model, defaults to one built from XrpConstants
+        """
+        model = model or XrpDriveModel()
+
+        # Look up the encoder the robot code allocated rather than allocating a second one
+        self._sim = EncoderSim.createForChannel(channel_a)
+        self._counts_per_meter = model.counts_per_meter
+        self._distance_per_pulse = 1.0 / self._counts_per_meter
+        self._sim.setDistancePerPulse(self._distance_per_pulse)
+
+        self.distance = 0.0         # True wheel travel (m)
+        self.rate = 0.0             # Wheel surface speed (m/s)
+        self.count = 0              # Quantized encoder count
+
+    @property
+    def encoder_sim(self) -> EncoderSim:
+        return self._sim
+
+    @property
+    def measured_distance(self) -> float:
+        """
+        Distance (m) as the robot code sees it, after quantization
+        """
+        return self.count * self._distance_per_pulse
+
+    def reset(self) -> None:
+        self.distance = 0.0
+        self.rate = 0.0
+        self.count = 0
+        self._sim.resetData()
+        self._sim.setDistancePerPulse(self._distance_per_pulse)
+
+    def get_state(self) -> tuple:
+        """
+        Snapshot of the encoder for a checkpoint
+        """
+        return self.distance, self.rate, self.count
+
+    def set_state(self, state: tuple) -> None:
+        """
+        Restore a get_state() snapshot and write it to the EncoderSim
+        """
+        self.distance, self.rate, self.count = state
+        self._sim.setCount(self.count)
+        self._sim.setRate(self.rate)
+
+    def update(self, wheel_speed: float, tm_diff: float) -> None:
+        """
+        Integrate the wheel travel and write count and rate to the EncoderSim.
+
+        The encoder distance seen by the robot is count * distance-per-pulse, so
+        writing the count also sets the distance.
+
+        :param wheel_speed: Wheel surface speed in m/s, forward is positive
+        :param tm_diff:     Time step in seconds
+        """
+        sim = self._sim
+
+        # The robot code zeroed the encoder since our last write, follow it
+        if sim.getCount() != self.count:
+            self.distance = 0.0
+
+        self.distance += wheel_speed * tm_diff
+        self.rate = wheel_speed
+
+        count = math.floor(self.distance * self._counts_per_meter)
+        if count != self.count:
+            self.count = count
+            sim.setCount(count)
+
+        sim.setRate(wheel_speed)
+
+
+class XrpGyroSim:
+    """
+    Simulated XRP gyro (the IMU on the XRP controller board).
+
+    Integrates the chassis yaw rate into a continuous (unwrapped) yaw, adds an
+    optional constant drift and white noise, and writes yaw and yaw rate to the
+    XRPGyro simulation device. The device values are looked up once so each
+    update is just two value writes.
+
+    Like other FRC gyros the XRPGyro is positive clockwise, while the simulated
+    pose is positive counter-clockwise, so the values are negated.
+    """
+    __slots__ = ("_angle_z", "_rate_z", "_drift_rate", "_noise", "_random",
+                 "yaw", "yaw_rate", "drift")
+
+    DEVICE_NAME = "Gyro:XRPGyro"
+
+    def __init__(self, drift_rate: float = 0.0, noise: float = 0.0, seed: Optional[int] = None):
+        """
+        :param drift_rate: Constant gyro bias in degrees per second
+        :param noise:      Standard deviation of the rate noise in degrees per second
+        :param seed:       Seed for the noise so runs can be repeated
+        """
+        device = SimDeviceSim(self.DEVICE_NAME)
+        self._angle_z = device.getDouble("angle_z")
+        self._rate_z = device.getDouble("rate_z")
+
+        if not self._angle_z or not self._rate_z:
+            logger.warning(f"{self.DEVICE_NAME} simulation device not found, "
+                           "has the robot code created an XRPGyro?")
+            self._angle_z = self._rate_z = None
+
+        self._drift_rate = drift_rate
+        self._noise = noise
+        self._random = random.Random(seed)
+
+        self.yaw = 0.0              # True yaw in radians, counter-clockwise positive
+        self.yaw_rate = 0.0         # True yaw rate in radians per second
+        self.drift = 0.0            # Accumulated drift and noise in degrees
+
+    def reset(self) -> None:
+        self.yaw = self.yaw_rate = self.drift = 0.0
+        self.update(0.0, 0.0)
+
+    def get_state(self) -> tuple:
+        """
+        Snapshot of the gyro, including the noise generator, for a checkpoint
+        """
+        return self.yaw, self.yaw_rate, self.drift, self._random.getstate()
+
+    def set_state(self, state: tuple) -> None:
+        """
+        Restore a get_state() snapshot and write it to the XRPGyro device
+        """
+        self.yaw, self.yaw_rate, self.drift, random_state = state
+        self._random.setstate(random_state)
+
+        if self._angle_z is not None:
+            self._angle_z.set(self.drift - math.degrees(self.yaw))
+            self._rate_z.set(self._drift_rate - math.degrees(self.yaw_rate))
+
+    def update(self, yaw_rate: float, tm_diff: float) -> None:
+        """
+        Advance the gyro by one tick
+
+        :param yaw_rate: Chassis yaw rate in radians per second, counter-clockwise positive
+        :param tm_diff:  Time step in seconds
+        """
+        self.yaw_rate = yaw_rate
+        self.yaw += yaw_rate * tm_diff
+
+        # Gyro error in degrees per second. The angle integrates it, so noise turns
+        # into a random walk the same way it does on the real IMU
+        error = self._drift_rate
+        if self._noise:
+            error += self._random.gauss(0.0, self._noise)
+
+        self.drift += error * tm_diff
+
+        if self._angle_z is not None:
+            self._angle_z.set(self.drift - math.degrees(self.yaw))
+            self._rate_z.set(error - math.degrees(yaw_rate))
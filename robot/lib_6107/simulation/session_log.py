@@ -0,0 +1,194 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Compact binary record of a simulation session, one fixed-width record per tick.
+#
+# File layout (little endian):
+#
+#   Header (32 bytes): magic 'XRPSESS1', version (u32), record size (u32),
+#                      record count (u64), reserved (8 bytes)
+#   Records:           SESSION_RECORD_DTYPE, back to back
+#
+# The file is preallocated and only ever appended to, so recording is a single
+# buffered write per tick. The record layout matches a NumPy structured dtype
+# so a session can be memory mapped straight into column arrays.
+#
+import logging
+import os
+import struct
+
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SESSION_MAGIC = b"XRPSESS1"
+SESSION_VERSION = 1
+
+_HEADER = struct.Struct("<8sIIQ8x")
+_RECORD = struct.Struct("<diffffddddd")
+
+SESSION_RECORD_DTYPE = np.dtype([
+    ("time", "<f8"),                # Simulation time (seconds)
+    ("mode", "<i4"),                # SessionMode value
+    ("joystick_x", "<f4"),          # Driver joystick axes
+    ("joystick_y", "<f4"),
+    ("left_output", "<f4"),         # Drive motor outputs [-1.0..1.0]
+    ("right_output", "<f4"),
+    ("x", "<f8"),                   # Ground truth pose (m, m, radians)
+    ("y", "<f8"),
+    ("theta", "<f8"),
+    ("left_distance", "<f8"),       # Encoder distances as the robot sees them (m)
+    ("right_distance", "<f8"),
+])
+assert SESSION_RECORD_DTYPE.itemsize == _RECORD.size
+
+
+class SessionMode:
+    DISABLED = 0
+    AUTONOMOUS = 1
+    TELEOP = 2
+    TEST = 3
+
+
+class SessionRecorder:
+    """
+    Appends one fixed-width record per tick to a preallocated session file
+    """
+    FLUSH_INTERVAL = 50             # Records between header updates (1 s at 50 Hz)
+
+    def __init__(self, path: str, capacity: int = 50 * 60 * 10):
+        """
+        :param path:     Session file to create (overwritten if it exists)
+        :param capacity: Records to preallocate space for, the file grows by doubling
+                         if a session runs longer. The default is 10 minutes at 50 Hz.
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+
+        self._path = path
+        self._capacity = capacity
+        self._count = 0
+        self._buffer = bytearray(_RECORD.size)
+
+        self._file = open(path, "w+b")
+        self._file.write(_HEADER.pack(SESSION_MAGIC, SESSION_VERSION, _RECORD.size, 0))
+        self._file.truncate(_HEADER.size + capacity * _RECORD.size)
+        self._file.seek(_HEADER.size)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def append(self, time: float, mode: int, joystick_x: float, joystick_y: float,
+               left_output: float, right_output: float, x: float, y: float, theta: float,
+               left_distance: float, right_distance: float) -> None:
+        """
+        Write one tick's record
+        """
+        if self._file is None:
+            raise ValueError(f"Session recorder for {self._path} is closed")
+
+        if self._count == self._capacity:
+            self._capacity *= 2
+            self._file.truncate(_HEADER.size + self._capacity * _RECORD.size)
+
+        _RECORD.pack_into(self._buffer, 0, time, mode, joystick_x, joystick_y, left_output, right_output,
+                          x, y, theta, left_distance, right_distance)
+        self._file.write(self._buffer)
+        self._count += 1
+
+        if self._count % self.FLUSH_INTERVAL == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Update the record count in the header so the file is readable as-is
+        """
+        if self._file is None:
+            return
+
+        position = self._file.tell()
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(SESSION_MAGIC, SESSION_VERSION, _RECORD.size, self._count))
+        self._file.seek(position)
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Flush and trim the unused preallocated space
+        """
+        if self._file is None:
+            return
+
+        self.flush()
+        self._file.truncate(_HEADER.size + self._count * _RECORD.size)
+        self._file.close()
+        self._file = None
+        logger.info(f"Recorded {self._count} ticks to {self._path}")
+
+
+def read_session(path: str, mode: str = "r") -> np.ndarray:
+    """
+    Memory map a session file as a structured array of SESSION_RECORD_DTYPE
+
+    :param path: Session file
+    :param mode: np.memmap mode, 'r' (default) or 'c' for copy-on-write
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+
+    if len(header) < _HEADER.size:
+        raise ValueError(f"{path}: too short to be a session file")
+
+    magic, version, record_size, count = _HEADER.unpack(header)
+    if magic != SESSION_MAGIC:
+        raise ValueError(f"{path}: not a session file")
+
+    if version != SESSION_VERSION or record_size != SESSION_RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: unsupported session version {version} / record size {record_size}")
+
+    # A session that was not closed may have more records than the header says
+    available = (os.path.getsize(path) - _HEADER.size) // record_size
+    count = min(count, available)
+    if count == 0:
+        return np.empty(0, dtype=SESSION_RECORD_DTYPE)
+
+    return np.memmap(path, dtype=SESSION_RECORD_DTYPE, mode=mode, offset=_HEADER.size, shape=(count,))
+
+
+def open_recorder(path: Optional[str]) -> Optional[SessionRecorder]:
+    """
+    Create a recorder if a path was configured
+    """
+    if not path:
+        return None
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    return SessionRecorder(path)
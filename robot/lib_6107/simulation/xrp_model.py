@@ -0,0 +1,121 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Unit-free (SI) drivetrain model of the XRP derived from XrpConstants.
+#
+# All of the values here are plain python floats so the model can be used by
+# the scalar physics backends as well as by the vectorized NumPy simulators
+# without dragging in pint Quantities.
+#
+import math
+
+from lib_6107.constants import XrpConstants
+
+
+class XrpDriveModel:
+    """
+    DC motor + chassis model for one side of the XRP drivetrain.
+
+    The XRP motor constants are specified at the gearbox output shaft (90 RPM free
+    speed), so the motor equations below are written at the wheel axle:
+
+        torque = Kt * (V - omega / Kv) / R
+
+    Each side of the robot carries half of the mass, which gives a first order
+    system for the surface speed of each wheel:
+
+        dv/dt = k_drive * V - k_emf * v
+    """
+    def __init__(self, physical=XrpConstants.Physical, motor=XrpConstants.Motor):
+        """
+        :param physical: Class (or object) with the XrpConstants.Physical attributes
+        :param motor:    Class (or object) with the XrpConstants.Motor attributes
+        """
+        self.wheel_radius: float = physical.WheelDiameter / 2
+        self.wheel_circumference: float = math.pi * physical.WheelDiameter
+        self.track_width: float = physical.TrackWidth
+        self.mass: float = physical.MassWithBatteries
+        self.gear_reduction: float = physical.GearReduction
+
+        self.nominal_voltage: float = motor.Voltage
+        self.motor_count: int = motor.MotorCount
+        self.stall_torque: float = motor.StallTorque
+        self.stall_current: float = motor.StallCurrent
+        self.free_current: float = motor.FreeCurrent
+        self.free_speed: float = motor.FreeSpeed                         # rad/s at the wheel
+        self.max_speed: float = motor.MaxSpeed
+
+        # DC motor coefficients (see wpimath DCMotor for the same derivation)
+        self.resistance: float = motor.Voltage / motor.StallCurrent       # Ohms
+        self.kt: float = motor.StallTorque / motor.StallCurrent           # N*m per amp
+        self.kv: float = motor.FreeSpeed / (motor.Voltage - self.resistance * motor.FreeCurrent)  # rad/s per volt
+
+        # Linear (surface speed) form of the motor + half-chassis equations
+        side_mass = self.mass / 2
+        torque_per_volt = self.motor_count * self.kt / self.resistance
+        self.k_drive: float = torque_per_volt / (self.wheel_radius * side_mass)  # (m/s^2) / V
+        self.k_emf: float = torque_per_volt / (self.kv * self.wheel_radius ** 2 * side_mass)  # 1/s
+
+        self.free_wheel_speed: float = self.free_speed * self.wheel_radius  # m/s at nominal voltage
+
+        # The encoder is on the motor shaft, so the 585 counts per wheel revolution are
+        # really 12 counts per motor revolution through the gearbox.
+        self.counts_per_motor_revolution: float = (XrpConstants.EncoderChannel.CountsPerRevolution /
+                                                   physical.GearReduction)
+
+    @property
+    def time_constant(self) -> float:
+        """
+        Time (seconds) for a wheel to reach ~63% of its commanded speed
+        """
+        return 1.0 / self.k_emf
+
+    def steady_state_speed(self, voltage: float) -> float:
+        """
+        Wheel surface speed (m/s) reached when a constant voltage is applied
+        """
+        return self.kv * self.wheel_radius * voltage
+
+    def speed_decay(self, dt: float) -> float:
+        """
+        Fraction of the speed error that remains after dt seconds.
+
+        The wheel dynamics are linear, so the exact discrete step is
+
+            v[k+1] = v_ss + (v[k] - v_ss) * speed_decay(dt)
+
+        which is stable for any dt.  The XRP time constant is ~1 ms, so an
+        explicit Euler step at the 20 ms robot period would not be.
+        """
+        return math.exp(-self.k_emf * dt)
+
+    def current(self, wheel_speed: float, voltage: float) -> float:
+        """
+        Current (amps) drawn by the motor(s) on one side.
+
+        :param wheel_speed: Wheel surface speed (m/s)
+        :param voltage:     Voltage applied to the motor(s)
+        """
+        omega = wheel_speed / self.wheel_radius
+        return self.motor_count * (voltage - omega / self.kv) / self.resistance
+
+    @property
+    def counts_per_meter(self) -> float:
+        """
+        Encoder counts per meter of wheel travel
+        """
+        return self.gear_reduction * self.counts_per_motor_revolution / self.wheel_circumference
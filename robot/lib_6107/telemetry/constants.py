@@ -0,0 +1,57 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Constants for source in this subdirectory will go here
+
+class TelemetryConstants:
+    """
+    Constants for the logging and telemetry support in lib_6107.telemetry
+    """
+    class HotLog:
+        Enabled = True                  # Master switch for all HotLoggers (see hot_log.set_enabled())
+        Interval = 0.25                 # Minimum seconds between two messages with the same key
+        Sample = 1                      # Only consider every Nth call for each key (1 is every call)
+
+    class Recorder:
+        Enabled = True                  # Record telemetry to a file while the robot runs
+        Directory = "telemetry"         # Where the telemetry files are written, the XRP_TELEMETRY_DIR
+                                        # environment variable overrides this
+        Capacity = 1500                 # Samples held per channel between flushes (30 s at 50 Hz)
+        FlushInterval = 1.0             # Seconds between background flushes
+        CompressionLevel = 1            # zlib level, fast compression keeps the flush thread cheap
+
+    class Dashboard:
+        Table = "SmartDashboard"        # NetworkTables table the DashboardPublisher writes to
+        Interval = 0.1                  # Minimum seconds between updates of one key (10 Hz)
+        RateWindow = 1.0                # Seconds over which the published bytes/second is measured
+
+    class LoopTiming:
+        Enabled = True                  # Time the robot loop phases (see loop_timing.py)
+        Period = 0.020                  # Loop budget in seconds, a loop busier than this is an overrun
+        HistogramMin = 1e-6             # Smallest latency (s) the histograms resolve, anything shorter is
+        HistogramMax = 1.0              # counted in the first bucket, anything longer in the last
+        BucketsPerDecade = 20           # Histogram resolution, ~12% bucket width
+        OverrunHistory = 32             # Most recent overruns kept for inspection
+
+    class Memory:
+        FreezeAfterInit = True          # gc.freeze() the objects robotInit created so GC never rescans them
+        ManualGcInMatch = False         # Disable automatic GC in autonomous/teleop, collect in disabledPeriodic
+        TrackAllocations = False        # Sample allocations per loop with tracemalloc (slows the robot loop)
+        AllocationSampleLoops = 50      # Loops between allocation snapshots
+        AllocationFrames = 1            # Stack frames tracemalloc keeps per allocation
+        AllocationTop = 10              # Allocation sites listed in the report
+        PauseHistory = 32               # Most recent GC pauses kept for inspection
@@ -0,0 +1,216 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Structured logging for code that runs every robot loop (20 ms).
+#
+# A plain 'logger.info(f"...")' formats its message on every call, even when the
+# message is then dropped. A HotLogger instead takes structured fields, formats
+# them only if a handler actually writes the record, and limits how often each
+# message key is logged:
+#
+#   _hot_log = HotLogger(logger)
+#
+#   if _hot_log.enabled:
+#       _hot_log.log("arcadeDrive", speed=speed, rotation=rotation)
+#
+# With the 'enabled' guard, a disabled logger costs a single attribute lookup at
+# the call site. The fields are also attached to the LogRecord as 'fields' so
+# handlers can store them without parsing the message.
+#
+# Run this module for a micro-benchmark of the call-site cost:
+#
+#   python -m lib_6107.telemetry.hot_log
+#
+import logging
+import sys
+import time
+import timeit
+import weakref
+
+from typing import Any, Dict, Optional, Union
+
+from lib_6107.telemetry.constants import TelemetryConstants
+
+_hot_loggers: "weakref.WeakSet[HotLogger]" = weakref.WeakSet()
+_enabled = TelemetryConstants.HotLog.Enabled
+
+
+class LazyFields:
+    """
+    Structured log fields, only turned into 'key=value' text when a handler formats the record
+    """
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: Dict[str, Any]):
+        self.fields = fields
+
+    def __str__(self) -> str:
+        return " ".join(f"{name}={_format_value(value)}" for name, value in self.fields.items())
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.4g}"
+
+    if isinstance(value, (tuple, list)):
+        return "(" + ", ".join(_format_value(v) for v in value) + ")"
+
+    return str(value)
+
+
+class HotLogger:
+    """
+    Rate limited, sampled, lazily formatted logger for the robot loop hot path.
+
+    Each message has a key (usually the method name). For every key, only every
+    'sample'th call is considered and at most one message is emitted per
+    'interval' seconds. Suppressed calls are counted and reported in the next
+    message that gets through as the 'suppressed' field.
+    """
+    __slots__ = ("_logger", "_level", "_interval", "_sample", "_keys", "enabled", "__weakref__")
+
+    def __init__(self, logger: Union[logging.Logger, str], level: int = logging.INFO,
+                 interval: float = TelemetryConstants.HotLog.Interval,
+                 sample: int = TelemetryConstants.HotLog.Sample):
+        """
+        :param logger:   Logger (or logger name) to emit the records through
+        :param level:    Level of the emitted records
+        :param interval: Minimum seconds between messages with the same key, 0 for no limit
+        :param sample:   Only consider every Nth call for each key
+        """
+        if sample < 1:
+            raise ValueError(f"sample must be at least 1, got {sample}")
+
+        self._logger = logger if isinstance(logger, logging.Logger) else logging.getLogger(logger)
+        self._level = level
+        self._interval = interval
+        self._sample = sample
+        self._keys: Dict[str, list] = {}        # key -> [calls, suppressed, next allowed time]
+
+        self.enabled = False
+        self.refresh()
+        _hot_loggers.add(self)
+
+    @property
+    def logger(self) -> logging.Logger:
+        return self._logger
+
+    def refresh(self) -> None:
+        """
+        Re-evaluate 'enabled'. Called for every HotLogger by set_enabled() and
+        refresh_all(); call refresh_all() after changing logging levels at runtime.
+        """
+        self.enabled = _enabled and self._logger.isEnabledFor(self._level)
+
+    def log(self, key: str, **fields: Any) -> bool:
+        """
+        Log a message with structured fields, subject to sampling and rate limiting
+
+        :param key:    Message key, the rate limit and sampling are per key
+        :param fields: Values to log
+
+        :return: True if a record was emitted
+        """
+        if not self.enabled:
+            return False
+
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = [0, 0, 0.0]
+
+        state[0] += 1
+        if state[0] % self._sample:
+            state[1] += 1
+            return False
+
+        if self._interval > 0:
+            now = time.monotonic()
+            if now < state[2]:
+                state[1] += 1
+                return False
+            state[2] = now + self._interval
+
+        if state[1]:
+            fields["suppressed"] = state[1]
+            state[1] = 0
+
+        self._logger.log(self._level, "%s: %s", key, LazyFields(fields),
+                         extra={"key": key, "fields": fields}, stacklevel=2)
+        return True
+
+    def suppressed(self, key: str) -> int:
+        """
+        Calls for a key that have been suppressed since its last emitted message
+        """
+        state = self._keys.get(key)
+        return state[1] if state is not None else 0
+
+
+def set_enabled(enabled: bool) -> None:
+    """
+    Master switch for every HotLogger
+    """
+    global _enabled
+    _enabled = enabled
+    refresh_all()
+
+
+def refresh_all() -> None:
+    """
+    Re-evaluate 'enabled' for every HotLogger, for example after logging levels changed
+    """
+    for hot_logger in list(_hot_loggers):
+        hot_logger.refresh()
+
+
+def _benchmark(number: int = 1_000_000) -> Dict[str, float]:
+    """
+    Nanoseconds per call of the usual call-site patterns with logging disabled
+    """
+    logger = logging.getLogger("hot_log.benchmark")
+    logger.setLevel(logging.WARNING)
+    hot = HotLogger(logger, interval=0.0)
+    speed, rotation = 0.5, -0.25
+
+    def empty():
+        pass
+
+    def fstring():
+        logger.info(f"arcadeDrive: entry, speed: {speed}, rotation: {rotation}")
+
+    def guarded():
+        if hot.enabled:
+            hot.log("arcadeDrive", speed=speed, rotation=rotation)
+
+    def unguarded():
+        hot.log("arcadeDrive", speed=speed, rotation=rotation)
+
+    baseline = timeit.timeit(empty, number=number)
+    return {name: max(timeit.timeit(func, number=number) - baseline, 0.0) / number * 1e9
+            for name, func in (("f-string logger.info", fstring),
+                               ("HotLogger, guarded", guarded),
+                               ("HotLogger, unguarded", unguarded))}
+
+
+def main(argv: Optional[list] = None) -> int:
+    for name, cost in _benchmark().items():
+        print(f"{name:>22}: {cost:7.1f} ns/call (disabled)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Robot loop timing: how long each phase of the 20 ms loop takes.
+#
+# Phases (mode periodic, the command scheduler, each subsystem's periodic and
+# update_sim in simulation) are timed by wrapping the callable the framework
+# calls, so the robot code itself does not change. Each phase keeps a fixed
+# size log-bucket histogram, so memory does not grow however long the robot runs.
+#
+# Phases can nest (subsystem periodic runs inside the scheduler). The histograms
+# hold the full (inclusive) time of a phase. Overruns are blamed on the phase
+# with the most exclusive time, that is its own time minus its nested phases.
+#
+#   timer = get_loop_timer()
+#   subsystem.periodic = timer.wrap(f"{subsystem.getName()}.periodic", subsystem.periodic)
+#   ...
+#   timer.mark_loop()           # once per loop
+#   print(timer.report())
+#
+import collections
+import logging
+import math
+import time
+
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+
+from lib_6107.telemetry.constants import TelemetryConstants
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    Constant memory latency histogram with logarithmic buckets
+    """
+    __slots__ = ("_counts", "_log_min", "_scale", "_minimum", "count", "total", "max")
+
+    def __init__(self, minimum: float = TelemetryConstants.LoopTiming.HistogramMin,
+                 maximum: float = TelemetryConstants.LoopTiming.HistogramMax,
+                 buckets_per_decade: int = TelemetryConstants.LoopTiming.BucketsPerDecade):
+        """
+        :param minimum:            Upper edge (seconds) of the first bucket
+        :param maximum:            Lower edge (seconds) of the last, open ended, bucket
+        :param buckets_per_decade: Buckets per factor of ten
+        """
+        if not 0 < minimum < maximum:
+            raise ValueError(f"Expected 0 < minimum < maximum, got {minimum} / {maximum}")
+
+        self._minimum = minimum
+        self._log_min = math.log10(minimum)
+        self._scale = buckets_per_decade
+        self._counts = [0] * (int(math.ceil(math.log10(maximum / minimum) * buckets_per_decade)) + 2)
+
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        if seconds <= self._minimum:
+            index = 0
+        else:
+            index = min(int((math.log10(seconds) - self._log_min) * self._scale) + 1, len(self._counts) - 1)
+
+        self._counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Latency (seconds) below which the given percentage of samples fall, to the
+        resolution of a bucket (its upper edge, capped at the maximum seen)
+        """
+        if not self.count:
+            return 0.0
+
+        target = percent / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target and count:
+                return min(10 ** (self._log_min + index / self._scale), self.max)
+
+        return self.max
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class Overrun(NamedTuple):
+    loop: int               # Loop number
+    busy: float             # Seconds spent in the timed phases during the loop
+    phase: str              # Phase with the most exclusive time
+    phase_time: float       # Its exclusive time (seconds)
+
+
+class LoopTimer:
+    """
+    Times the robot loop phases and detects loops that ran over budget
+    """
+    def __init__(self, period: float = TelemetryConstants.LoopTiming.Period,
+                 history: int = TelemetryConstants.LoopTiming.OverrunHistory,
+                 enabled: bool = TelemetryConstants.LoopTiming.Enabled):
+        """
+        :param period:  Loop budget in seconds
+        :param history: Number of recent overruns to keep
+        :param enabled: If not set, wrap() returns the callables unchanged
+        """
+        self._period = period
+        self._enabled = enabled
+
+        self._phases: Dict[str, LatencyHistogram] = {}
+        self._loop_busy = LatencyHistogram()        # Busy time of each loop
+        self._loop_interval = LatencyHistogram()    # Time between loop starts, shows scheduling jitter
+
+        self._stack: List[int] = []                 # Nested phase time (ns) of the phases in progress
+        self._loop_exclusive: Dict[str, int] = {}   # Exclusive time (ns) of each phase this loop
+        self._last_mark: Optional[int] = None
+
+        self.loops = 0
+        self.overruns = 0
+        self.overruns_by_phase: Dict[str, int] = collections.Counter()
+        self.recent_overruns: Deque[Overrun] = collections.deque(maxlen=history)
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def period(self) -> float:
+        return self._period
+
+    @property
+    def phases(self) -> Dict[str, LatencyHistogram]:
+        return self._phases
+
+    @property
+    def loop_busy(self) -> LatencyHistogram:
+        return self._loop_busy
+
+    @property
+    def loop_interval(self) -> LatencyHistogram:
+        return self._loop_interval
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """
+        Return func wrapped so that every call is timed as the named phase
+        """
+        if not self._enabled:
+            return func
+
+        histogram = self._phases.setdefault(name, LatencyHistogram())
+        stack, exclusive = self._stack, self._loop_exclusive
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            stack.append(0)
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+
+            finally:
+                elapsed = clock() - start
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+
+                histogram.record(elapsed * 1e-9)
+                exclusive[name] = exclusive.get(name, 0) + elapsed - nested
+
+        timed.__wrapped__ = func
+        return timed
+
+    def record_external(self, name: str, elapsed_ns: int) -> None:
+        """
+        Record time spent outside any wrapped callable, such as a GC pause, as a
+        phase. If it happened inside a timed phase, that phase's exclusive time
+        does not include it.
+        """
+        if not self._enabled:
+            return
+
+        histogram = self._phases.get(name)
+        if histogram is None:
+            histogram = self._phases[name] = LatencyHistogram()
+
+        histogram.record(elapsed_ns * 1e-9)
+        self._loop_exclusive[name] = self._loop_exclusive.get(name, 0) + elapsed_ns
+        if self._stack:
+            self._stack[-1] += elapsed_ns
+
+    def mark_loop(self) -> Optional[Overrun]:
+        """
+        Close the current loop: call once per loop at the same point
+
+        :return: The overrun, if the loop that just ended was over budget
+        """
+        if not self._enabled:
+            return None
+
+        now = time.perf_counter_ns()
+        if self._last_mark is not None:
+            self._loop_interval.record((now - self._last_mark) * 1e-9)
+        self._last_mark = now
+
+        exclusive = self._loop_exclusive
+        if not exclusive:
+            return None
+
+        self.loops += 1
+        busy = sum(exclusive.values()) * 1e-9
+        self._loop_busy.record(busy)
+
+        overrun = None
+        if busy > self._period:
+            phase = max(exclusive, key=exclusive.get)
+            overrun = Overrun(self.loops, busy, phase, exclusive[phase] * 1e-9)
+            self.overruns += 1
+            self.overruns_by_phase[phase] += 1
+            self.recent_overruns.append(overrun)
+
+        exclusive.clear()
+        return overrun
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Latency statistics (seconds) for each phase and for the whole loop
+        """
+        histograms = dict(self._phases)
+        histograms["loop (busy)"] = self._loop_busy
+        histograms["loop (interval)"] = self._loop_interval
+
+        return {name: {"count": h.count, "mean": h.mean, "p50": h.percentile(50), "p95": h.percentile(95),
+                       "p99": h.percentile(99), "max": h.max}
+                for name, h in histograms.items()}
+
+    def report(self) -> str:
+        lines = [f"Loop timing over {self.loops} loops, {self.overruns} over {self._period * 1e3:.0f} ms:",
+                 f"  {'phase':>32} {'count':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}  (ms)"]
+        for name, stats in self.summary().items():
+            lines.append(f"  {name:>32} {stats['count']:8d} {stats['p50'] * 1e3:9.3f} {stats['p95'] * 1e3:9.3f} "
+                         f"{stats['p99'] * 1e3:9.3f} {stats['max'] * 1e3:9.3f}")
+
+        if self.overruns:
+            blame = ", ".join(f"{name}: {count}" for name, count in self.overruns_by_phase.most_common())
+            lines.append(f"  Overruns by phase: {blame}")
+            for overrun in list(self.recent_overruns)[-5:]:
+                lines.append(f"    loop {overrun.loop}: {overrun.busy * 1e3:.2f} ms, "
+                             f"{overrun.phase} {overrun.phase_time * 1e3:.2f} ms")
+
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        for histogram in self._phases.values():
+            histogram.reset()
+        self._loop_busy.reset()
+        self._loop_interval.reset()
+        self._loop_exclusive.clear()
+        self._last_mark = None
+        self.loops = self.overruns = 0
+        self.overruns_by_phase.clear()
+        self.recent_overruns.clear()
+
+
+_loop_timer: Optional[LoopTimer] = None
+
+
+def get_loop_timer() -> LoopTimer:
+    """
+    The shared LoopTimer for the robot
+    """
+    global _loop_timer
+    if _loop_timer is None:
+        _loop_timer = LoopTimer()
+    return _loop_timer
@@ -0,0 +1,244 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Garbage collector control and allocation tracking for the robot loop.
+#
+# Python's cyclic GC runs whenever enough container objects have been allocated,
+# which can be in the middle of the 20 ms loop. The MemoryManager:
+#
+#   - freezes everything robotInit created (gc.freeze()), so collections only
+#     scan objects allocated since,
+#   - optionally turns automatic collection off during autonomous/teleop and
+#     collects in disabledPeriodic instead,
+#   - times every collection through gc.callbacks and reports the pauses to the
+#     LoopTimer as a 'gc' phase, so overruns caused by GC are blamed on it,
+#   - optionally samples allocations with tracemalloc to show which code lines
+#     allocate the most per loop.
+#
+import atexit
+import collections
+import gc
+import logging
+import time
+import tracemalloc
+
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from lib_6107.telemetry.constants import TelemetryConstants
+from lib_6107.telemetry.loop_timing import LatencyHistogram, LoopTimer, get_loop_timer
+
+logger = logging.getLogger(__name__)
+
+
+class GcPause(NamedTuple):
+    loop: int               # LoopTimer loop number the pause happened in
+    generation: int
+    duration: float         # Seconds
+    collected: int          # Objects freed
+
+
+class MemoryManager:
+    """
+    GC policy, GC pause timing and allocation sampling for MyRobot
+    """
+    def __init__(self, loop_timer: Optional[LoopTimer] = None,
+                 manual_gc_in_match: bool = TelemetryConstants.Memory.ManualGcInMatch,
+                 track_allocations: bool = TelemetryConstants.Memory.TrackAllocations,
+                 sample_loops: int = TelemetryConstants.Memory.AllocationSampleLoops,
+                 frames: int = TelemetryConstants.Memory.AllocationFrames):
+        """
+        :param loop_timer:         LoopTimer to report GC pauses to, defaults to the shared one
+        :param manual_gc_in_match: Disable automatic GC in autonomous/teleop
+        :param track_allocations:  Sample allocations with tracemalloc
+        :param sample_loops:       Loops between allocation snapshots
+        :param frames:             Stack frames to keep per allocation
+        """
+        self._loop_timer = loop_timer or get_loop_timer()
+        self._manual_gc_in_match = manual_gc_in_match
+        self._manual = False
+        self._gc_start = 0
+
+        self.pauses = [LatencyHistogram() for _ in range(3)]       # One per generation
+        self.recent_pauses: Deque[GcPause] = collections.deque(maxlen=TelemetryConstants.Memory.PauseHistory)
+        self.explicit_collections = 0
+
+        self._track_allocations = track_allocations
+        self._sample_loops = max(sample_loops, 1)
+        self._frames = frames
+        self._loops_since_snapshot = 0
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._sampled_loops = 0
+        self._allocated: Dict[str, int] = collections.Counter()     # Code line -> bytes allocated
+
+        gc.callbacks.append(self._on_gc)
+
+    @property
+    def manual(self) -> bool:
+        """
+        True while automatic collection is off
+        """
+        return self._manual
+
+    def close(self) -> None:
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+        if self._track_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+        self.set_manual(False)
+
+    def freeze(self) -> None:
+        """
+        Collect once, then move every surviving object to the permanent generation.
+        Call when robotInit has built the long lived objects.
+        """
+        start = time.perf_counter()
+        gc.collect()
+        gc.freeze()
+        logger.info(f"gc: froze {gc.get_freeze_count()} objects in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+        if self._track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+            self._snapshot = tracemalloc.take_snapshot()
+
+    def set_manual(self, manual: bool) -> None:
+        """
+        Turn automatic collection off (manual) or back on
+        """
+        self._manual = manual
+        if manual:
+            gc.disable()
+        else:
+            gc.enable()
+
+    def match_started(self) -> None:
+        """
+        Autonomous or teleop started
+        """
+        if self._manual_gc_in_match:
+            self.set_manual(True)
+
+    def test_started(self) -> None:
+        self.set_manual(False)
+
+    def collect_if_due(self) -> Optional[int]:
+        """
+        Run the collection automatic GC would have run, at a time the robot is not
+        driving. Call from disabledPeriodic().
+
+        :return: The generation collected, or None
+        """
+        if not self._manual:
+            return None
+
+        counts, thresholds = gc.get_count(), gc.get_threshold()
+        if counts[0] < thresholds[0]:
+            return None
+
+        generation = 2 if counts[2] >= thresholds[2] else 1 if counts[1] >= thresholds[1] else 0
+        gc.collect(generation)
+        self.explicit_collections += 1
+        return generation
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._gc_start = time.perf_counter_ns()
+            return
+
+        elapsed = time.perf_counter_ns() - self._gc_start
+        generation = info.get("generation", 2)
+        self.pauses[generation].record(elapsed * 1e-9)
+        self.recent_pauses.append(GcPause(self._loop_timer.loops + 1, generation, elapsed * 1e-9,
+                                          info.get("collected", 0)))
+        self._loop_timer.record_external("gc", elapsed)
+
+    def loop(self) -> None:
+        """
+        Allocation sampling, call once per robot loop
+        """
+        if self._snapshot is None:
+            return
+
+        self._loops_since_snapshot += 1
+        if self._loops_since_snapshot < self._sample_loops:
+            return
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        for stat in snapshot.compare_to(self._snapshot, "lineno"):
+            if stat.size_diff > 0:
+                frame = stat.traceback[0]
+                self._allocated[f"{frame.filename}:{frame.lineno}"] += stat.size_diff
+
+        self._sampled_loops += self._loops_since_snapshot
+        self._loops_since_snapshot = 0
+        self._snapshot = snapshot
+
+        # Keep the table bounded over a long session
+        if len(self._allocated) > 10 * TelemetryConstants.Memory.AllocationTop:
+            self._allocated = collections.Counter(dict(self._allocated.most_common(
+                5 * TelemetryConstants.Memory.AllocationTop)))
+
+    def top_allocations(self, count: int = TelemetryConstants.Memory.AllocationTop) -> List[Tuple[str, float]]:
+        """
+        Code lines with the most net allocation growth, in bytes per loop
+        """
+        if not self._sampled_loops:
+            return []
+
+        return [(site, size / self._sampled_loops) for site, size in self._allocated.most_common(count)]
+
+    def report(self) -> str:
+        lines = [f"GC: {'manual' if self._manual else 'automatic'}, {gc.get_freeze_count()} frozen objects, "
+                 f"{self.explicit_collections} explicit collections"]
+        for generation, histogram in enumerate(self.pauses):
+            if histogram.count:
+                lines.append(f"  generation {generation}: {histogram.count} pauses, "
+                             f"p50 {histogram.percentile(50) * 1e3:.3f} ms, p99 {histogram.percentile(99) * 1e3:.3f} ms, "
+                             f"max {histogram.max * 1e3:.3f} ms")
+
+        overrun_loops = {overrun.loop for overrun in self._loop_timer.recent_overruns}
+        during_overruns = [pause for pause in self.recent_pauses if pause.loop in overrun_loops]
+        if during_overruns:
+            lines.append(f"  {len(during_overruns)} of the recent GC pauses were in loops that overran")
+
+        top = self.top_allocations()
+        if top:
+            lines.append(f"  Allocations per loop over {self._sampled_loops} loops:")
+            for site, size in top:
+                lines.append(f"    {size:10.1f} B  {site}")
+
+        return "\n".join(lines)
+
+
+_memory_manager: Optional[MemoryManager] = None
+
+
+def get_memory_manager() -> MemoryManager:
+    """
+    The shared MemoryManager. It hooks the process wide gc.callbacks, so there is
+    one per process and it is closed when the process exits.
+    """
+    global _memory_manager
+    if _memory_manager is None:
+        _memory_manager = MemoryManager()
+        atexit.register(_memory_manager.close)
+    return _memory_manager
@@ -0,0 +1,233 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Change-only, rate limited dashboard publishing.
+#
+# SmartDashboard.putNumber() and friends look the entry up by name and send a
+# NetworkTables update on every call, even when nothing changed. Over the XRP's
+# Wi-Fi link that traffic competes with the driver station control packets.
+#
+# The DashboardPublisher keeps a typed NetworkTables publisher per key and:
+#
+#   - drops values equal to the last one published,
+#   - publishes each key at most once per interval. A value that arrives too
+#     soon is held, replacing any value already held, and is sent by flush()
+#     once the interval has passed,
+#   - keeps an estimate of the bytes per second it sends.
+#
+# flush() runs once per robot loop from MyRobot.robotPeriodic():
+#
+#   dashboard = get_dashboard()
+#   dashboard.publish_number("drive/left_output", left)
+#
+import logging
+
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import ntcore
+from wpilib import Timer
+from wpimath.geometry import Pose2d
+
+from lib_6107.telemetry.constants import TelemetryConstants
+
+logger = logging.getLogger(__name__)
+
+# Approximate NT4 framing per value update (msgpack array, topic id, timestamp, type)
+MESSAGE_OVERHEAD = 12
+
+_NOTHING = object()         # No value published / held yet
+
+
+class _Entry:
+    __slots__ = ("publisher", "interval", "value", "pending", "next_time")
+
+    def __init__(self, publisher: Any, interval: float):
+        self.publisher = publisher
+        self.interval = interval
+        self.value = _NOTHING           # Last value published
+        self.pending = _NOTHING         # Value held back by the rate limit
+        self.next_time = 0.0            # Earliest time the next value can be published
+
+
+class DashboardPublisher:
+    """
+    Publishes dashboard values through cached, typed NetworkTables publishers,
+    suppressing unchanged values and coalescing fast updates of the same key.
+    """
+    def __init__(self, table: str = TelemetryConstants.Dashboard.Table,
+                 interval: float = TelemetryConstants.Dashboard.Interval,
+                 rate_window: float = TelemetryConstants.Dashboard.RateWindow,
+                 instance: Optional[ntcore.NetworkTableInstance] = None,
+                 clock: Callable[[], float] = Timer.getFPGATimestamp):
+        """
+        :param table:       NetworkTables table to publish into
+        :param interval:    Default minimum seconds between updates of a key
+        :param rate_window: Seconds over which bytes_per_second is measured
+        :param instance:    NetworkTables instance, defaults to the default instance
+        :param clock:       Time source in seconds
+        """
+        self._table = (instance or ntcore.NetworkTableInstance.getDefault()).getTable(table)
+        self._interval = interval
+        self._rate_window = rate_window
+        self._clock = clock
+
+        self._entries: Dict[str, _Entry] = {}
+        self._pending: Dict[str, _Entry] = {}
+        self._types: Dict[str, Any] = {}        # Pose key -> its '.type' publisher, kept so the topic stays
+
+        self.published = 0              # Updates sent
+        self.unchanged = 0              # Updates dropped because the value had not changed
+        self.coalesced = 0              # Held updates replaced by a newer value before being sent
+        self.bytes_sent = 0             # Estimated bytes sent in total
+
+        self._window_start = clock()
+        self._window_bytes = 0
+        self._bytes_per_second = 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """
+        Estimated publishing rate over the last complete rate window
+        """
+        return self._bytes_per_second
+
+    def publish_number(self, key: str, value: float, interval: Optional[float] = None) -> bool:
+        return self._publish(key, float(value), self._table.getDoubleTopic, 8, interval)
+
+    def publish_boolean(self, key: str, value: bool, interval: Optional[float] = None) -> bool:
+        return self._publish(key, bool(value), self._table.getBooleanTopic, 1, interval)
+
+    def publish_string(self, key: str, value: str, interval: Optional[float] = None) -> bool:
+        return self._publish(key, value, self._table.getStringTopic, len(value), interval)
+
+    def publish_number_array(self, key: str, values: Sequence[float], interval: Optional[float] = None) -> bool:
+        return self._publish(key, tuple(values), self._table.getDoubleArrayTopic, 8 * len(values), interval)
+
+    def publish_pose(self, key: str, pose: Pose2d, interval: Optional[float] = None) -> bool:
+        """
+        Publish a robot pose in the Field2d layout, so dashboards draw it on a field
+        without a Field2d Sendable re-sending it every loop
+        """
+        if key not in self._types:
+            publisher = self._types[key] = self._table.getSubTable(key).getStringTopic(".type").publish()
+            publisher.set("Field2d")
+
+            self.published += 1
+            self.bytes_sent += MESSAGE_OVERHEAD + len("Field2d")
+            self._window_bytes += MESSAGE_OVERHEAD + len("Field2d")
+
+        return self.publish_number_array(f"{key}/Robot", (pose.X(), pose.Y(), pose.rotation().degrees()),
+                                         interval)
+
+    def _publish(self, key: str, value: Any, get_topic: Callable, size: int,
+                 interval: Optional[float]) -> bool:
+        """
+        :return: True if the value was sent now
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(get_topic(key).publish(),
+                                                self._interval if interval is None else interval)
+
+        if value == entry.value:
+            # Back to the published value, anything held is no longer needed
+            self.unchanged += 1
+            if entry.pending is not _NOTHING:
+                entry.pending = _NOTHING
+                del self._pending[key]
+            return False
+
+        now = self._clock()
+        if now < entry.next_time:
+            if entry.pending is not _NOTHING:
+                self.coalesced += 1
+            entry.pending = value
+            self._pending[key] = entry
+            return False
+
+        if entry.pending is not _NOTHING:
+            entry.pending = _NOTHING
+            del self._pending[key]
+
+        self._send(entry, value, size, now)
+        return True
+
+    def _send(self, entry: _Entry, value: Any, size: int, now: float) -> None:
+        entry.publisher.set(list(value) if isinstance(value, tuple) else value)
+        entry.value = value
+        entry.next_time = now + entry.interval
+
+        self.published += 1
+        self.bytes_sent += MESSAGE_OVERHEAD + size
+        self._window_bytes += MESSAGE_OVERHEAD + size
+
+    def flush(self) -> int:
+        """
+        Send held values whose interval has passed and update the bytes/second
+        estimate. Call once per robot loop.
+
+        :return: Number of values sent
+        """
+        now = self._clock()
+        sent = 0
+
+        if self._pending:
+            for key, entry in list(self._pending.items()):
+                if now >= entry.next_time:
+                    value = entry.pending
+                    entry.pending = _NOTHING
+                    del self._pending[key]
+                    self._send(entry, value, _size(value), now)
+                    sent += 1
+
+        elapsed = now - self._window_start
+        if elapsed >= self._rate_window:
+            self._bytes_per_second = self._window_bytes / elapsed
+            self._window_bytes = 0
+            self._window_start = now
+
+        return sent
+
+    def report(self) -> str:
+        return (f"{len(self._entries)} keys, {self.published} sent, {self.unchanged} unchanged, "
+                f"{self.coalesced} coalesced, {self._bytes_per_second:.0f} bytes/s")
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, bool):
+        return 1
+
+    if isinstance(value, float):
+        return 8
+
+    if isinstance(value, tuple):
+        return 8 * len(value)
+
+    return len(value)
+
+
+_dashboard: Optional[DashboardPublisher] = None
+
+
+def get_dashboard() -> DashboardPublisher:
+    """
+    The shared DashboardPublisher for the robot
+    """
+    global _dashboard
+    if _dashboard is None:
+        _dashboard = DashboardPublisher()
+    return _dashboard
@@ -0,0 +1,366 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Telemetry recorder: typed channels backed by preallocated ring buffers, written
+# to a compressed binary file by a background thread.
+#
+# Subsystems register their channels once and then write a value per periodic().
+# A write only stores into a NumPy array, so the robot loop never waits on the
+# disk or on the flush thread. Memory use is fixed by the channel capacities. If
+# the flush thread falls behind, the oldest unflushed samples are dropped and
+# counted rather than growing the buffers.
+#
+#   recorder = TelemetryRecorder("telemetry/run.xtlm")
+#   recorder.start()
+#   output = recorder.register("drive/output", width=2)
+#   ...
+#   output.write((left, right))             # in periodic()
+#
+# File layout (little endian):
+#
+#   Header:  magic 'XRPTLM1\0'
+#   Chunks:  compressed length (u32), zlib(payload), where the payload is one or
+#            more [channel id (u16), count (u32), times (f8 x count), values].
+#            Channels are defined by a block with id 0xFFFF whose count is the
+#            length of a JSON channel list that follows, before their first samples.
+#
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from wpilib import Timer
+
+from lib_6107.telemetry.constants import TelemetryConstants
+
+logger = logging.getLogger(__name__)
+
+TELEMETRY_MAGIC = b"XRPTLM1\0"
+
+_LENGTH = struct.Struct("<I")
+_BLOCK = struct.Struct("<HI")
+_DEFINITION = 0xFFFF
+
+
+class TelemetryChannel:
+    """
+    One typed telemetry value (or fixed width group of values) with its own ring buffer
+    """
+    __slots__ = ("name", "id", "dtype", "width", "_times", "_values", "_capacity", "_clock",
+                 "head", "flushed", "dropped")
+
+    def __init__(self, name: str, channel_id: int, dtype: np.dtype, width: int, capacity: int,
+                 clock: Callable[[], float]):
+        self.name = name
+        self.id = channel_id
+        self.dtype = dtype
+        self.width = width
+        self._capacity = capacity
+        self._clock = clock
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros((capacity, width) if width > 1 else capacity, dtype=dtype)
+
+        self.head = 0           # Samples written since the start, only the robot loop changes it
+        self.flushed = 0        # Samples handed to the file, only the flush thread changes it
+        self.dropped = 0        # Samples overwritten before they could be flushed
+
+    def write(self, value: Union[float, int, Sequence[float]], timestamp: Optional[float] = None) -> None:
+        """
+        Store a sample. Never blocks.
+
+        :param value:     The value, or a sequence of 'width' values
+        :param timestamp: Sample time in seconds, defaults to the FPGA timestamp
+        """
+        index = self.head % self._capacity
+        self._times[index] = self._clock() if timestamp is None else timestamp
+        self._values[index] = value
+        self.head += 1
+
+    def describe(self) -> dict:
+        return {"id": self.id, "name": self.name, "dtype": self.dtype.str, "width": self.width}
+
+    def collect(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Copy out the samples written since the last collect(). Called by the flush thread.
+
+        :return: (times, values), or None if there is nothing new
+        """
+        head = self.head
+        start = max(self.flushed, head - self._capacity)
+        if start >= head:
+            return None
+
+        indices = np.arange(start, head) % self._capacity
+        times = self._times[indices]
+        values = self._values[indices]
+
+        # The robot loop may have lapped the samples at the front while they were copied. The
+        # slot of sample head - capacity may be half written by the next sample, so it is dropped
+        # too. Samples from head on are left for the next collect()
+        valid_from = min(max(start, self.head - self._capacity + 1), head)
+        if valid_from > start:
+            times, values = times[valid_from - start:], values[valid_from - start:]
+
+        self.dropped += valid_from - self.flushed
+        self.flushed = head
+        return times, values
+
+
+class TelemetryRecorder:
+    """
+    Owns the telemetry channels, the output file and the background flush thread
+    """
+    def __init__(self, path: str, capacity: int = TelemetryConstants.Recorder.Capacity,
+                 flush_interval: float = TelemetryConstants.Recorder.FlushInterval,
+                 compression_level: int = TelemetryConstants.Recorder.CompressionLevel,
+                 clock: Callable[[], float] = Timer.getFPGATimestamp):
+        """
+        :param path:              Telemetry file to create
+        :param capacity:          Samples held per channel between flushes
+        :param flush_interval:    Seconds between background flushes
+        :param compression_level: zlib compression level for each flushed chunk
+        :param clock:             Default sample timestamp source (seconds)
+        """
+        if capacity <= 0 or flush_interval <= 0:
+            raise ValueError(f"capacity and flush_interval must be positive, got {capacity} / {flush_interval}")
+
+        self._path = path
+        self._capacity = capacity
+        self._flush_interval = flush_interval
+        self._compression_level = compression_level
+        self._clock = clock
+        self._channels: Dict[str, TelemetryChannel] = {}
+        self._channel_list: Tuple[TelemetryChannel, ...] = ()     # Replaced, never mutated, so the
+        self._defined = 0                                         # flush thread can iterate it safely
+        self._file = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._bytes_written = 0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def channels(self) -> Dict[str, TelemetryChannel]:
+        return self._channels
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def bytes_written(self) -> int:
+        return self._bytes_written
+
+    @property
+    def dropped(self) -> int:
+        """
+        Samples lost, over all channels, because the flush thread fell behind
+        """
+        return sum(channel.dropped for channel in self._channels.values())
+
+    def register(self, name: str, dtype: Union[str, np.dtype] = np.float64, width: int = 1) -> TelemetryChannel:
+        """
+        Add a channel. Channels can be registered before or after start().
+
+        :param name:  Channel name, such as 'drive/output'
+        :param dtype: NumPy type of the values
+        :param width: Number of values per sample
+        """
+        if name in self._channels:
+            raise ValueError(f"Telemetry channel '{name}' is already registered")
+
+        if width < 1:
+            raise ValueError(f"Telemetry channel width must be at least 1, got {width}")
+
+        if len(self._channels) >= _DEFINITION:
+            raise ValueError(f"Too many telemetry channels, the limit is {_DEFINITION}")
+
+        channel = TelemetryChannel(name, len(self._channels), np.dtype(dtype).newbyteorder("<"), width,
+                                   self._capacity, self._clock)
+        self._channels[name] = channel
+        self._channel_list = self._channel_list + (channel,)
+        return channel
+
+    def start(self) -> None:
+        """
+        Write the file header and start the flush thread
+        """
+        if self._file is not None:
+            return
+
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._file = open(self._path, "wb")
+        self._file.write(TELEMETRY_MAGIC)
+        self._bytes_written = len(TELEMETRY_MAGIC)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry-flush", daemon=True)
+        self._thread.start()
+        logger.info(f"Recording telemetry to {self._path}")
+
+    def close(self) -> None:
+        """
+        Stop the flush thread, flush what is left and close the file
+        """
+        if self._file is None:
+            return
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+        self._file.close()
+        self._file = None
+
+        dropped = self.dropped
+        if dropped:
+            logger.warning(f"Telemetry dropped {dropped} samples, increase the capacity or flush more often")
+
+    def flush(self) -> int:
+        """
+        Compress and write every channel's new samples as one chunk
+
+        :return: Bytes written
+        """
+        with self._flush_lock:
+            if self._file is None:
+                return 0
+
+            channels = self._channel_list
+            blocks: List[bytes] = []
+
+            if len(channels) > self._defined:
+                table = json.dumps([channel.describe() for channel in channels[self._defined:]]).encode()
+                blocks.append(_BLOCK.pack(_DEFINITION, len(table)))
+                blocks.append(table)
+                self._defined = len(channels)
+
+            for channel in channels:
+                collected = channel.collect()
+                if collected is not None:
+                    times, values = collected
+                    blocks.append(_BLOCK.pack(channel.id, len(times)))
+                    blocks.append(times.tobytes())
+                    blocks.append(values.tobytes())
+
+            if not blocks:
+                return 0
+
+            chunk = zlib.compress(b"".join(blocks), self._compression_level)
+            self._file.write(_LENGTH.pack(len(chunk)))
+            self._file.write(chunk)
+            self._file.flush()
+
+            written = _LENGTH.size + len(chunk)
+            self._bytes_written += written
+            return written
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._flush_interval):
+            try:
+                self.flush()
+
+            except Exception as e:
+                logger.error(f"Telemetry flush to {self._path} failed, recording stopped: {e}")
+                return
+
+
+def open_telemetry(name: str) -> Optional[TelemetryRecorder]:
+    """
+    Create a recorder in the telemetry directory if recording is enabled
+
+    :param name: File name (without directory) for the telemetry file
+    """
+    if not TelemetryConstants.Recorder.Enabled:
+        return None
+
+    directory = os.environ.get("XRP_TELEMETRY_DIR", TelemetryConstants.Recorder.Directory)
+    return TelemetryRecorder(os.path.join(directory, name))
+
+
+def read_telemetry(path: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Load a telemetry file
+
+    :return: Channel name -> (times, values) arrays
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if not data.startswith(TELEMETRY_MAGIC):
+        raise ValueError(f"{path}: not a telemetry file")
+
+    offset = len(TELEMETRY_MAGIC)
+    channels: Dict[int, dict] = {}
+    pieces: Dict[int, Tuple[List[np.ndarray], List[np.ndarray]]] = {}
+
+    while offset + _LENGTH.size <= len(data):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        if offset + length > len(data):
+            logger.warning(f"{path}: truncated final chunk ignored")
+            break
+
+        payload = zlib.decompress(data[offset:offset + length])
+        offset += length
+
+        position = 0
+        while position < len(payload):
+            cid, count = _BLOCK.unpack_from(payload, position)
+            position += _BLOCK.size
+
+            if cid == _DEFINITION:
+                for entry in json.loads(payload[position:position + count]):
+                    entry["dtype"] = np.dtype(entry["dtype"])
+                    channels[entry["id"]] = entry
+                    pieces[entry["id"]] = ([], [])
+                position += count
+                continue
+
+            entry = channels[cid]
+
+            times = np.frombuffer(payload, dtype="<f8", count=count, offset=position)
+            position += times.nbytes
+
+            values = np.frombuffer(payload, dtype=entry["dtype"], count=count * entry["width"], offset=position)
+            position += values.nbytes
+            if entry["width"] > 1:
+                values = values.reshape(count, entry["width"])
+
+            pieces[cid][0].append(times)
+            pieces[cid][1].append(values)
+
+    result = {}
+    for cid, entry in channels.items():
+        times, values = pieces[cid]
+        shape = (0, entry["width"]) if entry["width"] > 1 else (0,)
+        result[entry["name"]] = (np.concatenate(times) if times else np.empty(0),
+                                 np.concatenate(values) if values else np.empty(shape, dtype=entry["dtype"]))
+    return result
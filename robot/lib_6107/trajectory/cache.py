@@ -0,0 +1,416 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Content addressed, on-disk cache of generated trajectories.
+#
+# Each entry is keyed by a SHA-256 over the source file (a path or auto file),
+# the TrajectoryConstraints, the generator resolution and every XrpConstants
+# value, so editing any of them simply produces a new key. Entries are written
+# once and then memory mapped, so a cached trajectory is usable as soon as the
+# file is opened; the pages are read the first time the follower touches them.
+#
+# File layout (little endian):
+#
+#   Header (128 bytes): magic 'XRPTRAJ1', version (u32), column count (u32),
+#                       sample count (u64), duration (f64), length (f64),
+#                       key (32 bytes), source SHA-256 (32 bytes), padding
+#   Columns:            Trajectory.__slots__ order, each sample count float64
+#
+# Entries are named '<source name>.<key prefix>.xtrj'. A source can have several
+# entries, one per set of constraints or constants it was generated with. Storing
+# an entry removes the entries of the same source name that were generated from
+# different file contents, since the file has been edited since. Everything else
+# is left to the least recently used eviction once the directory grows past MaxBytes.
+#
+import hashlib
+import json
+import logging
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lib_6107.constants import XrpConstants
+from lib_6107.trajectory.constants import TrajectoryConstants
+from lib_6107.trajectory.generator import Trajectory, TrajectoryConstraints, generate
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAGIC = b"XRPTRAJ1"
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".xtrj"
+
+_HEADER = struct.Struct("<8sIIQdd32s32s24x")
+_COLUMNS = Trajectory.__slots__
+
+# Generator settings that change the samples without being part of the constraints
+_RESOLUTION_FIELDS = ("TangentScale", "SplineSamples", "SpatialStep", "SampleTime")
+
+
+def constants_fingerprint() -> bytes:
+    """
+    Every XrpConstants value and the generator resolution, as bytes for the cache key.
+
+    The values are read when called, so constants changed at run time (as the
+    parameter sweep does) give a different key.
+    """
+    items = []
+    for class_name, constants in sorted(vars(XrpConstants).items()):
+        if isinstance(constants, type):
+            for field, value in sorted(vars(constants).items()):
+                if not field.startswith("_") and not callable(value):
+                    items.append(f"{class_name}.{field}={value!r}")
+
+    items.extend(f"Trajectory.{field}={getattr(TrajectoryConstants, field)!r}" for field in _RESOLUTION_FIELDS)
+    return "\n".join(items).encode()
+
+
+def source_digest(source: bytes) -> str:
+    """
+    Hex SHA-256 of the source file contents
+    """
+    return hashlib.sha256(source).hexdigest()
+
+
+def cache_key(source: bytes, constraints: TrajectoryConstraints) -> str:
+    """
+    Hex SHA-256 identifying the trajectory generated from the source with these constraints
+    """
+    digest = hashlib.sha256()
+    digest.update(struct.pack("<I", CACHE_VERSION))
+    digest.update(bytes.fromhex(source_digest(source)))
+    digest.update(repr(constraints.key()).encode())
+    digest.update(constants_fingerprint())
+    return digest.hexdigest()
+
+
+def write_trajectory(path: str, trajectory: Trajectory, key: str, source: Optional[str] = None) -> None:
+    """
+    Write a trajectory in the cache file layout. The file is written under a
+    temporary name and renamed, so a reader never sees a partial entry.
+
+    :param source: source_digest() of the file the trajectory was generated from, if known
+    """
+    columns = np.vstack([np.asarray(getattr(trajectory, name), dtype="<f8") for name in _COLUMNS])
+    header = _HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(_COLUMNS), columns.shape[1],
+                          trajectory.duration, trajectory.length, bytes.fromhex(key),
+                          bytes.fromhex(source) if source else bytes(32))
+
+    directory = os.path.dirname(path) or "."
+    handle, temporary = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(handle, "wb") as f:
+            f.write(header)
+            f.write(columns.tobytes())
+
+        os.replace(temporary, path)
+
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def read_trajectory(path: str, key: Optional[str] = None) -> Trajectory:
+    """
+    Memory map a cache file as a Trajectory
+
+    :param path: Cache file
+    :param key:  Expected cache key, checked against the one stored in the header
+
+    :raises ValueError: if the file is not a valid entry (or not the expected one)
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+
+    if len(header) < _HEADER.size:
+        raise ValueError(f"{path}: too short to be a trajectory cache file")
+
+    magic, version, column_count, count, _duration, _length, stored_key, _source = _HEADER.unpack(header)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or column_count != len(_COLUMNS):
+        raise ValueError(f"{path}: not a version {CACHE_VERSION} trajectory cache file")
+
+    if key is not None and stored_key != bytes.fromhex(key):
+        raise ValueError(f"{path}: cache key does not match")
+
+    if os.path.getsize(path) != _HEADER.size + column_count * count * 8:
+        raise ValueError(f"{path}: truncated trajectory cache file")
+
+    columns = np.memmap(path, dtype="<f8", mode="r", offset=_HEADER.size, shape=(column_count, count))
+    return Trajectory(*columns)
+
+
+def read_source_digest(path: str) -> Optional[str]:
+    """
+    source_digest() stored in a cache file, None if it has none or is not a cache file
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+
+    if len(header) < _HEADER.size:
+        return None
+
+    magic, version, *_, source = _HEADER.unpack(header)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or source == bytes(32):
+        return None
+
+    return source.hex()
+
+
+class TrajectoryCache:
+    """
+    Directory of memory mapped trajectories, keyed by cache_key()
+    """
+    def __init__(self, directory: str, max_bytes: int = TrajectoryConstants.Cache.MaxBytes):
+        """
+        :param directory: Where the entries are stored, created if needed
+        :param max_bytes: Size the directory is trimmed back to after each store
+        """
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._loaded: Dict[str, Trajectory] = {}    # Key -> trajectory mapped by this process
+
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def _entry_path(self, name: str, key: str) -> str:
+        return os.path.join(self._directory, f"{name}.{key[:16]}{CACHE_SUFFIX}")
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """
+        (last use, size, path) of every entry
+        """
+        entries = []
+        with os.scandir(self._directory) as it:
+            for entry in it:
+                if entry.name.endswith(CACHE_SUFFIX) and entry.is_file():
+                    try:
+                        stat = entry.stat()
+
+                    except FileNotFoundError:
+                        continue        # Replaced or evicted by another thread since the listing
+
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    @property
+    def size(self) -> int:
+        """
+        Bytes used by the entries
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def get(self, name: str, key: str) -> Optional[Trajectory]:
+        """
+        The cached trajectory, or None if there is no valid entry
+        """
+        trajectory = self._loaded.get(key)
+        if trajectory is not None:
+            self.hits += 1
+            return trajectory
+
+        path = self._entry_path(name, key)
+        try:
+            trajectory = read_trajectory(path, key)
+            os.utime(path)          # The modification time is the LRU order
+
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding trajectory cache entry: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        self._loaded[key] = trajectory
+        self.hits += 1
+        return trajectory
+
+    def put(self, name: str, key: str, trajectory: Trajectory, source: Optional[str] = None) -> Trajectory:
+        """
+        Store a trajectory. Entries for the same name that were generated from
+        other source contents are stale and removed, entries for the same source
+        with other constraints are kept.
+
+        :param source: source_digest() of the file the trajectory was generated from.
+                       Without it no other entry is removed.
+
+        :return: The stored trajectory, memory mapped from the new entry
+        """
+        path = self._entry_path(name, key)
+
+        if source is not None:
+            for _, _, other in self._entries():
+                if other == path or os.path.basename(other).rsplit(".", 2)[0] != name:
+                    continue
+
+                try:
+                    stale = read_source_digest(other) != source
+
+                except FileNotFoundError:
+                    continue        # Replaced or evicted by another thread since the listing
+
+                if stale:
+                    self._remove(other)
+
+        write_trajectory(path, trajectory, key, source)
+        stored = read_trajectory(path, key)
+        self._loaded[key] = stored
+
+        self.evict()
+        return stored
+
+    def load(self, source_path: str, build: Callable[[bytes], Trajectory],
+             constraints: Optional[TrajectoryConstraints] = None) -> Trajectory:
+        """
+        The trajectory for a source file, from the cache or built and stored
+
+        :param source_path: Path or auto file the trajectory is generated from
+        :param build:       Generates the trajectory from the file contents on a miss
+        :param constraints: Limits the trajectory is generated with, these are part of the key
+        """
+        constraints = constraints or TrajectoryConstraints()
+        with open(source_path, "rb") as f:
+            source = f.read()
+
+        name = os.path.splitext(os.path.basename(source_path))[0]
+        key = cache_key(source, constraints)
+
+        trajectory = self.get(name, key)
+        if trajectory is None:
+            start = time.perf_counter()
+            trajectory = self.put(name, key, build(source), source_digest(source))
+            logger.info(f"Generated trajectory '{name}' in {(time.perf_counter() - start) * 1e3:.1f} ms "
+                        f"({len(trajectory)} samples, {trajectory.duration:.2f} s)")
+
+        return trajectory
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache is within max_bytes
+
+        :return: Number of entries removed
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for _, size, path in entries:
+            if total <= self._max_bytes:
+                break
+
+            self._remove(path)
+            total -= size
+            removed += 1
+
+        return removed
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    def _remove(self, path: str) -> None:
+        # A mapped entry stays readable after the unlink, so trajectories in use are unaffected
+        try:
+            os.unlink(path)
+
+        except OSError as e:
+            logger.warning(f"Could not remove trajectory cache entry {path}: {e}")
+
+    def report(self) -> str:
+        return (f"Trajectory cache {self._directory}: {len(self._entries())} entries, {self.size} bytes, "
+                f"{self.hits} hits, {self.misses} misses")
+
+
+_cache: Optional[TrajectoryCache] = None
+
+
+def get_trajectory_cache() -> Optional[TrajectoryCache]:
+    """
+    The shared TrajectoryCache, or None if caching is disabled
+    """
+    global _cache
+    if _cache is None and TrajectoryConstants.Cache.Enabled:
+        directory = os.environ.get("XRP_TRAJECTORY_CACHE", TrajectoryConstants.Cache.Directory)
+        _cache = TrajectoryCache(directory)
+    return _cache
+
+
+def main(argv=None) -> int:
+    waypoints = [(0.5, 2.0, 0.0), (1.5, 2.5, math.pi / 4), (2.5, 3.0, 0.0), (3.0, 2.0, -math.pi / 2)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "benchmark.json")
+        with open(source, "w") as f:
+            json.dump(waypoints, f)
+
+        def build(data: bytes) -> Trajectory:
+            return generate(json.loads(data))
+
+        cache = TrajectoryCache(os.path.join(directory, "cache"))
+
+        start = time.perf_counter()
+        cache.load(source, build)
+        generated = time.perf_counter() - start
+
+        cache = TrajectoryCache(cache.directory)        # As on the next boot
+        start = time.perf_counter()
+        trajectory = cache.load(source, build)
+        cached = time.perf_counter() - start
+
+        print(f"{trajectory}: generated and stored in {generated * 1e3:.2f} ms, "
+              f"loaded from the cache in {cached * 1e3:.2f} ms")
+
+        # A second set of constraints for the same source is kept next to the first
+        slow = TrajectoryConstraints(max_velocity=TrajectoryConstants.MaxVelocity / 2)
+        cache.load(source, build, slow)
+
+        cache = TrajectoryCache(cache.directory)
+        cache.load(source, build)
+        cache.load(source, build, slow)
+        print(cache.report())
+        if cache.misses:
+            print("Entries for the same source with other constraints were not kept")
+            return 1
+
+        # Editing the source replaces both
+        with open(source, "w") as f:
+            json.dump(waypoints[:-1], f)
+
+        cache.load(source, build)
+        if len(cache._entries()) != 1:
+            print("Entries for the old source contents were not removed")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Constants for source in this subdirectory will go here
+from lib_6107.constants import XrpConstants
+from lib_6107.simulation.xrp_model import XrpDriveModel
+
+
+class TrajectoryConstants:
+    """
+    Default limits and resolution for the trajectory generator
+    """
+    MaxVelocity = XrpDriveModel().free_wheel_speed  # m/s, also the limit for each wheel. The wheel speed
+                                                    # at full output, the same top speed the drive scales by
+    MaxAcceleration = 0.5                       # m/s^2
+    MaxCentripetalAcceleration = 0.5            # m/s^2, keeps the robot from sliding out of turns
+    TrackWidth = XrpConstants.Physical.TrackWidth
+
+    TangentScale = 1.2                  # Waypoint tangent length as a fraction of the distance to the next one
+    SplineSamples = 128                 # Samples per spline segment for the arc length table
+    SpatialStep = 0.005                 # Meters between the points the velocity profile is computed at
+    SampleTime = 0.020                  # Seconds between the emitted samples (the robot loop period)
+
+    class Profile:
+        Voltage = XrpConstants.Motor.Voltage    # Bus voltage the motor limits are computed at, None to
+                                                # only apply the limits above
+        SpeedMargin = 0.9               # Fraction of the wheel free speed the profile may use, the rest
+                                        # is headroom for the follower's corrections
+        WheelCOF = 1.0                  # Wheel to carpet coefficient of friction
+        LateralShare = 0.7              # Fraction of the traction that cornering may use, the rest is
+                                        # always left for speeding up and slowing down
+
+    class Follower:
+        RamseteB = 2.0                  # Ramsete gain, larger converges faster (like a proportional term)
+        RamseteZeta = 0.7               # Ramsete damping, 0 < zeta < 1
+
+    class NavGrid:
+        Resolution = 0.10               # Grid cell size (m)
+        Clearance = 0.02                # Extra distance (m) kept from walls beyond the robot footprint
+        ObstacleRadius = 0.10           # Default radius (m) of an obstacle added with NavGrid.block()
+
+    class Cache:
+        Enabled = True                  # Keep generated trajectories on disk between boots
+        Directory = "trajectory_cache"  # Where the cache files are written, the XRP_TRAJECTORY_CACHE
+                                        # environment variable overrides this
+        MaxBytes = 16 * 1024 * 1024     # Least recently used entries are removed past this size
@@ -0,0 +1,242 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Pieces for following a Trajectory in the robot loop.
+#
+#   TrajectoryCursor    Reference sample at a time. Time only moves forward while
+#                       a trajectory is followed, so the cursor remembers where it
+#                       was and steps ahead: amortized O(1) per loop however many
+#                       samples the trajectory has.
+#   RamseteController   Nonlinear unicycle tracking controller, on plain floats.
+#   wheel_outputs()     Chassis speeds to open loop motor outputs, the scaling the
+#                       drive subsystem applies.
+#
+# They work on Python floats (the columns are converted to lists once) so a loop
+# does no NumPy scalar access and builds no geometry objects.
+#
+# Run this module to check that the follower tracks a generated trajectory on the
+# XRP drivetrain model (wheel dynamics included, with perfect odometry):
+#
+#   python -m lib_6107.trajectory.follower --threshold 0.02
+#
+import argparse
+import bisect
+import math
+import sys
+
+from typing import Optional, Tuple
+
+from lib_6107.simulation.integrators import DrivetrainSystem, FixedStepIntegrator, IntegrationMethod
+from lib_6107.simulation.xrp_model import XrpDriveModel
+from lib_6107.trajectory.constants import TrajectoryConstants
+from lib_6107.trajectory.generator import Trajectory, generate
+
+# Reference (x, y, heading, v, omega)
+Reference = Tuple[float, float, float, float, float]
+
+
+class TrajectoryCursor:
+    """
+    Monotonic sample lookup into a Trajectory
+    """
+    __slots__ = ("_t", "_x", "_y", "_theta", "_v", "_omega", "_last", "_index")
+
+    def __init__(self, trajectory: Trajectory):
+        self._t = trajectory.t.tolist()
+        self._x = trajectory.x.tolist()
+        self._y = trajectory.y.tolist()
+        self._theta = trajectory.theta.tolist()
+        self._v = trajectory.v.tolist()
+        self._omega = trajectory.omega.tolist()
+        self._last = len(self._t) - 1
+        self._index = 0
+
+    @property
+    def index(self) -> int:
+        """
+        Sample at or before the last time looked up
+        """
+        return self._index
+
+    @property
+    def duration(self) -> float:
+        return self._t[-1]
+
+    def reset(self) -> None:
+        self._index = 0
+
+    def seek(self, t: float) -> None:
+        """
+        Move the cursor to a time with a binary search, for jumps (such as a checkpoint restore)
+        """
+        self._index = min(max(bisect.bisect_right(self._t, t) - 1, 0), self._last)
+
+    def sample(self, t: float) -> Reference:
+        """
+        Reference at time t, interpolated between the samples and clamped to the ends
+        """
+        times, i, last = self._t, self._index, self._last
+
+        if t < times[i]:
+            self.seek(t)
+            i = self._index
+
+        while i < last and times[i + 1] <= t:
+            i += 1
+        self._index = i
+
+        if i == last or t <= times[i]:
+            return self._x[i], self._y[i], self._theta[i], self._v[i], self._omega[i]
+
+        f = (t - times[i]) / (times[i + 1] - times[i])
+        x, y, theta, v, omega = self._x, self._y, self._theta, self._v, self._omega
+        j = i + 1
+        return (x[i] + f * (x[j] - x[i]), y[i] + f * (y[j] - y[i]), theta[i] + f * (theta[j] - theta[i]),
+                v[i] + f * (v[j] - v[i]), omega[i] + f * (omega[j] - omega[i]))
+
+
+class RamseteController:
+    """
+    Ramsete unicycle controller, the same control law as wpimath's RamseteController:
+
+        e = pose error in the robot frame (e_x, e_y, e_theta)
+        k = 2 zeta sqrt(omega_ref^2 + b v_ref^2)
+        v     = v_ref cos(e_theta) + k e_x
+        omega = omega_ref + k e_theta + b v_ref sinc(e_theta) e_y
+    """
+    __slots__ = ("b", "zeta")
+
+    def __init__(self, b: float = TrajectoryConstants.Follower.RamseteB,
+                 zeta: float = TrajectoryConstants.Follower.RamseteZeta):
+        """
+        :param b:    Convergence gain, b > 0
+        :param zeta: Damping, 0 < zeta < 1
+        """
+        if b <= 0 or not 0 < zeta < 1:
+            raise ValueError(f"Ramsete gains need b > 0 and 0 < zeta < 1, got {b} / {zeta}")
+
+        self.b = b
+        self.zeta = zeta
+
+    def calculate(self, x: float, y: float, theta: float, x_ref: float, y_ref: float, theta_ref: float,
+                  v_ref: float, omega_ref: float) -> Tuple[float, float]:
+        """
+        :return: Chassis (v, omega) to drive with
+        """
+        dx, dy = x_ref - x, y_ref - y
+        cos_t, sin_t = math.cos(theta), math.sin(theta)
+        error_x = cos_t * dx + sin_t * dy
+        error_y = cos_t * dy - sin_t * dx
+        error_theta = math.remainder(theta_ref - theta, math.tau)
+
+        k = 2.0 * self.zeta * math.sqrt(omega_ref * omega_ref + self.b * v_ref * v_ref)
+        sinc = math.sin(error_theta) / error_theta if abs(error_theta) > 1e-9 else 1.0
+
+        return (v_ref * math.cos(error_theta) + k * error_x,
+                omega_ref + k * error_theta + self.b * v_ref * sinc * error_y)
+
+
+def wheel_outputs(velocity: float, omega: float, free_speed: float,
+                  track_width: float = TrajectoryConstants.TrackWidth) -> Tuple[float, float]:
+    """
+    Open loop (left, right) motor outputs [-1.0..1.0] for a chassis velocity and turn rate.
+
+    The wheel speeds are scaled by the free wheel speed, the speed a wheel reaches
+    at full output. If either wheel would need more, both are scaled down together
+    so the curvature is kept.
+
+    :param velocity:    Forward speed in m/s
+    :param omega:       Turn rate in radians per second, counter-clockwise positive
+    :param free_speed:  Wheel speed (m/s) at full output
+    :param track_width: Distance between the wheels (m)
+    """
+    half_track = track_width / 2
+    left, right = velocity - omega * half_track, velocity + omega * half_track
+
+    scale = max(abs(left), abs(right), free_speed)
+    return left / scale, right / scale
+
+
+def track(trajectory: Trajectory, controller: Optional[RamseteController] = None,
+          model: Optional[XrpDriveModel] = None, period: float = TrajectoryConstants.SampleTime,
+          start_offset: Tuple[float, float, float] = (0.0, 0.0, 0.0),
+          settle: float = 0.0) -> Tuple[float, float]:
+    """
+    Follow a trajectory in closed loop on the drivetrain model, the way FollowTrajectory
+    does on the robot: Ramsete on the pose, then wheel_outputs() applied as motor voltage.
+
+    :param trajectory:   Trajectory to follow
+    :param controller:   Tracking controller, defaults to RamseteController()
+    :param model:        Drivetrain model, defaults to one built from XrpConstants
+    :param period:       Robot loop period in seconds
+    :param start_offset: (x, y, heading) error of the robot at the start
+    :param settle:       Seconds before the tracking error starts to count
+
+    :return: (largest distance behind or beside the reference, distance from the goal at the end) in meters
+    """
+    controller = controller or RamseteController()
+    model = model or XrpDriveModel()
+    integrator = FixedStepIntegrator(DrivetrainSystem(model), IntegrationMethod.RK4, period, 20)
+    cursor = TrajectoryCursor(trajectory)
+
+    x0, y0, theta0 = float(trajectory.x[0]), float(trajectory.y[0]), float(trajectory.theta[0])
+    state = (x0 + start_offset[0], y0 + start_offset[1], theta0 + start_offset[2], 0.0, 0.0)
+
+    max_error = 0.0
+    ticks = int(math.ceil(cursor.duration / period))
+    for tick in range(ticks):
+        x_ref, y_ref, theta_ref, v_ref, omega_ref = cursor.sample(tick * period)
+        velocity, omega = controller.calculate(state[0], state[1], state[2], x_ref, y_ref, theta_ref,
+                                               v_ref, omega_ref)
+        left, right = wheel_outputs(velocity, omega, model.free_wheel_speed, model.track_width)
+        state = integrator.advance(state, (left * model.nominal_voltage, right * model.nominal_voltage), period)
+
+        if (tick + 1) * period >= settle:
+            x_ref, y_ref = cursor.sample((tick + 1) * period)[:2]
+            max_error = max(max_error, math.hypot(state[0] - x_ref, state[1] - y_ref))
+
+    final_error = math.hypot(state[0] - float(trajectory.x[-1]), state[1] - float(trajectory.y[-1]))
+    return max_error, final_error
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check the trajectory follower on the drivetrain model")
+    parser.add_argument("--threshold", type=float, default=0.02, help="Largest allowed tracking error (m)")
+    args = parser.parse_args(argv)
+
+    waypoints = [(0.5, 2.0, 0.0), (1.5, 2.5, math.pi / 4), (2.5, 3.0, 0.0), (3.0, 2.0, -math.pi / 2)]
+    trajectory = generate(waypoints)
+    print(f"{trajectory}")
+
+    # On the path, the robot has to stay on the reference all the way. Started off the path
+    # it can only catch up with the speed margin the profile leaves, so it has to reach the goal
+    max_error, final_error = track(trajectory)
+    failed = not (max_error < args.threshold and final_error < args.threshold)
+    print(f"  start on the path: max error {max_error * 100:.2f} cm, final error {final_error * 100:.2f} cm  "
+          f"{'FAILED' if failed else 'ok'}")
+
+    max_error, final_error = track(trajectory, start_offset=(0.0, 0.05, 0.1), settle=5.0)
+    ok = final_error < args.threshold
+    failed |= not ok
+    print(f"  start 5 cm / 0.1 rad off: max error {max_error * 100:.2f} cm after 5 s, "
+          f"final error {final_error * 100:.2f} cm  {'ok' if ok else 'FAILED'}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
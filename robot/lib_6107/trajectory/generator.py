@@ -0,0 +1,236 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Time parameterized trajectories for the XRP.
+#
+# A path is a quintic Hermite spline through the waypoints (spline.py). It is
+# resampled at a fixed arc length step, and a velocity is assigned to every point
+# so that:
+#
+#   - the faster wheel never exceeds the velocity limit:  v (1 + |k| W / 2) <= v_max
+#   - the centripetal acceleration is limited:            v^2 |k| <= a_c
+#   - the acceleration and deceleration are limited:      |dv^2/ds| <= 2 a_max
+#
+# On top of these the wheel speed, motor torque and traction limits of the
+# drivetrain at the constraint's bus voltage are applied (profile.py). The
+# acceleration limits are applied by a forward and a backward pass over the
+# points, each a single np.minimum.accumulate.
+#
+# The result is emitted as dense NumPy columns (t, x, y, heading, v, omega) at the
+# robot loop period. Run this module to time the generator:
+#
+#   python -m lib_6107.trajectory.generator
+#
+import math
+import sys
+import time
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from lib_6107.trajectory.constants import TrajectoryConstants
+from lib_6107.trajectory.profile import DrivetrainLimits, PathProfiler, time_parameterize
+from lib_6107.trajectory.spline import QuinticHermiteSpline, heading_and_curvature
+
+
+class TrajectoryConstraints:
+    """
+    Limits the trajectory has to respect
+    """
+    __slots__ = ("max_velocity", "max_acceleration", "max_centripetal_acceleration", "track_width",
+                 "start_velocity", "end_velocity", "voltage")
+
+    def __init__(self, max_velocity: float = TrajectoryConstants.MaxVelocity,
+                 max_acceleration: float = TrajectoryConstants.MaxAcceleration,
+                 max_centripetal_acceleration: float = TrajectoryConstants.MaxCentripetalAcceleration,
+                 track_width: float = TrajectoryConstants.TrackWidth,
+                 start_velocity: float = 0.0, end_velocity: float = 0.0,
+                 voltage: Optional[float] = TrajectoryConstants.Profile.Voltage):
+        """
+        :param max_velocity:                 Chassis and per wheel speed limit (m/s)
+        :param max_acceleration:             Acceleration and deceleration limit (m/s^2)
+        :param max_centripetal_acceleration: Limit for v^2 * curvature (m/s^2)
+        :param track_width:                  Distance between the wheels (m)
+        :param start_velocity:               Velocity at the first waypoint (m/s)
+        :param end_velocity:                 Velocity at the last waypoint (m/s)
+        :param voltage:                      Bus voltage for the drivetrain limits, None to leave
+                                             them out
+        """
+        if max_velocity <= 0 or max_acceleration <= 0 or max_centripetal_acceleration <= 0:
+            raise ValueError("Trajectory velocity and acceleration limits must be positive")
+
+        self.max_velocity = max_velocity
+        self.max_acceleration = max_acceleration
+        self.max_centripetal_acceleration = max_centripetal_acceleration
+        self.track_width = track_width
+        self.start_velocity = start_velocity
+        self.end_velocity = end_velocity
+        self.voltage = voltage
+
+    def key(self) -> Tuple[float, ...]:
+        """
+        The constraint values, for hashing and comparison
+        """
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+
+class Trajectory:
+    """
+    Dense, time parameterized samples of a path.
+
+    The heading is unwrapped (continuous), so it can be interpolated; wrap it
+    with math.remainder(theta, math.tau) if a [-pi, pi] angle is needed.
+    """
+    __slots__ = ("t", "x", "y", "theta", "v", "omega", "a", "curvature", "s")
+
+    COLUMNS = ("t", "x", "y", "theta", "v", "omega")
+
+    def __init__(self, t: np.ndarray, x: np.ndarray, y: np.ndarray, theta: np.ndarray, v: np.ndarray,
+                 omega: np.ndarray, a: np.ndarray, curvature: np.ndarray, s: np.ndarray):
+        self.t = t
+        self.x = x
+        self.y = y
+        self.theta = theta
+        self.v = v
+        self.omega = omega
+        self.a = a
+        self.curvature = curvature
+        self.s = s
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def __repr__(self) -> str:
+        return f"Trajectory({len(self.t)} samples, {self.duration:.2f} s, {self.length:.2f} m)"
+
+    @property
+    def duration(self) -> float:
+        return float(self.t[-1])
+
+    @property
+    def length(self) -> float:
+        return float(self.s[-1])
+
+    def columns(self) -> np.ndarray:
+        """
+        (N, 6) array of t, x, y, heading, v, omega
+        """
+        return np.column_stack((self.t, self.x, self.y, self.theta, self.v, self.omega))
+
+    def sample(self, t: float) -> Tuple[float, float, float, float, float]:
+        """
+        Interpolated (x, y, heading, v, omega) at time t, clamped to the trajectory
+        """
+        times = self.t
+        if t <= times[0]:
+            i, fraction = 0, 0.0
+        elif t >= times[-1]:
+            i, fraction = len(times) - 2, 1.0
+        else:
+            i = int(np.searchsorted(times, t, side="right")) - 1
+            fraction = (t - times[i]) / (times[i + 1] - times[i])
+
+        return tuple(float(column[i] + fraction * (column[i + 1] - column[i]))
+                     for column in (self.x, self.y, self.theta, self.v, self.omega))
+
+
+def velocity_limits(curvature: np.ndarray, constraints: TrajectoryConstraints) -> np.ndarray:
+    """
+    Highest velocity allowed at each point by the wheel speed and centripetal limits
+    """
+    k = np.abs(curvature)
+    wheel = constraints.max_velocity / (1.0 + k * constraints.track_width / 2)
+    with np.errstate(divide="ignore"):
+        centripetal = np.sqrt(constraints.max_centripetal_acceleration / k)
+    return np.minimum(wheel, centripetal)
+
+
+def generate(waypoints: Sequence, constraints: Optional[TrajectoryConstraints] = None,
+             sample_time: float = TrajectoryConstants.SampleTime,
+             spatial_step: float = TrajectoryConstants.SpatialStep) -> Trajectory:
+    """
+    Build a time parameterized trajectory through the waypoints
+
+    :param waypoints:    (x, y, heading) tuples or Pose2d objects, at least two
+    :param constraints:  Limits, defaults to TrajectoryConstraints()
+    :param sample_time:  Seconds between the emitted samples
+    :param spatial_step: Meters between the points the velocity profile is computed at
+    """
+    constraints = constraints or TrajectoryConstraints()
+    spline = QuinticHermiteSpline(waypoints)
+
+    # Points evenly spaced along the path
+    u_table, s_table = spline.arc_length_table()
+    length = s_table[-1]
+    count = max(int(math.ceil(length / spatial_step)), 1) + 1
+    s = np.linspace(0.0, length, count)
+    u = np.interp(s, s_table, u_table)
+
+    position, first, second = spline.evaluate(u)
+    heading, curvature = heading_and_curvature(first, second)
+
+    v_max = velocity_limits(curvature, constraints)
+    if constraints.voltage is None:
+        v, t = time_parameterize(s, v_max, constraints.max_acceleration,
+                                 constraints.start_velocity, constraints.end_velocity)
+    else:
+        profiler = PathProfiler(s, curvature, constraints.track_width)
+        v, t = profiler.profile(DrivetrainLimits(constraints.voltage), v_max, constraints.max_acceleration,
+                                constraints.start_velocity, constraints.end_velocity)
+
+    # Emit at the loop period: find the arc length reached at each sample time, then
+    # interpolate everything else along the path
+    times = np.arange(0.0, t[-1], sample_time)
+    times = np.append(times, t[-1]) if times[-1] < t[-1] else times
+    s_out = np.interp(times, t, s)
+    v_out = np.interp(times, t, v)
+    curvature_out = np.interp(s_out, s, curvature)
+
+    a_out = np.empty_like(v_out)
+    a_out[:-1] = np.diff(v_out) / np.diff(times)
+    a_out[-1] = a_out[-2] if len(a_out) > 1 else 0.0
+
+    return Trajectory(times,
+                      np.interp(s_out, s, position[:, 0]),
+                      np.interp(s_out, s, position[:, 1]),
+                      np.interp(s_out, s, heading),
+                      v_out,
+                      v_out * curvature_out,
+                      a_out,
+                      curvature_out,
+                      s_out)
+
+
+def main(argv=None) -> int:
+    waypoints = [(0.5, 2.0, 0.0), (1.5, 2.5, math.pi / 4), (2.5, 3.0, 0.0), (3.0, 2.0, -math.pi / 2)]
+
+    generate(waypoints)           # Warm up
+    runs = 50
+    start = time.perf_counter()
+    for _ in range(runs):
+        trajectory = generate(waypoints)
+    elapsed = (time.perf_counter() - start) / runs
+
+    print(f"{trajectory}, generated in {elapsed * 1e3:.2f} ms")
+    print(f"  peak v: {trajectory.v.max():.3f} m/s, peak |omega|: {np.abs(trajectory.omega).max():.3f} rad/s, "
+          f"peak |a|: {np.abs(trajectory.a).max():.3f} m/s^2")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Occupancy grid of the field for the pathfinders in planner.py.
+#
+# The walls and obstacles from the FieldGeometry are rasterized once, then grown
+# by the radius of the robot footprint (plus a clearance) so a planner can treat
+# the robot as a point: any free cell center is a position the robot fits at
+# whatever its heading.
+#
+# Cells are addressed by (column, row) with column along X, and stored flat
+# (index = row * columns + column) in a bytearray, which is what the planners
+# read in their inner loops. The same memory is also available as a
+# (rows, columns) NumPy array.
+#
+# Obstacles added with block() may overlap, so each blocked cell keeps a count of
+# the obstacles covering it and only becomes free again when the last one is removed.
+#
+import logging
+import math
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from lib_6107.constants import XrpConstants
+from lib_6107.simulation.field_geometry import FieldGeometry
+from lib_6107.trajectory.constants import TrajectoryConstants
+
+logger = logging.getLogger(__name__)
+
+Cell = Tuple[int, int]
+
+FREE = 0
+WALL = 1                        # Inside a wall or obstacle
+INFLATED = 2                    # Within the robot radius of a wall or obstacle
+BLOCKED = 3                     # Marked at run time with block()
+
+
+def footprint_radius(clearance: float = TrajectoryConstants.NavGrid.Clearance) -> float:
+    """
+    Radius (m) of the circle around the XRP footprint, plus the clearance
+    """
+    return math.hypot(XrpConstants.Physical.RobotWidth, XrpConstants.Physical.RobotLength) / 2 + clearance
+
+
+def disk_offsets(radius_cells: float) -> List[Cell]:
+    """
+    (column, row) offsets of the cells whose centers are within the radius of the center cell
+    """
+    reach = int(math.ceil(radius_cells))
+    return [(dx, dy) for dy in range(-reach, reach + 1) for dx in range(-reach, reach + 1)
+            if dx * dx + dy * dy <= radius_cells * radius_cells]
+
+
+class NavGrid:
+    """
+    Field occupancy grid, inflated by the robot footprint
+    """
+    def __init__(self, width: float, height: float, resolution: float = TrajectoryConstants.NavGrid.Resolution,
+                 radius: Optional[float] = None):
+        """
+        :param width:      Field width (X) in meters
+        :param height:     Field height (Y) in meters
+        :param resolution: Cell size in meters
+        :param radius:     Inflation radius in meters, defaults to footprint_radius()
+        """
+        if resolution <= 0:
+            raise ValueError(f"resolution must be positive, got {resolution}")
+
+        self._resolution = resolution
+        self._radius = footprint_radius() if radius is None else radius
+        self._columns = max(int(math.ceil(width / resolution)), 1)
+        self._rows = max(int(math.ceil(height / resolution)), 1)
+
+        self._cells = bytearray(self._columns * self._rows)
+        self._array = np.frombuffer(self._cells, dtype=np.uint8).reshape(self._rows, self._columns)
+        self._blocks: Dict[int, int] = {}          # Flat index -> obstacles covering a BLOCKED cell
+
+        # A wall can be anywhere in its cell, so add half a cell diagonal to stay conservative
+        self._inflation = disk_offsets(self._radius / resolution + math.sqrt(0.5))
+
+    @classmethod
+    def from_field(cls, field: FieldGeometry, resolution: float = TrajectoryConstants.NavGrid.Resolution,
+                   radius: Optional[float] = None) -> "NavGrid":
+        """
+        Rasterize the walls and obstacles of a field (including its boundary) and inflate them
+        """
+        grid = cls(field.width, field.height, resolution, radius)
+
+        walls = np.zeros_like(grid._array, dtype=bool)
+        for x1, y1, x2, y2 in field.segments:
+            # Sample each segment at under half a cell so no cell it crosses is skipped
+            steps = int(math.ceil(math.hypot(x2 - x1, y2 - y1) / (resolution / 2))) + 1
+            fraction = np.linspace(0.0, 1.0, steps)
+            columns = np.clip(((x1 + fraction * (x2 - x1)) / resolution).astype(int), 0, grid._columns - 1)
+            rows = np.clip(((y1 + fraction * (y2 - y1)) / resolution).astype(int), 0, grid._rows - 1)
+            walls[rows, columns] = True
+
+        grid._array[grid._dilate(walls)] = INFLATED
+        grid._array[walls] = WALL
+
+        logger.info(f"NavGrid {grid._columns} x {grid._rows} cells at {resolution} m, "
+                    f"{np.count_nonzero(grid._array)} of {grid._array.size} blocked")
+        return grid
+
+    def _dilate(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Grow a (rows, columns) mask by the inflation disk
+        """
+        rows, columns = mask.shape
+        grown = mask.copy()
+        for dx, dy in self._inflation:
+            src = mask[max(-dy, 0):rows - max(dy, 0), max(-dx, 0):columns - max(dx, 0)]
+            grown[max(dy, 0):rows - max(-dy, 0), max(dx, 0):columns - max(-dx, 0)] |= src
+        return grown
+
+    @property
+    def resolution(self) -> float:
+        return self._resolution
+
+    @property
+    def radius(self) -> float:
+        return self._radius
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def cells(self) -> bytearray:
+        """
+        Flat cell values (FREE, WALL, INFLATED or BLOCKED), index = row * columns + column
+        """
+        return self._cells
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        The cells as a (rows, columns) array sharing memory with cells
+        """
+        return self._array
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def index(self, cell: Cell) -> int:
+        return cell[1] * self._columns + cell[0]
+
+    def cell(self, index: int) -> Cell:
+        return index % self._columns, index // self._columns
+
+    def contains(self, cell: Cell) -> bool:
+        return 0 <= cell[0] < self._columns and 0 <= cell[1] < self._rows
+
+    def to_cell(self, x: float, y: float) -> Cell:
+        """
+        Cell containing a field position (m), clamped to the grid
+        """
+        return (min(max(int(x / self._resolution), 0), self._columns - 1),
+                min(max(int(y / self._resolution), 0), self._rows - 1))
+
+    def to_position(self, cell: Cell) -> Tuple[float, float]:
+        """
+        Field position (m) of a cell center
+        """
+        return (cell[0] + 0.5) * self._resolution, (cell[1] + 0.5) * self._resolution
+
+    def is_free(self, cell: Cell) -> bool:
+        return self.contains(cell) and self._cells[self.index(cell)] == FREE
+
+    def nearest_free(self, cell: Cell) -> Optional[Cell]:
+        """
+        Closest free cell (in grid steps), for a start or goal that ended up in an
+        inflated area. None if the grid has no free cell.
+        """
+        if self.is_free(cell):
+            return cell
+
+        columns, cells = self._columns, self._cells
+        start = self.index(cell)
+        seen = {start}
+        queue = deque((start,))
+
+        while queue:
+            index = queue.popleft()
+            if cells[index] == FREE:
+                return self.cell(index)
+
+            column = index % columns
+            for neighbor, ok in ((index - 1, column > 0), (index + 1, column < columns - 1),
+                                 (index - columns, index >= columns), (index + columns, index + columns < len(cells))):
+                if ok and neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+
+        return None
+
+    def block(self, x: float, y: float, radius: float = TrajectoryConstants.NavGrid.ObstacleRadius) -> List[int]:
+        """
+        Mark a newly detected obstacle, grown by the robot radius like the walls
+
+        :param x:      Obstacle center X (m)
+        :param y:      Obstacle center Y (m)
+        :param radius: Obstacle radius (m)
+
+        :return: Flat indexes of the cells that changed, for DStarLite.update_cells()
+        """
+        blocks, cells = self._blocks, self._cells
+        changed = []
+
+        for index in self._disk(x, y, radius):
+            current = cells[index]
+            if current == FREE:
+                cells[index] = BLOCKED
+                blocks[index] = 1
+                changed.append(index)
+            elif current == BLOCKED:
+                blocks[index] = blocks.get(index, 0) + 1
+
+        return changed
+
+    def unblock(self, x: float, y: float, radius: float = TrajectoryConstants.NavGrid.ObstacleRadius) -> List[int]:
+        """
+        Remove an obstacle added with block() at the same position and radius. Cells
+        still covered by another obstacle stay blocked, walls and their inflation
+        are left as is.
+
+        :return: Flat indexes of the cells that changed, for DStarLite.update_cells()
+        """
+        blocks, cells = self._blocks, self._cells
+        changed = []
+
+        for index in self._disk(x, y, radius):
+            count = blocks.get(index, 0)
+            if count > 1:
+                blocks[index] = count - 1
+            elif count == 1:
+                del blocks[index]
+                if cells[index] == BLOCKED:
+                    cells[index] = FREE
+                    changed.append(index)
+
+        return changed
+
+    def _disk(self, x: float, y: float, radius: float) -> Iterator[int]:
+        """
+        Flat indexes of the grid cells an obstacle covers, grown by the robot radius
+        """
+        center_column, center_row = self.to_cell(x, y)
+        columns, rows = self._columns, self._rows
+
+        for dx, dy in disk_offsets((radius + self._radius) / self._resolution + math.sqrt(0.5)):
+            column, row = center_column + dx, center_row + dy
+            if 0 <= column < columns and 0 <= row < rows:
+                yield row * columns + column
+
+    def set_cells(self, indexes: Iterable[int], value: int) -> List[int]:
+        """
+        Set cells directly (for obstacles that are not round). This overrides any
+        obstacle from block() covering the cells.
+
+        :return: Flat indexes of the cells that changed
+        """
+        blocks, cells = self._blocks, self._cells
+        changed = []
+        for index in indexes:
+            blocks.pop(index, None)
+            if cells[index] != value:
+                cells[index] = value
+                changed.append(index)
+        return changed
@@ -0,0 +1,95 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Read PathPlanner .path files into waypoints for the trajectory generator.
+#
+# PathPlanner joins its waypoints with cubic Bezier segments. The generator here
+# uses quintic Hermite segments instead, so only the anchors and the direction of
+# the control points (the heading at each anchor) carry over; the tangent length
+# comes from TrajectoryConstants.TangentScale. The path's global velocity and
+# acceleration limits are applied on top of the robot's own.
+#
+import json
+import math
+
+from typing import List, Optional, Tuple
+
+from lib_6107.trajectory.cache import get_trajectory_cache
+from lib_6107.trajectory.generator import Trajectory, TrajectoryConstraints, generate
+
+Pose = Tuple[float, float, float]
+
+
+def path_waypoints(path: dict) -> List[Pose]:
+    """
+    (x, y, heading) at each anchor of a parsed .path file
+    """
+    if path.get("reversed"):
+        raise ValueError("Reversed PathPlanner paths are not supported")
+
+    waypoints = path["waypoints"]
+    if len(waypoints) < 2:
+        raise ValueError("A path needs at least two waypoints")
+
+    poses = []
+    for waypoint in waypoints:
+        anchor = waypoint["anchor"]
+        before = waypoint.get("prevControl") or anchor
+        after = waypoint.get("nextControl") or anchor
+        heading = math.atan2(after["y"] - before["y"], after["x"] - before["x"])
+        poses.append((float(anchor["x"]), float(anchor["y"]), heading))
+
+    return poses
+
+
+def path_constraints(path: dict, constraints: Optional[TrajectoryConstraints] = None) -> TrajectoryConstraints:
+    """
+    The robot constraints, lowered to the path's global limits
+    """
+    constraints = constraints or TrajectoryConstraints()
+    limits = path.get("globalConstraints") or {}
+    if limits.get("unlimited", False):
+        return constraints
+
+    return TrajectoryConstraints(min(constraints.max_velocity, float(limits.get("maxVelocity", math.inf))),
+                                 min(constraints.max_acceleration, float(limits.get("maxAcceleration", math.inf))),
+                                 constraints.max_centripetal_acceleration,
+                                 constraints.track_width,
+                                 constraints.start_velocity,
+                                 constraints.end_velocity,
+                                 constraints.voltage)
+
+
+def build_path_trajectory(data: bytes, constraints: Optional[TrajectoryConstraints] = None) -> Trajectory:
+    """
+    Generate the trajectory for the contents of a .path file
+    """
+    path = json.loads(data)
+    return generate(path_waypoints(path), path_constraints(path, constraints))
+
+
+def load_path_trajectory(filename: str, constraints: Optional[TrajectoryConstraints] = None) -> Trajectory:
+    """
+    The trajectory for a .path file, from the trajectory cache when it is enabled
+    """
+    constraints = constraints or TrajectoryConstraints()
+    cache = get_trajectory_cache()
+    if cache is not None:
+        return cache.load(filename, lambda data: build_path_trajectory(data, constraints), constraints)
+
+    with open(filename, "rb") as f:
+        return build_path_trajectory(f.read(), constraints)
@@ -0,0 +1,481 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Grid pathfinders over a NavGrid.
+#
+#   astar()     One shot A* search, for the first plan to a goal.
+#   DStarLite   Incremental planner (Koenig & Likhachev, 'D* Lite', optimized
+#               version). It searches from the goal back to the robot and keeps
+#               its search tree, so when cells are blocked (or the robot moves)
+#               only the part of the tree that changed is repaired.
+#
+# Both use 8-connected moves (diagonals cost sqrt(2) and may not cut the corner of
+# a blocked cell) and the octile distance as heuristic, so they return paths of
+# the same length. The cell paths are turned into waypoints for the trajectory
+# generator with smooth() and to_waypoints().
+#
+# Run this module for the plan and replan latency at several grid resolutions.
+# Both planners replan from the same robot cell to the same goal after an obstacle
+# is blocked half a meter ahead of the robot:
+#
+#   python -m lib_6107.trajectory.planner
+#
+# On the XRP field (CPython 3.11, x86-64, 30 runs each) the repair is not cheaper
+# than a fresh search, as D* Lite's per cell bookkeeping in Python costs more than
+# the cells it saves expanding:
+#
+#         grid   A* plan   D* plan   A* replan   D* replan
+#     0.2 m       0.9 ms    1.3 ms      0.7 ms      1.1 ms
+#     0.1 m       1.6 ms    2.5 ms      1.3 ms      2.9 ms
+#     0.05 m      5.8 ms    8.9 ms      3.6 ms      5.1 ms
+#
+# so find_waypoints() uses astar(). DStarLite keeps its search tree for callers
+# that feed it every change of the grid and of the robot's cell toward one goal.
+#
+import argparse
+import heapq
+import math
+import os
+import sys
+import time
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from lib_6107.simulation.field_geometry import FieldGeometry
+from lib_6107.trajectory.generator import generate
+from lib_6107.trajectory.navgrid import FREE, Cell, NavGrid
+
+INF = math.inf
+
+# Move costs in thousandths of a cell. Integer costs keep the sums exact, which D* Lite
+# relies on: it compares path costs and priority keys for equality.
+STRAIGHT = 1000
+DIAGONAL = 1414
+
+Pose = Tuple[float, float, float]
+
+# (column step, row step, cost)
+_MOVES = ((1, 0, STRAIGHT), (-1, 0, STRAIGHT), (0, 1, STRAIGHT), (0, -1, STRAIGHT),
+          (1, 1, DIAGONAL), (-1, 1, DIAGONAL), (1, -1, DIAGONAL), (-1, -1, DIAGONAL))
+
+
+def _neighbors(cells: bytearray, columns: int, rows: int, index: int) -> Iterator[Tuple[int, int]]:
+    """
+    Free cells reachable in one move from a free cell, with the move cost
+    """
+    column, row = index % columns, index // columns
+    for dx, dy, cost in _MOVES:
+        c, r = column + dx, row + dy
+        if 0 <= c < columns and 0 <= r < rows:
+            neighbor = r * columns + c
+            if cells[neighbor] == FREE and (not dx or not dy or
+                                            (cells[index + dx] == FREE and cells[index + dy * columns] == FREE)):
+                yield neighbor, cost
+
+
+def _octile(columns: int, a: int, b: int) -> int:
+    dx = abs(a % columns - b % columns)
+    dy = abs(a // columns - b // columns)
+    return STRAIGHT * (dx + dy) + (DIAGONAL - 2 * STRAIGHT) * min(dx, dy)
+
+
+def astar(grid: NavGrid, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+    """
+    Shortest 8-connected path between two free cells
+
+    :return: The cells from start to goal, or None if there is no path
+    """
+    cells, columns, rows = grid.cells, grid.columns, grid.rows
+    source, target = grid.index(start), grid.index(goal)
+    if cells[source] != FREE or cells[target] != FREE:
+        return None
+
+    cost: Dict[int, int] = {source: 0}
+    parent: Dict[int, int] = {}
+    closed = bytearray(len(cells))
+    heap = [(_octile(columns, source, target), 0, source)]
+
+    while heap:
+        _, g, index = heapq.heappop(heap)
+        if closed[index]:
+            continue
+
+        if index == target:
+            path = [index]
+            while index != source:
+                index = parent[index]
+                path.append(index)
+            return [grid.cell(i) for i in reversed(path)]
+
+        closed[index] = 1
+        for neighbor, step in _neighbors(cells, columns, rows, index):
+            g_new = g + step
+            if not closed[neighbor] and g_new < cost.get(neighbor, INF):
+                cost[neighbor] = g_new
+                parent[neighbor] = index
+                heapq.heappush(heap, (g_new + _octile(columns, neighbor, target), g_new, neighbor))
+
+    return None
+
+
+class DStarLite:
+    """
+    Incremental shortest path from the robot to a fixed goal.
+
+    plan() finds the first path; after cells change, pass their indexes (as
+    returned by NavGrid.block()) to update_cells() and call plan() again.
+    """
+    def __init__(self, grid: NavGrid, start: Cell, goal: Cell):
+        self._grid = grid
+        self._columns = grid.columns
+        self._start = grid.index(start)
+        self._goal = grid.index(goal)
+        self._last = self._start
+        self._km = 0
+
+        size = len(grid)
+        self._g = [INF] * size
+        self._rhs = [INF] * size
+        self._rhs[self._goal] = 0
+
+        self._heap: List[Tuple[float, float, int]] = []
+        self._queued: Dict[int, Tuple[float, float]] = {}
+        self._push(self._goal)
+
+        self.expanded = 0           # Cells expanded by the last plan()
+
+    @property
+    def start(self) -> Cell:
+        return self._grid.cell(self._start)
+
+    @property
+    def goal(self) -> Cell:
+        return self._grid.cell(self._goal)
+
+    def _key(self, index: int) -> Tuple[float, float]:
+        best = min(self._g[index], self._rhs[index])
+        return best + _octile(self._columns, self._start, index) + self._km, best
+
+    def _push(self, index: int) -> None:
+        key = self._key(index)
+        self._queued[index] = key
+        heapq.heappush(self._heap, (key[0], key[1], index))
+
+    def _update_vertex(self, index: int) -> None:
+        if self._g[index] != self._rhs[index]:
+            self._push(index)
+        else:
+            # Stale heap entries are skipped when popped
+            self._queued.pop(index, None)
+
+    def _best_rhs(self, index: int) -> float:
+        g = self._g
+        grid = self._grid
+        return min((step + g[neighbor] for neighbor, step in _neighbors(grid.cells, grid.columns, grid.rows, index)),
+                   default=INF) if grid.cells[index] == FREE else INF
+
+    def _compute_shortest_path(self) -> None:
+        grid = self._grid
+        cells, columns, rows = grid.cells, grid.columns, grid.rows
+        g, rhs, heap, queued = self._g, self._rhs, self._heap, self._queued
+        start, goal, km = self._start, self._goal, self._km
+        start_column, start_row = start % columns, start // columns
+        heappush, heappop = heapq.heappush, heapq.heappop
+        diagonal_extra = DIAGONAL - 2 * STRAIGHT
+        expanded = 0
+
+        # _key() and _update_vertex() inlined, this loop is where the planner spends its time
+        def key(index: int) -> Tuple[float, float]:
+            best = g[index] if g[index] < rhs[index] else rhs[index]
+            dx = abs(index % columns - start_column)
+            dy = abs(index // columns - start_row)
+            return best + STRAIGHT * (dx + dy) + diagonal_extra * (dx if dx < dy else dy) + km, best
+
+        def update_vertex(index: int) -> None:
+            if g[index] != rhs[index]:
+                k = queued[index] = key(index)
+                heappush(heap, (k[0], k[1], index))
+            else:
+                queued.pop(index, None)
+
+        while heap:
+            k1, k2, index = heap[0]
+            if queued.get(index) != (k1, k2):
+                heappop(heap)
+                continue
+
+            if (k1, k2) >= key(start) and rhs[start] == g[start]:
+                break
+
+            heappop(heap)
+            expanded += 1
+            new_key = key(index)
+
+            if (k1, k2) < new_key:
+                queued[index] = new_key
+                heappush(heap, (new_key[0], new_key[1], index))
+
+            elif g[index] > rhs[index]:
+                g_index = g[index] = rhs[index]
+                del queued[index]
+                for neighbor, step in _neighbors(cells, columns, rows, index):
+                    if neighbor != goal and step + g_index < rhs[neighbor]:
+                        rhs[neighbor] = step + g_index
+                        update_vertex(neighbor)
+
+            else:
+                g_old = g[index]
+                g[index] = INF
+                del queued[index]
+                for neighbor, step in list(_neighbors(cells, columns, rows, index)) + [(index, 0)]:
+                    if neighbor != goal and rhs[neighbor] == step + g_old:
+                        rhs[neighbor] = self._best_rhs(neighbor)
+                    update_vertex(neighbor)
+
+        self.expanded = expanded
+
+    def update_cells(self, changed: Iterable[int], start: Optional[Cell] = None) -> None:
+        """
+        Tell the planner that cells changed (and optionally that the robot moved)
+
+        :param changed: Flat indexes of the cells that were blocked or freed
+        :param start:   The robot's current cell, if it moved since the last plan
+        """
+        if start is not None:
+            self.move_start(start)
+
+        grid = self._grid
+        columns, rows = grid.columns, grid.rows
+        rhs, goal = self._rhs, self._goal
+
+        # A changed cell changes the moves into and out of it and the diagonal moves
+        # past its corners, all of which start at the cell or one of its 8 neighbors
+        affected = set()
+        for index in changed:
+            column, row = index % columns, index // columns
+            affected.add(index)
+            for dx, dy, _ in _MOVES:
+                c, r = column + dx, row + dy
+                if 0 <= c < columns and 0 <= r < rows:
+                    affected.add(r * columns + c)
+
+        for index in affected:
+            if index != goal:
+                rhs[index] = self._best_rhs(index)
+            self._update_vertex(index)
+
+    def move_start(self, start: Cell) -> None:
+        """
+        The robot moved, plan from its new cell
+        """
+        index = self._grid.index(start)
+        if index != self._start:
+            self._start = index
+            self._km += _octile(self._columns, self._last, index)
+            self._last = index
+
+    def plan(self) -> Optional[List[Cell]]:
+        """
+        Repair the search and return the path from the start to the goal
+
+        :return: The cells from start to goal, or None if there is no path
+        """
+        if self._grid.cells[self._goal] != FREE:
+            return None
+
+        self._compute_shortest_path()
+
+        g = self._g
+        if g[self._start] == INF:
+            return None
+
+        grid = self._grid
+        cells, columns, rows = grid.cells, grid.columns, grid.rows
+        index, path = self._start, [self._start]
+
+        while index != self._goal:
+            index = min(_neighbors(cells, columns, rows, index), key=lambda move: move[1] + g[move[0]])[0]
+            path.append(index)
+            if len(path) > len(cells):
+                raise RuntimeError("D* Lite path extraction did not reach the goal")
+
+        return [grid.cell(i) for i in path]
+
+
+def line_of_sight(grid: NavGrid, a: Cell, b: Cell) -> bool:
+    """
+    True if the straight line between two cell centers only crosses free cells
+    """
+    cells, columns = grid.cells, grid.columns
+    steps = int(max(abs(b[0] - a[0]), abs(b[1] - a[1])) * 4) + 1
+    for step in range(steps + 1):
+        t = step / steps
+        column = int(a[0] + 0.5 + t * (b[0] - a[0]))
+        row = int(a[1] + 0.5 + t * (b[1] - a[1]))
+        if cells[row * columns + column] != FREE:
+            return False
+    return True
+
+
+def smooth(grid: NavGrid, path: Sequence[Cell]) -> List[Cell]:
+    """
+    Drop the cells that can be skipped in a straight line, leaving the corners
+    """
+    if len(path) <= 2:
+        return list(path)
+
+    result = [path[0]]
+    anchor = 0
+    for index in range(2, len(path)):
+        if not line_of_sight(grid, path[anchor], path[index]):
+            anchor = index - 1
+            result.append(path[anchor])
+
+    result.append(path[-1])
+    return result
+
+
+def to_waypoints(grid: NavGrid, path: Sequence[Cell], start: Optional[Pose] = None,
+                 goal: Optional[Pose] = None) -> List[Pose]:
+    """
+    Waypoints for the trajectory generator along a (smoothed) cell path.
+
+    Each intermediate waypoint is headed halfway between the directions of the
+    lines into and out of it.
+
+    :param start: Robot pose at the start, replaces the first cell center
+    :param goal:  Pose to end at, replaces the last cell center
+    """
+    points = [grid.to_position(cell) for cell in path]
+    if start is not None:
+        points[0] = start[:2]
+    if goal is not None:
+        points[-1] = goal[:2]
+
+    directions = [math.atan2(y2 - y1, x2 - x1) for (x1, y1), (x2, y2) in zip(points, points[1:])]
+    if not directions:
+        return [start or (*points[0], 0.0)]
+
+    headings = [start[2] if start is not None else directions[0]]
+    for incoming, outgoing in zip(directions, directions[1:]):
+        headings.append(math.atan2(math.sin(incoming) + math.sin(outgoing), math.cos(incoming) + math.cos(outgoing)))
+    headings.append(goal[2] if goal is not None else directions[-1])
+
+    return [(x, y, heading) for (x, y), heading in zip(points, headings)]
+
+
+def find_waypoints(grid: NavGrid, start: Pose, goal: Pose) -> Optional[List[Pose]]:
+    """
+    Plan with A* between two poses and return the waypoints, or None if the goal
+    cannot be reached. A start or goal inside an inflated area is moved to the
+    nearest free cell.
+    """
+    start_cell = grid.nearest_free(grid.to_cell(start[0], start[1]))
+    goal_cell = grid.nearest_free(grid.to_cell(goal[0], goal[1]))
+    if start_cell is None or goal_cell is None:
+        return None
+
+    path = astar(grid, start_cell, goal_cell)
+    if path is None:
+        return None
+
+    return to_waypoints(grid, smooth(grid, path), start, goal)
+
+
+def _default_field() -> str:
+    return os.path.join(os.path.dirname(__file__), "..", "..", "deploy", "field", "xrp_field.json")
+
+
+def _milliseconds(func, repeat: int) -> Tuple[float, object]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1e3, result
+
+
+def _path_cost(path: Sequence[Cell]) -> int:
+    return sum(DIAGONAL if a[0] != b[0] and a[1] != b[1] else STRAIGHT for a, b in zip(path, path[1:]))
+
+
+def _first_plan(grid: NavGrid, start: Cell, goal: Cell) -> DStarLite:
+    planner = DStarLite(grid, start, goal)
+    planner.plan()
+    return planner
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Plan and replan latency of the grid pathfinders")
+    parser.add_argument("--field", default=_default_field(), help="Field JSON file")
+    parser.add_argument("--resolutions", type=float, nargs="+", default=(0.2, 0.1, 0.05),
+                        help="Grid resolutions (m) to measure")
+    parser.add_argument("--start", type=float, nargs=3, default=(0.5, 2.0, 0.0), help="Start pose x y theta")
+    parser.add_argument("--goal", type=float, nargs=3, default=(9.0, 3.3, 0.0), help="Goal pose x y theta")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs averaged per measurement")
+    args = parser.parse_args(argv)
+
+    field = FieldGeometry.load(args.field)
+    start, goal = tuple(args.start), tuple(args.goal)
+    print(f"{'grid':>10} {'cells':>7} {'A* ms':>8} {'D* ms':>8} {'A* replan':>10} {'D* replan':>10} "
+          f"{'expanded':>9} {'trajectory ms':>14}")
+
+    for resolution in args.resolutions:
+        grid = NavGrid.from_field(field, resolution)
+        start_cell = grid.nearest_free(grid.to_cell(*start[:2]))
+        goal_cell = grid.nearest_free(grid.to_cell(*goal[:2]))
+
+        astar_ms, path = _milliseconds(lambda: astar(grid, start_cell, goal_cell), args.repeat)
+        if path is None:
+            print(f"{grid.columns:>4} x {grid.rows:<4}: no path")
+            continue
+
+        dstar_ms, planner = _milliseconds(lambda: _first_plan(grid, start_cell, goal_cell), args.repeat)
+
+        # A quarter of the way along, the robot sees an obstacle on the path half a meter ahead.
+        # Both planners then search from the robot's cell to the same goal.
+        robot = path[len(path) // 4]
+        x, y = grid.to_position(path[min(len(path) // 4 + int(0.5 / resolution), len(path) - 1)])
+
+        grid.block(x, y)
+        astar_replan_ms, astar_path = _milliseconds(lambda: astar(grid, robot, goal_cell), args.repeat)
+        grid.unblock(x, y)
+
+        dstar_replan_ms = 0.0
+        for _ in range(args.repeat):
+            planner = _first_plan(grid, start_cell, goal_cell)
+            changed = grid.block(x, y)
+            begin = time.perf_counter()
+            planner.update_cells(changed, robot)
+            dstar_path = planner.plan()
+            dstar_replan_ms += (time.perf_counter() - begin) * 1e3 / args.repeat
+            grid.unblock(x, y)
+
+        if (astar_path is None) != (dstar_path is None) or \
+                (astar_path is not None and _path_cost(astar_path) != _path_cost(dstar_path)):
+            print(f"{grid.columns:>4} x {grid.rows:<4}: A* and D* Lite replanned paths differ in length")
+            return 1
+
+        waypoints = to_waypoints(grid, smooth(grid, astar_path or path), start, goal)
+        trajectory_ms, _ = _milliseconds(lambda: generate(waypoints), args.repeat)
+
+        print(f"{grid.columns:>4} x {grid.rows:<4} {len(grid):>7} {astar_ms:8.2f} {dstar_ms:8.2f} "
+              f"{astar_replan_ms:10.2f} {dstar_replan_ms:10.2f} {planner.expanded:>9} {trajectory_ms:14.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Time optimal velocity profile along a geometric path.
+#
+# Every point of the path gets a velocity limit and an acceleration and a
+# deceleration limit. With w = v^2 and A the running sum of 2 a ds, the forward
+# (acceleration) pass
+#
+#   w[i] = min(w_max[i], w[i-1] + 2 a[i-1] (s[i] - s[i-1]))
+#        = A[i] + min over j <= i of (w_max[j] - A[j])
+#
+# is a running minimum, and the backward (deceleration) pass is the same on the
+# reversed path, so a profile is a handful of whole-array NumPy operations.
+#
+# The limits come from the XRP drivetrain model (lib_6107.simulation.xrp_model) at
+# a given bus voltage:
+#
+#   - wheel speed:    the outer wheel turns at v (1 + |k| W / 2), which has to stay
+#                     under the free wheel speed at that voltage
+#   - motor torque:   the drive force falls off linearly with the wheel speed, so
+#                     acceleration is weakest at the speed limit. Braking with
+#                     reverse voltage is helped by the back EMF and is weakest when
+#                     stopped.
+#   - traction:       the wheels can not push harder than COF * g, shared between
+#                     cornering (v^2 |k|) and speeding up or slowing down
+#
+# Run this module to time a profile of a long path:
+#
+#   python -m lib_6107.trajectory.profile --points 10000
+#
+import argparse
+import sys
+import time
+
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from lib_6107.simulation.xrp_model import XrpDriveModel
+from lib_6107.trajectory.constants import TrajectoryConstants
+
+GRAVITY = 9.80665               # m/s^2
+
+Limit = Union[float, np.ndarray]
+
+
+class DrivetrainLimits:
+    """
+    Wheel speed, acceleration and traction limits of the XRP drivetrain at one bus voltage
+    """
+    __slots__ = ("voltage", "wheel_speed", "wheel_acceleration", "wheel_deceleration", "traction",
+                 "lateral_traction")
+
+    def __init__(self, voltage: Optional[float] = None, model: Optional[XrpDriveModel] = None,
+                 speed_margin: float = TrajectoryConstants.Profile.SpeedMargin,
+                 wheel_cof: float = TrajectoryConstants.Profile.WheelCOF,
+                 lateral_share: float = TrajectoryConstants.Profile.LateralShare):
+        """
+        :param voltage:       Bus voltage, defaults to the motor's nominal voltage
+        :param model:         Drivetrain model, defaults to one built from XrpConstants
+        :param speed_margin:  Fraction of the wheel free speed that may be used (0..1)
+        :param wheel_cof:     Wheel coefficient of friction
+        :param lateral_share: Fraction of the traction that cornering may use (0..1)
+        """
+        model = model or XrpDriveModel()
+        voltage = model.nominal_voltage if voltage is None else voltage
+
+        if voltage <= 0:
+            raise ValueError(f"voltage must be positive, got {voltage}")
+
+        if not 0 < speed_margin < 1 or not 0 < lateral_share < 1:
+            raise ValueError("speed_margin and lateral_share must be between 0 and 1")
+
+        free_speed = model.steady_state_speed(voltage)
+
+        self.voltage = voltage
+        self.wheel_speed = speed_margin * free_speed                                # m/s
+        self.wheel_acceleration = model.k_emf * (free_speed - self.wheel_speed)     # m/s^2 at wheel_speed
+        self.wheel_deceleration = model.k_drive * voltage                           # m/s^2 when stopped
+        self.traction = wheel_cof * GRAVITY                                         # m/s^2
+        self.lateral_traction = lateral_share * self.traction
+
+    def __repr__(self) -> str:
+        return (f"DrivetrainLimits({self.voltage:.2f} V: wheel {self.wheel_speed:.3f} m/s, "
+                f"+{self.wheel_acceleration:.1f} / -{self.wheel_deceleration:.1f} m/s^2, "
+                f"traction {self.traction:.1f} m/s^2)")
+
+
+class PathProfiler:
+    """
+    Velocity profiles of one path.
+
+    The geometry dependent arrays are computed once, so the profile can be redone
+    cheaply whenever the bus voltage or the limits change.
+    """
+    __slots__ = ("s", "curvature", "_k", "_outer")
+
+    def __init__(self, s: np.ndarray, curvature: np.ndarray,
+                 track_width: float = TrajectoryConstants.TrackWidth):
+        """
+        :param s:           Arc length of each point, increasing
+        :param curvature:   Signed curvature at each point (1/m)
+        :param track_width: Distance between the wheels (m)
+        """
+        if len(s) < 2 or len(s) != len(curvature):
+            raise ValueError("At least two points with a curvature each are required")
+
+        self.s = s
+        self.curvature = curvature
+        self._k = np.abs(curvature)
+
+        # Outer wheel speed (and acceleration) as a multiple of the chassis value
+        self._outer = 1.0 + self._k * (track_width / 2)
+
+    def __len__(self) -> int:
+        return len(self.s)
+
+    def limits(self, limits: DrivetrainLimits) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Velocity, acceleration and deceleration limit at each point
+
+        :return: (v_max, max_acceleration, max_deceleration) arrays
+        """
+        k, outer = self._k, self._outer
+
+        w_max = np.square(limits.wheel_speed / outer)
+        with np.errstate(divide="ignore"):
+            np.minimum(w_max, limits.lateral_traction / k, out=w_max)
+
+        # Traction left over for the tangential direction at the fastest allowed speed
+        lateral = w_max * k
+        tangential = np.sqrt(limits.traction ** 2 - np.square(lateral))
+
+        acceleration = np.minimum(limits.wheel_acceleration / outer, tangential)
+        deceleration = np.minimum(limits.wheel_deceleration / outer, tangential)
+        return np.sqrt(w_max), acceleration, deceleration
+
+    def profile(self, limits: Optional[DrivetrainLimits] = None, v_max: Optional[np.ndarray] = None,
+                max_acceleration: Limit = np.inf, start_velocity: float = 0.0,
+                end_velocity: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fastest velocity profile under the drivetrain limits and any extra limits
+
+        :param limits:           Drivetrain limits, defaults to DrivetrainLimits() at the nominal voltage
+        :param v_max:            Extra velocity limit at each point
+        :param max_acceleration: Extra acceleration and deceleration limit
+        :param start_velocity:   Velocity at the first point
+        :param end_velocity:     Velocity at the last point
+
+        :return: (v, t) arrays
+        """
+        wheel_v, acceleration, deceleration = self.limits(limits or DrivetrainLimits())
+        if v_max is not None:
+            np.minimum(wheel_v, v_max, out=wheel_v)
+
+        np.minimum(acceleration, max_acceleration, out=acceleration)
+        np.minimum(deceleration, max_acceleration, out=deceleration)
+
+        return time_parameterize(self.s, wheel_v, acceleration, start_velocity, end_velocity,
+                                 max_deceleration=deceleration)
+
+
+def _segment_limit(limit: Limit) -> Limit:
+    """
+    Limit between consecutive points, the lower of the two ends
+    """
+    if np.ndim(limit) == 0:
+        return float(limit)
+
+    return np.minimum(limit[:-1], limit[1:])
+
+
+def _running_sum(two_a_ds: Limit, ds: np.ndarray) -> np.ndarray:
+    """
+    Running sum of 2 a ds from the first point, starting at zero
+    """
+    total = np.empty(len(ds) + 1)
+    total[0] = 0.0
+    np.cumsum(np.broadcast_to(two_a_ds, ds.shape), out=total[1:])
+    return total
+
+
+def time_parameterize(s: np.ndarray, v_max: np.ndarray, max_acceleration: Limit,
+                      start_velocity: float = 0.0, end_velocity: float = 0.0,
+                      max_deceleration: Optional[Limit] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fastest velocity at each point that respects the per point limits and the
+    acceleration limits, and the time each point is reached
+
+    :param s:                Arc length of each point, increasing
+    :param v_max:            Velocity limit at each point
+    :param max_acceleration: Acceleration limit, one value or one per point
+    :param start_velocity:   Velocity at the first point
+    :param end_velocity:     Velocity at the last point
+    :param max_deceleration: Deceleration limit, one value or one per point. Defaults
+                             to max_acceleration
+
+    :return: (v, t) arrays
+    """
+    if max_deceleration is None:
+        max_deceleration = max_acceleration
+
+    w_max = np.square(v_max)
+    w_max[0] = min(w_max[0], start_velocity ** 2)
+    w_max[-1] = min(w_max[-1], end_velocity ** 2)
+
+    ds = np.diff(s)
+    acceleration = _segment_limit(max_acceleration)
+
+    # Forward pass (acceleration), then backward pass (deceleration) on the reversed arc length
+    two_a_s = _running_sum(2.0 * acceleration * ds, ds)
+    w = two_a_s + np.minimum.accumulate(w_max - two_a_s)
+
+    two_d_s = _running_sum(2.0 * _segment_limit(max_deceleration) * ds, ds)
+    two_d_r = two_d_s[-1] - two_d_s
+    np.minimum(w, two_d_r + np.minimum.accumulate((w - two_d_r)[::-1])[::-1], out=w)
+    v = np.sqrt(np.maximum(w, 0.0))
+
+    # Constant acceleration between points: dt = 2 ds / (v0 + v1)
+    v_sum = v[1:] + v[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dt = np.where(v_sum > 0, 2.0 * ds / v_sum, np.sqrt(2.0 * ds / acceleration))
+
+    t = np.empty_like(s)
+    t[0] = 0.0
+    np.cumsum(dt, out=t[1:])
+    return v, t
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Time the velocity profile of a long path")
+    parser.add_argument("--points", type=int, default=10000, help="Points along the path")
+    parser.add_argument("--runs", type=int, default=100, help="Profiles to time")
+    args = parser.parse_args(argv)
+
+    # Points at the generator's spacing along a path that alternates straights, gentle arcs and tight turns
+    s = np.linspace(0.0, args.points * TrajectoryConstants.SpatialStep, args.points)
+    curvature = 8.0 * np.sin(s * 3.0) ** 3
+    profiler = PathProfiler(s, curvature)
+
+    for voltage in (4.5, 4.0, 3.5):
+        limits = DrivetrainLimits(voltage)
+        profiler.profile(limits)            # Warm up
+
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            v, t = profiler.profile(limits)
+        elapsed = (time.perf_counter() - start) / args.runs
+
+        print(f"{limits}")
+        print(f"  {len(profiler)} points, {s[-1]:.1f} m in {t[-1]:.2f} s, peak v {v.max():.3f} m/s, "
+              f"profiled in {elapsed * 1e3:.3f} ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Quintic Hermite splines through a list of waypoints, evaluated with NumPy.
+#
+# Each waypoint is a pose (x, y, heading). Consecutive waypoints are joined by a
+# quintic segment whose end tangents point along the waypoint headings, with a
+# length proportional to the distance between the waypoints, and whose end
+# second derivatives are zero (the same choice WPILib makes). All segments are
+# evaluated at once: points are addressed by a global parameter 'u' where the
+# integer part is the segment and the fraction the position within it.
+#
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from lib_6107.trajectory.constants import TrajectoryConstants
+
+Waypoint = Tuple[float, float, float]       # x (m), y (m), heading (radians)
+
+
+def as_waypoints(waypoints: Sequence) -> np.ndarray:
+    """
+    Convert (x, y, heading) tuples or wpimath Pose2d objects to an (N, 3) array
+    """
+    rows = []
+    for waypoint in waypoints:
+        if hasattr(waypoint, "rotation"):
+            rows.append((waypoint.X(), waypoint.Y(), waypoint.rotation().radians()))
+        else:
+            rows.append(tuple(waypoint))
+
+    array = np.asarray(rows, dtype=np.float64)
+    if array.ndim != 2 or array.shape[1] != 3 or len(array) < 2:
+        raise ValueError("At least two (x, y, heading) waypoints are required")
+
+    return array
+
+
+class QuinticHermiteSpline:
+    """
+    Piecewise quintic Hermite spline through waypoints
+    """
+    __slots__ = ("_coefficients", "_segments")
+
+    def __init__(self, waypoints: Sequence, tangent_scale: float = TrajectoryConstants.TangentScale):
+        """
+        :param waypoints:     (x, y, heading) tuples or Pose2d objects, at least two
+        :param tangent_scale: Tangent length as a fraction of the distance to the next waypoint
+        """
+        points = as_waypoints(waypoints)
+        p0, p1 = points[:-1, :2], points[1:, :2]
+        chord = np.hypot(*(p1 - p0).T)
+        if np.any(chord <= 0):
+            raise ValueError("Consecutive waypoints must not be at the same position")
+
+        scale = (tangent_scale * chord)[:, None]
+        v0 = scale * np.column_stack((np.cos(points[:-1, 2]), np.sin(points[:-1, 2])))
+        v1 = scale * np.column_stack((np.cos(points[1:, 2]), np.sin(points[1:, 2])))
+
+        # Polynomial coefficients c0..c5 for each segment and axis, with zero end
+        # second derivatives: (segments, 6, 2)
+        self._coefficients = np.stack((p0,
+                                       v0,
+                                       np.zeros_like(p0),
+                                       -10 * p0 - 6 * v0 - 4 * v1 + 10 * p1,
+                                       15 * p0 + 8 * v0 + 7 * v1 - 15 * p1,
+                                       -6 * p0 - 3 * v0 - 3 * v1 + 6 * p1), axis=1)
+        self._segments = len(p0)
+
+    @property
+    def segments(self) -> int:
+        return self._segments
+
+    def evaluate(self, u: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Position, first and second derivative at global parameters u in [0, segments]
+
+        :return: Three (N, 2) arrays
+        """
+        u = np.asarray(u, dtype=np.float64)
+        segment = np.minimum(u.astype(np.int64), self._segments - 1)
+        t = (u - segment)[:, None]
+        c = self._coefficients[segment]                # (N, 6, 2)
+
+        position = c[:, 0] + t * (c[:, 1] + t * (c[:, 2] + t * (c[:, 3] + t * (c[:, 4] + t * c[:, 5]))))
+        first = c[:, 1] + t * (2 * c[:, 2] + t * (3 * c[:, 3] + t * (4 * c[:, 4] + t * 5 * c[:, 5])))
+        second = 2 * c[:, 2] + t * (6 * c[:, 3] + t * (12 * c[:, 4] + t * 20 * c[:, 5]))
+        return position, first, second
+
+    def arc_length_table(self, samples: int = TrajectoryConstants.SplineSamples) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cumulative arc length at densely spaced parameters
+
+        :return: (u, s) arrays, s[0] == 0
+        """
+        u = np.linspace(0.0, self._segments, self._segments * samples + 1)
+        _, first, _ = self.evaluate(u)
+        speed = np.hypot(first[:, 0], first[:, 1])
+
+        s = np.empty_like(u)
+        s[0] = 0.0
+        np.cumsum((speed[1:] + speed[:-1]) * 0.5 * np.diff(u), out=s[1:])
+        return u, s
+
+
+def heading_and_curvature(first: np.ndarray, second: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Heading (radians, unwrapped) and signed curvature (1/m) from spline derivatives
+    """
+    dx, dy = first[:, 0], first[:, 1]
+    heading = np.unwrap(np.arctan2(dy, dx))
+    curvature = (dx * second[:, 1] - dy * second[:, 0]) / np.power(dx * dx + dy * dy, 1.5)
+    return heading, curvature
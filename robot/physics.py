@@ -28,26 +28,277 @@
 #
 # Examples can be found at https://github.com/robotpy/examples
 
+
+import atexit
 import logging
+import os
+import time
+
+from typing import Any, Dict, Optional, Tuple
 
-from wpilib import Encoder, Field2d, SmartDashboard
-from wpilib.simulation import EncoderSim, DCMotorSim, DifferentialDrivetrainSim
+import numpy as np
+
+from wpilib import DriverStation, getDeployDirectory
+from wpilib.simulation import DifferentialDrivetrainSim, RoboRioSim
 from wpimath.geometry import Pose2d, Rotation2d
-from wpimath.kinematics import ChassisSpeeds, DifferentialDriveKinematics
+from wpimath.kinematics import ChassisSpeeds
 from wpimath.system.plant import DCMotor
-from wpimath.units import metersToFeet
-
-import hal.simulation
 
-from pyfrc.physics import drivetrains
 from pyfrc.physics.core import PhysicsInterface
-from pyfrc.physics.units import units
 
 from robot import MyRobot, RobotContainer
 from frc_2026.subsystems.xrp_differential_drive import XrpDifferentialDriveSubsystem
 from lib_6107.constants import XrpConstants
+from lib_6107.simulation.battery import BatterySim
+from lib_6107.simulation.constants import SimConstants
+from lib_6107.simulation.field_geometry import FieldGeometry
+from lib_6107.simulation.integrators import DrivetrainSystem, FixedStepIntegrator
+from lib_6107.simulation.sensors import WheelEncoderSim, XrpGyroSim
+from lib_6107.simulation.session_log import SessionRecorder, open_recorder
+from lib_6107.simulation.xrp_model import XrpDriveModel
+from lib_6107.telemetry.hot_log import HotLogger
+from lib_6107.telemetry.loop_timing import get_loop_timer
+from lib_6107.telemetry.publisher import DashboardPublisher, get_dashboard
 
 logger = logging.getLogger(__name__)
+_hot_log = HotLogger(logger)        # For update_sim(), which runs every tick
+
+
+def xrp_dc_motor(gearing: float = 1.0) -> DCMotor:
+    """
+    Create a wpimath DCMotor for an XRP motor.
+
+    The XrpConstants.Motor values are measured at the gearbox output shaft. Pass the
+    gearbox reduction to get the motor as seen before the gearbox, which is what
+    the wpilib simulation classes expect when they are also given the gearing.
+
+    :param gearing: Gear reduction to remove from the output shaft values
+    """
+    return DCMotor(XrpConstants.Motor.Voltage,                # Nominal voltage - Voltage at which the motor constants were measured.
+                   XrpConstants.Motor.StallTorque / gearing,  # Stall torque in N*m (approximation) - Torque when stalled.
+                   XrpConstants.Motor.StallCurrent,           # Stall current - Current draw when stalled.
+                   XrpConstants.Motor.FreeCurrent,            # Free Current - Current draw under no load.
+                   XrpConstants.Motor.FreeSpeed * gearing,    # Angular velocity under no load.
+                   XrpConstants.Motor.MotorCount)             # Number of motors in a gearbox.
+
+
+class PhysicsBackend:
+    """
+    Base class for the drivetrain physics models used by the PhysicsEngine.
+
+    A backend turns the left/right wheel commands into chassis speeds once per
+    tick and keeps track of how long each tick took so that fidelity can be
+    traded for simulation throughput.
+    """
+    name = "base"
+
+    def __init__(self, model: XrpDriveModel = None):
+        self._model = model or XrpDriveModel()
+        self._ticks = 0
+        self._total_ns = 0
+        self._max_ns = 0
+        self.left_speed = 0.0          # Wheel surface speeds in m/s
+        self.right_speed = 0.0
+        self.voltage = self._model.nominal_voltage     # Supply (bus) voltage for the motors
+
+    @property
+    def model(self) -> XrpDriveModel:
+        return self._model
+
+    @property
+    def ticks(self) -> int:
+        return self._ticks
+
+    @property
+    def average_tick_time(self) -> float:
+        """
+        Average time (seconds) spent in update() per tick
+        """
+        return self._total_ns / self._ticks * 1e-9 if self._ticks else 0.0
+
+    @property
+    def max_tick_time(self) -> float:
+        """
+        Longest time (seconds) spent in a single update()
+        """
+        return self._max_ns * 1e-9
+
+    @property
+    def wheel_speeds(self) -> Tuple[float, float]:
+        return self.left_speed, self.right_speed
+
+    def update(self, left: float, right: float, tm_diff: float) -> ChassisSpeeds:
+        """
+        Advance the drivetrain by tm_diff seconds
+
+        :param left:    Left wheel command [-1.0..1.0], forward is positive
+        :param right:   Right wheel command [-1.0..1.0], forward is positive
+        :param tm_diff: Time step in seconds
+
+        :return: Chassis speeds to move the robot by
+        """
+        start = time.perf_counter_ns()
+        speeds = self._update(left, right, tm_diff)
+        elapsed = time.perf_counter_ns() - start
+
+        self._ticks += 1
+        self._total_ns += elapsed
+        if elapsed > self._max_ns:
+            self._max_ns = elapsed
+
+        return speeds
+
+    def _update(self, left: float, right: float, tm_diff: float) -> ChassisSpeeds:
+        raise NotImplementedError("Backends must implement _update()")
+
+    def get_state(self) -> tuple:
+        """
+        Snapshot of the drivetrain state for a checkpoint. Backends with more state
+        than the wheel speeds extend the tuple.
+        """
+        return self.left_speed, self.right_speed, self.voltage
+
+    def set_state(self, state: tuple) -> None:
+        """
+        Restore a get_state() snapshot
+        """
+        self.left_speed, self.right_speed, self.voltage = state[:3]
+
+    def report(self) -> str:
+        return (f"{self.name}: {self._ticks} ticks, average: {self.average_tick_time * 1e6:.1f} us, "
+                f"max: {self.max_tick_time * 1e6:.1f} us")
+
+
+class AnalyticDrivetrainBackend(PhysicsBackend):
+    """
+    Lightweight, pint-free XRP drivetrain built from XrpDriveModel.
+
+    Each wheel is a first order DC motor + half chassis system that is stepped
+    exactly, so it is stable for any loop period.
+    """
+    name = SimConstants.Backend.Analytic
+
+    def _update(self, left: float, right: float, tm_diff: float) -> ChassisSpeeds:
+        model = self._model
+        decay = model.speed_decay(tm_diff)
+
+        left_target = model.steady_state_speed(max(-1.0, min(left, 1.0)) * self.voltage)
+        right_target = model.steady_state_speed(max(-1.0, min(right, 1.0)) * self.voltage)
+
+        self.left_speed = left_target + (self.left_speed - left_target) * decay
+        self.right_speed = right_target + (self.right_speed - right_target) * decay
+
+        return ChassisSpeeds((self.left_speed + self.right_speed) / 2, 0,
+                             (self.right_speed - self.left_speed) / model.track_width)
+
+
+class DrivetrainSimBackend(PhysicsBackend):
+    """
+    Full fidelity backend using the wpilib DifferentialDrivetrainSim state-space model
+    """
+    name = SimConstants.Backend.DrivetrainSim
+
+    def __init__(self):
+        super().__init__()
+        physical = XrpConstants.Physical
+
+        # Treat the chassis as a uniform box for its moment of inertia
+        moment_of_inertia = physical.MassWithBatteries * (physical.RobotWidth ** 2 + physical.RobotLength ** 2) / 12
+
+        self._sim = DifferentialDrivetrainSim(xrp_dc_motor(physical.GearReduction),
+                                              physical.GearReduction,
+                                              moment_of_inertia,
+                                              physical.MassWithBatteries,
+                                              physical.WheelDiameter / 2,
+                                              physical.TrackWidth)
+
+    @property
+    def drivetrain_sim(self) -> DifferentialDrivetrainSim:
+        return self._sim
+
+    def get_state(self) -> tuple:
+        sim = self._sim
+        pose = sim.getPose()
+        return super().get_state() + ((pose.X(), pose.Y(), pose.rotation().radians(),
+                                       sim.getLeftVelocity(), sim.getRightVelocity(),
+                                       sim.getLeftPosition(), sim.getRightPosition()),)
+
+    def set_state(self, state: tuple) -> None:
+        super().set_state(state)
+        self._sim.setState(np.array(state[3], dtype=float).reshape(7, 1))
+
+    def _update(self, left: float, right: float, tm_diff: float) -> ChassisSpeeds:
+        voltage = self.voltage
+        self._sim.setInputs(max(-1.0, min(left, 1.0)) * voltage,
+                            max(-1.0, min(right, 1.0)) * voltage)
+        self._sim.update(tm_diff)
+
+        self.left_speed = self._sim.getLeftVelocity()
+        self.right_speed = self._sim.getRightVelocity()
+
+        return ChassisSpeeds((self.left_speed + self.right_speed) / 2, 0,
+                             (self.right_speed - self.left_speed) / XrpConstants.Physical.TrackWidth)
+
+
+class IntegratedDrivetrainBackend(PhysicsBackend):
+    """
+    XRP model (pose and wheel speeds) stepped with a FixedStepIntegrator, so the
+    integration scheme, internal step and substeps can be chosen in SimConstants.
+    """
+    name = SimConstants.Backend.Integrated
+
+    def __init__(self, model: XrpDriveModel = None):
+        super().__init__(model)
+        self._integrator = FixedStepIntegrator(DrivetrainSystem(self._model),
+                                               SimConstants.IntegrationMethod,
+                                               SimConstants.IntegrationStep,
+                                               SimConstants.IntegrationSubsteps)
+        self._state = (0.0, 0.0, 0.0, 0.0, 0.0)
+
+    @property
+    def integrator(self) -> FixedStepIntegrator:
+        return self._integrator
+
+    def get_state(self) -> tuple:
+        return super().get_state() + (self._state, self._integrator.remainder)
+
+    def set_state(self, state: tuple) -> None:
+        super().set_state(state)
+        self._state, self._integrator.remainder = state[3], state[4]
+
+    def _update(self, left: float, right: float, tm_diff: float) -> ChassisSpeeds:
+        voltage = self.voltage
+        start = self._state
+        end = self._integrator.advance(start, (max(-1.0, min(left, 1.0)) * voltage,
+                                               max(-1.0, min(right, 1.0)) * voltage), tm_diff)
+        self._state = end
+        self.left_speed, self.right_speed = end[3], end[4]
+
+        if tm_diff <= 0:
+            return ChassisSpeeds()
+
+        # Express the integrated motion as the twist that the physics controller will
+        # apply over tm_diff, so the robot ends up exactly where the integrator put it
+        twist = Pose2d(start[0], start[1], Rotation2d(start[2])).log(Pose2d(end[0], end[1], Rotation2d(end[2])))
+        return ChassisSpeeds(twist.dx / tm_diff, twist.dy / tm_diff, twist.dtheta / tm_diff)
+
+
+PHYSICS_BACKENDS = {
+    AnalyticDrivetrainBackend.name: AnalyticDrivetrainBackend,
+    DrivetrainSimBackend.name: DrivetrainSimBackend,
+    IntegratedDrivetrainBackend.name: IntegratedDrivetrainBackend,
+}
+
+
+def create_backend(name: str = SimConstants.PhysicsBackend) -> PhysicsBackend:
+    """
+    Create the physics backend with the given name (see SimConstants.Backend)
+    """
+    try:
+        return PHYSICS_BACKENDS[name]()
+
+    except KeyError:
+        raise ValueError(f"Unknown physics backend '{name}', expected one of {sorted(PHYSICS_BACKENDS)}")
 
 
 class PhysicsEngine:
@@ -70,51 +321,158 @@ class PhysicsEngine:
         self._drive: XrpDifferentialDriveSubsystem = robot.container.drive
         self._controller = robot.container.controller
 
-        # NOTE: Depending on the library, the units may need to either be standard python types,
-        #       but in a few, they require Quantity objects created by the 'pint' moduled. It is
-        #       really a bit ad-hoc and some of the libraries want wpimath.units.* objectss, but'
-        #       those are alias for the python types and the libraries do not work.
-        def xrp_dc_motor() -> DCMotor:
-            return DCMotor(XrpConstants.Motor.Voltage,      # Nominal voltage - Voltage at which the motor constants were measured.
-                           XrpConstants.Motor.StallTorque,  # Stall torque in N*m (approximation) - Torque when stalled.
-                           XrpConstants.Motor.StallCurrent, # Stall current - Current draw when stalled.
-                           XrpConstants.Motor.FreeCurrent,  # Free Current - Current draw under no load.
-                           XrpConstants.Motor.FreeSpeed,    # Angular velocity under no load.
-                           XrpConstants.Motor.MotorCount)   # Number of motors in a gearbox.
-
-        # Initialize a two-motor drivetrain model
-        wheelbase = metersToFeet(XrpConstants.Physical.TrackWidth) * units.feet
-        speed = (XrpConstants.Motor.FreeSpeed * units.meters / units.seconds).to(units.fps)
-
-        self._drivetrain = drivetrains.TwoMotorDrivetrain(x_wheelbase=wheelbase,
-                                                          speed=speed,
-                                                          deadzone=drivetrains.linear_deadzone(0.1))
-        # Create simulated motors
-        self._left_motor: DCMotor = xrp_dc_motor()
-        self._right_motor: DCMotor = xrp_dc_motor()
-
-        # Create encoder simulators (12 CPR on motor output shaft, so 585 counts per wheel revolution)
-        # TODO: Investigate -> Encoders are accessed via SimDeviceSim in RobotPy for XRP
-        self._left_encoder_sim = EncoderSim(Encoder(XrpConstants.EncoderChannel.LeftChannel_A,
-                                                    XrpConstants.EncoderChannel.LeftChannel_B))
-        # self._left_encoder_distance = self._left_encoder_sim.getDistance()
-        # self._left_encoder_rate = self._left_encoder_sim.getRate()
-
-        self._right_encoder_sim = EncoderSim(Encoder(XrpConstants.EncoderChannel.RightChannel_A,
-                                                    XrpConstants.EncoderChannel.RightChannel_B))
-        # self._right_encoder_distance = self._right_encoder_sim.getDistance()
-        # self._right_encoder_rate = self._right_encoder_sim.getRate()
-        #
-        # # Track motor inputs (which are set in the main robot code)
-        # self._left_motor_input = 0.0
-        # self._right_motor_input = 0.0
+        # NOTE: The backends below work in plain SI floats. Some of the pyfrc helpers want
+        #       'pint' Quantity objects instead, so we avoid them here to keep the per-tick
+        #       cost down.
+        self._backend: PhysicsBackend = create_backend(SimConstants.PhysicsBackend)
+        logger.info(f"PhysicsEngine: using '{self._backend.name}' physics backend")
+
+        # Encoder simulators (12 CPR on motor output shaft, so 585 counts per wheel revolution).
+        # The robot code owns the Encoder objects, we only drive their simulation data.
+        self._left_encoder_sim = WheelEncoderSim(XrpConstants.EncoderChannel.LeftChannel_A, self._backend.model)
+        self._right_encoder_sim = WheelEncoderSim(XrpConstants.EncoderChannel.RightChannel_A, self._backend.model)
+
+        # Gyro simulator, writes yaw and yaw rate to the XRPGyro the drive subsystem created
+        self._gyro_sim = XrpGyroSim(SimConstants.GyroDriftRate, SimConstants.GyroNoise, SimConstants.GyroSeed)
+
+        # Battery: the motor currents sag the bus voltage, which limits the wheel speeds
+        self._battery = BatterySim(state_of_charge=SimConstants.BatteryStateOfCharge)
+        self._dc_motor: DCMotor = xrp_dc_motor()
+        self._backend.voltage = self._battery.voltage
+        self._autonomous = False
+        self._autonomous_start = 0.0
+        self._autonomous_energy = []          # (seconds, joules) for each autonomous routine run
+
+        # Walls and obstacles the robot footprint collides with
+        self._field_geometry: FieldGeometry = self._load_field_geometry()
 
         self._physics_controller.field.setRobotPose(Pose2d(0.5, 2.0, Rotation2d(0)))
 
-        # Set up field
-        self._field = Field2d()
-        SmartDashboard.putData("Field", self._field)
+        # The simulated pose is published to the dashboard as a Field2d layout by update_sim(),
+        # change-only and rate limited rather than as a Sendable that is re-sent every loop
+        self._dashboard: DashboardPublisher = get_dashboard()
+
+        # Optional per-tick session recording that headless.py can replay (--replay)
+        self._recorder: Optional[SessionRecorder] = open_recorder(os.environ.get("XRP_RECORD_SESSION",
+                                                                                 SimConstants.RecordSession))
+        if self._recorder is not None:
+            logger.info(f"PhysicsEngine: recording session to {self._recorder.path}")
+            atexit.register(self._recorder.close)
+
+        # Time the physics as a loop phase, pyfrc and headless.py call update_sim on the instance
+        self.update_sim = get_loop_timer().wrap("update_sim", self.update_sim)
+
+        # Ground truth pose alongside the robot's own telemetry
+        telemetry = self._container.telemetry
+        self._pose_channel = telemetry.register("sim/pose", width=3) if telemetry is not None else None
+
+    @staticmethod
+    def _load_field_geometry() -> FieldGeometry:
+        path = os.path.join(getDeployDirectory(), SimConstants.FieldFile)
+        try:
+            return FieldGeometry.load(path)
+
+        except FileNotFoundError:
+            logger.warning(f"Field file {path} not found, using an empty "
+                           f"{SimConstants.FieldWidth} x {SimConstants.FieldHeight} m field")
+            return FieldGeometry(SimConstants.FieldWidth, SimConstants.FieldHeight)
+
+    @property
+    def backend(self) -> PhysicsBackend:
+        return self._backend
+
+    @property
+    def field_geometry(self) -> FieldGeometry:
+        return self._field_geometry
+
+    @property
+    def recorder(self) -> Optional[SessionRecorder]:
+        return self._recorder
+
+    @property
+    def battery(self) -> BatterySim:
+        return self._battery
+
+    @property
+    def autonomous_energy(self) -> list:
+        """
+        (duration seconds, energy joules) of each completed autonomous routine
+        """
+        return self._autonomous_energy
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        Snapshot the simulated state: pose, drivetrain, sensors and battery.
+
+        The snapshot only holds immutable values, so taking one is cheap and it can
+        be restored any number of times. See lib_6107.simulation.checkpoint.
+        """
+        pose = self._physics_controller.field.getRobotPose()
+        return {
+            "backend": self._backend.name,
+            "pose": (pose.X(), pose.Y(), pose.rotation().radians()),
+            "drivetrain": self._backend.get_state(),
+            "left_encoder": self._left_encoder_sim.get_state(),
+            "right_encoder": self._right_encoder_sim.get_state(),
+            "gyro": self._gyro_sim.get_state(),
+            "battery": self._battery.get_state(),
+            "autonomous": (self._autonomous, self._autonomous_start, tuple(self._autonomous_energy)),
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a checkpoint() snapshot. The session recorder, if any, keeps appending.
+
+        :raises ValueError: if the snapshot was taken with a different physics backend
+        """
+        if state["backend"] != self._backend.name:
+            raise ValueError(f"Checkpoint is for the '{state['backend']}' physics backend, "
+                             f"this engine uses '{self._backend.name}'")
+
+        x, y, theta = state["pose"]
+        self._physics_controller.field.setRobotPose(Pose2d(x, y, Rotation2d(theta)))
+
+        self._backend.set_state(state["drivetrain"])
+        self._left_encoder_sim.set_state(state["left_encoder"])
+        self._right_encoder_sim.set_state(state["right_encoder"])
+        self._gyro_sim.set_state(state["gyro"])
+        self._battery.set_state(state["battery"])
+        RoboRioSim.setVInVoltage(self._backend.voltage)
 
+        self._autonomous, self._autonomous_start, energy = state["autonomous"]
+        self._autonomous_energy = list(energy)
+
+    def _update_battery(self, left: float, right: float, now: float, tm_diff: float) -> None:
+        """
+        Draw the motor and electronics current from the battery and feed the sagging
+        bus voltage back to the backend for the next tick.
+        """
+        backend, battery, motor = self._backend, self._battery, self._dc_motor
+        radius = backend.model.wheel_radius
+        voltage = backend.voltage
+
+        # The motor driver switches the supply at the commanded duty cycle, so the supply
+        # sees the motor current scaled by the command
+        current = XrpConstants.Battery.ElectronicsCurrent
+        for command, speed in ((left, backend.left_speed), (right, backend.right_speed)):
+            if command:
+                current += max(command * motor.current(speed / radius, command * voltage), 0.0)
+
+        backend.voltage = battery.update(current, tm_diff)
+        RoboRioSim.setVInVoltage(backend.voltage)
+
+        # Energy used by each autonomous routine
+        autonomous = DriverStation.isAutonomousEnabled()
+        if autonomous != self._autonomous:
+            self._autonomous = autonomous
+            if autonomous:
+                self._autonomous_start = now
+                battery.reset_energy()
+            else:
+                self._autonomous_energy.append((now - self._autonomous_start, battery.energy))
+                logger.info(f"autonomous used {battery.energy:.2f} J in {now - self._autonomous_start:.2f} s, "
+                            f"battery: {battery.voltage:.2f} V, {battery.state_of_charge * 100:.1f}%")
+                self._dashboard.publish_number("sim/autonomous_energy", battery.energy)
 
     def update_sim(self, now: float, tm_diff: float) -> None:
         """
@@ -128,62 +486,54 @@ class PhysicsEngine:
         controller_forward_speed = self._controller.getY()
         controller_rotation_speed = self._controller.getX()
 
-        log_it =  controller_forward_speed or controller_rotation_speed
-        if log_it:
-            logger.info(f"motor: left: {controller_forward_speed}, right: {controller_rotation_speed}")
-
-        left_encoder_distance = self._left_encoder_sim.getDistance()
-        left_encoder_rate = self._left_encoder_sim.getRate()
-
-        right_encoder_distance = self._right_encoder_sim.getDistance()
-        right_encoder_rate = self._right_encoder_sim.getRate()
-
-        # Gyro TODO: Future
-        #self.gyro = wpilib.simulation.AnalogGyroSim(robot.gyro)
+        log_it = _hot_log.enabled and (controller_forward_speed or controller_rotation_speed)
         if log_it:
-            logger.info(f"encoder: left: {left_encoder_distance}/{left_encoder_rate}, "
-                        f"right: {right_encoder_distance}/{right_encoder_rate}")
-        # Pressing the 'w' up, results in the left & right rate of change increasing a small amount
-        # that does not increase like speed. Change is .00556, but the distance for left
-        # and right stays at zero.
+            _hot_log.log("controller", forward=controller_forward_speed, rotation=controller_rotation_speed)
 
+        # Motor controllers report the value that was set, before any inversion, so
+        # these are the wheel commands with forward being positive on both sides.
         left, right = self._drive.left_motor.get(), self._drive.right_motor.get()
-        if left or right:
-            logger.info(f"XPRMotor: Speed, Left: {left}, right: {right}")
+        if _hot_log.enabled and (left or right):
+            _hot_log.log("motors", left=left, right=right)
 
-        #chassis_speed: ChassisSpeeds = self._drivetrain.calculate(controller_forward_speed, controller_rotation_speed)
-        chassis_speed: ChassisSpeeds = self._drivetrain.calculate(left, right)
-
-        wheel_speeds = DifferentialDriveKinematics(XrpConstants.Physical.TrackWidth).toWheelSpeeds(chassis_speed)
+        chassis_speed: ChassisSpeeds = self._backend.update(left, right, tm_diff)
         if log_it:
-            logger.info(f"chassis_speed: {chassis_speed.vx}/{chassis_speed.vy}/{chassis_speed.omega}")
-            logger.info(f"chassis_speed: {chassis_speed.vx_fps}/{chassis_speed.vy_fps}/{chassis_speed.omega}")
-            logger.info(f"wheel_speeds: {wheel_speeds}")
-        # Pressing the 'w' up, and holding does not change wheel or chassis speed
+            _hot_log.log("chassis", vx=chassis_speed.vx, vy=chassis_speed.vy, omega=chassis_speed.omega,
+                         wheel_speeds=self._backend.wheel_speeds)
 
         self._physics_controller.drive(chassis_speed, tm_diff)
+        self._update_battery(left, right, now, tm_diff)
+
+        if self._backend.ticks % SimConstants.CostReportInterval == 0:
+            logger.info(f"physics backend cost: {self._backend.report()}")
 
-        # optional: compute encoder
-        l_encoder = self._drivetrain.wheelSpeeds.left * tm_diff
-        r_encoder = self._drivetrain.wheelSpeeds.left * tm_diff
+        # Sensor simulation stage: feed the wheel travel back to the robot's encoders
+        self._left_encoder_sim.update(self._backend.left_speed, tm_diff)
+        self._right_encoder_sim.update(self._backend.right_speed, tm_diff)
 
         if log_it:
-            logger.info(f"encoder: left: {l_encoder}, right: {r_encoder}")
+            _hot_log.log("encoders", left_count=self._left_encoder_sim.count, left_rate=self._left_encoder_sim.rate,
+                         right_count=self._right_encoder_sim.count, right_rate=self._right_encoder_sim.rate)
 
-        pose = self._field.getRobotPose()
-        x = min(max(0, pose.X()), 17.5)
-        y = min(max(0, pose.Y()), 8)
+        # Keep the robot footprint out of the walls and obstacles
+        field = self._physics_controller.field
+        pose = field.getRobotPose()
         rotation = pose.rotation()
-        pose = self._field.setRobotPose(Pose2d(x, y,rotation))
-        # #
-        # transform = self._drivetrain.calculate(controller_forward_speed, controller_rotation_speed, tm_diff)
-        # self._physics_controller.move_robot(transform)
-
-        # optional: compute encoder
-        # l_encoder = self.drivetrain.l_position * ENCODER_TICKS_PER_FT
-        # r_encoder = self.drivetrain.r_position * ENCODER_TICKS_PER_FT
-
-        # FUTURE Update the gyro simulation
-        # -> FRC gyros are positive clockwise, but the returned pose is positive
-        #    counter-clockwise
-        #self.gyro.setAngle(-pose.rotation().degrees())
\ No newline at end of file
+        x, y, collided = self._field_geometry.resolve(pose.X(), pose.Y(), rotation.radians())
+        if collided:
+            pose = Pose2d(x, y, rotation)
+            field.setRobotPose(pose)
+
+        # Gyro: follows the simulated chassis rotation (collisions do not change the heading)
+        self._gyro_sim.update(chassis_speed.omega, tm_diff)
+
+        self._dashboard.publish_pose("Field", pose)
+
+        if self._pose_channel is not None:
+            self._pose_channel.write((pose.X(), pose.Y(), rotation.radians()))
+
+        if self._recorder is not None:
+            self._recorder.append(now, MyRobot.session_mode(), controller_rotation_speed, controller_forward_speed,
+                                  left, right, pose.X(), pose.Y(), rotation.radians(),
+                                  self._left_encoder_sim.measured_distance,
+                                  self._right_encoder_sim.measured_distance)
@@ -21,13 +21,24 @@ import sys
 
 from typing import Optional
 
+import numpy as np
+
 from commands2 import TimedCommandRobot, CommandScheduler
-from wpilib import RobotBase
+from wpilib import DriverStation, RobotBase
 
 from version import VERSION
 from frc_2026.robotcontainer import RobotContainer
+from lib_6107.commands.profiled_command import get_command_profiler
+from lib_6107.simulation.session_log import SessionMode
+from lib_6107.telemetry import hot_log
+from lib_6107.telemetry.constants import TelemetryConstants
+from lib_6107.telemetry.loop_timing import LoopTimer, get_loop_timer
+from lib_6107.telemetry.memory import MemoryManager, get_memory_manager
+from lib_6107.telemetry.recorder import TelemetryChannel
+from lib_6107.telemetry.publisher import get_dashboard
 
 logger = logging.getLogger(__name__)
+_hot_log = hot_log.HotLogger(logger, logging.WARNING, interval=1.0)
 
 class MyRobot(TimedCommandRobot):
     """
@@ -37,11 +48,28 @@ class MyRobot(TimedCommandRobot):
     has an implementation of robotPeriodic which runs the scheduler for you
     """
     def __init__(self):
+        # TimedCommandRobot registers CommandScheduler.run as a periodic callback when it
+        # is constructed, so the timed wrapper has to be in place before that. The scheduler
+        # is shared by every robot in the process, so it is only wrapped once.
+        scheduler = CommandScheduler.getInstance()
+        if not hasattr(scheduler.run, "__wrapped__"):
+            scheduler.run = get_loop_timer().wrap("CommandScheduler.run", scheduler.run)
+
         super().__init__()
 
         # Define / initialize all of our class variables
         self._container: Optional[RobotContainer] = None
         self._counter = 0
+        self._mode_channel: Optional[TelemetryChannel] = None
+
+        # Time each loop phase. The framework looks these methods up on the instance,
+        # so wrapping them here times every call without changing the methods.
+        self._loop_timer: LoopTimer = get_loop_timer()
+        for name in ("robotPeriodic", "disabledPeriodic", "autonomousPeriodic", "teleopPeriodic", "testPeriodic"):
+            setattr(self, name, self._loop_timer.wrap(name, getattr(self, name)))
+
+        # GC policy and GC pause / allocation tracking, shared by every robot in the process
+        self._memory: MemoryManager = get_memory_manager()
 
     def robotInit(self) -> None:
         """
@@ -56,6 +84,9 @@ class MyRobot(TimedCommandRobot):
         else:
             logger.setLevel(logging.ERROR)
 
+        # Pick up the log levels for the hot path loggers
+        hot_log.refresh_all()
+
         version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
         logger.info(f"Python: {version}, Software Version: {VERSION}")
 
@@ -63,10 +94,26 @@ class MyRobot(TimedCommandRobot):
         # autonomous chooser on the dashboard.
         self._container = RobotContainer()
 
+        # Robot mode alongside the subsystem telemetry, for per-mode analysis
+        if self._container.telemetry is not None:
+            self._mode_channel = self._container.telemetry.register("robot/mode", np.int8)
+
+        # Everything built so far lives for the whole run, keep the GC from rescanning it
+        if TelemetryConstants.Memory.FreezeAfterInit:
+            self._memory.freeze()
+
     @property
     def container(self) -> RobotContainer:
         return self._container
 
+    @property
+    def loop_timer(self) -> LoopTimer:
+        return self._loop_timer
+
+    @property
+    def memory(self) -> MemoryManager:
+        return self._memory
+
     def robotPeriodic(self) -> None:
         """
         Periodic code for all modes should go here.
@@ -76,6 +123,34 @@ class MyRobot(TimedCommandRobot):
         """
         self._counter += 1
 
+        overrun = self._loop_timer.mark_loop()
+        if overrun is not None and _hot_log.enabled:
+            _hot_log.log("overrun", loop=overrun.loop, busy_ms=overrun.busy * 1e3, phase=overrun.phase,
+                         phase_ms=overrun.phase_time * 1e3)
+
+        self._memory.loop()
+
+        if self._mode_channel is not None:
+            self._mode_channel.write(self.session_mode())
+
+        # Send the dashboard values that were held back by the rate limit
+        dashboard = get_dashboard()
+        dashboard.flush()
+        dashboard.publish_number("telemetry/dashboard_bytes_per_second", dashboard.bytes_per_second)
+
+    @staticmethod
+    def session_mode() -> int:
+        """
+        The current robot mode as a SessionMode value, as recorded in telemetry and session files
+        """
+        if not DriverStation.isEnabled():
+            return SessionMode.DISABLED
+
+        if DriverStation.isAutonomous():
+            return SessionMode.AUTONOMOUS
+
+        return SessionMode.TEST if DriverStation.isTest() else SessionMode.TELEOP
+
     def disabledInit(self) -> None:
         """
         Initialization code for disabled mode should go here.
@@ -85,6 +160,16 @@ class MyRobot(TimedCommandRobot):
         """
         logger.info("disabledInit: entry")
 
+        if self._loop_timer.loops:
+            logger.info(self._loop_timer.report())
+
+        profiler = get_command_profiler()
+        if profiler.profiles:
+            logger.info(profiler.report())
+
+        logger.info(self._memory.report())
+        logger.info(self._container.autonomous.report())
+
     def disabledPeriodic(self) -> None:
         """
         Periodic code for disabled mode should go here.
@@ -93,7 +178,11 @@ class MyRobot(TimedCommandRobot):
         new packet is received from the driver station and the robot is in disabled
         mode.
         """
-        pass
+        # With automatic GC off during the match, collect while the robot is disabled
+        self._memory.collect_if_due()
+
+        # Have the selected autonomous routine built by the time the robot is enabled
+        self._container.prewarm_autonomous()
 
     def disabledExit(self) -> None:
         """
@@ -112,8 +201,9 @@ class MyRobot(TimedCommandRobot):
         called each time the robot enters autonomous mode.
         """
         logger.info("autonomousInit: entry")
+        self._memory.match_started()
 
-        command = self._container.get_autonomous_command()
+        command = self._container.select_autonomous_command()
         if command:
             command.schedule()
 
@@ -125,7 +215,9 @@ class MyRobot(TimedCommandRobot):
         new packet is received from the driver station and the robot is in
         autonomous mode.
         """
-        pass
+        latency = self._container.autonomous.output_started(self._container.drive.output_time)
+        if latency is not None:
+            get_dashboard().publish_number("autonomous/start_latency_ms", latency * 1e3)
 
     def autonomousExit(self) -> None:
         """
@@ -148,6 +240,7 @@ class MyRobot(TimedCommandRobot):
         called each time the robot enters teleop mode.
         """
         logger.info("teleopInit: entry")
+        self._memory.match_started()
 
         command = self._container.get_autonomous_command()
         if command:
@@ -198,6 +291,7 @@ class MyRobot(TimedCommandRobot):
         called each time the robot enters test mode.
         """
         logger.info("testInit: entry")
+        self._memory.test_started()
 
         CommandScheduler.getInstance().cancelAll()
 
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Monte Carlo parameter sweep over the XrpConstants motor and chassis values.
+#
+# Several of the XRP constants (StallTorque, FreeCurrent, ...) are approximations.
+# This tool draws perturbed values for them, runs the headless simulation for each
+# sample on every core and writes the final poses and timing to a compact .npz
+# file so we can see how sensitive an autonomous routine is to those unknowns.
+#
+#   python sweep.py --samples 200 --mode autonomous --duration 15 --output sweep.npz
+#   python sweep.py --spec my_spec.json --workers 4
+#
+# A spec file maps 'Class.Field' names to a distribution:
+#
+#   {
+#       "Motor.StallTorque": ["uniform", 0.5, 1.5],
+#       "Physical.MassWithBatteries": ["normal", 0.26, 0.02]
+#   }
+#
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from lib_6107.constants import XrpConstants
+
+logger = logging.getLogger(__name__)
+
+# Default distributions. Each is (kind, a, b): uniform(a, b) or normal(mean=a, stddev=b)
+DEFAULT_SPEC: Dict[str, Tuple[str, float, float]] = {
+    "Motor.StallTorque": ("uniform", 0.5, 1.5),
+    "Motor.StallCurrent": ("normal", XrpConstants.Motor.StallCurrent, 0.1),
+    "Motor.FreeCurrent": ("uniform", 0.005, 0.05),
+    "Motor.FreeSpeed": ("normal", XrpConstants.Motor.FreeSpeed, 0.5),
+    "Physical.MassWithBatteries": ("normal", XrpConstants.Physical.MassWithBatteries, 0.02),
+    "Physical.WheelDiameter": ("normal", XrpConstants.Physical.WheelDiameter, 0.0005),
+    "Physical.TrackWidth": ("normal", XrpConstants.Physical.TrackWidth, 0.002),
+}
+
+SWEEPABLE_CLASSES = ("Physical", "Motor")
+
+# Columns of the per-sample result array
+RESULT_COLUMNS = ("x", "y", "theta", "sim_time", "wall_time")
+
+
+def draw_samples(spec: Dict[str, Sequence], count: int, seed: int) -> Tuple[List[str], np.ndarray]:
+    """
+    Draw the perturbed constant values for every sample
+
+    :return: The field names and a (count, len(names)) array of values
+    """
+    rng = np.random.default_rng(seed)
+    names = sorted(spec)
+    values = np.empty((count, len(names)))
+
+    for column, name in enumerate(names):
+        kind, a, b = spec[name]
+        if kind == "uniform":
+            values[:, column] = rng.uniform(a, b, count)
+        elif kind == "normal":
+            values[:, column] = rng.normal(a, b, count)
+        else:
+            raise ValueError(f"{name}: unknown distribution '{kind}', expected 'uniform' or 'normal'")
+
+    return names, values
+
+
+def apply_constants(names: Sequence[str], values: Sequence[float]) -> None:
+    """
+    Overwrite XrpConstants fields for this process.
+
+    The values are changed process wide, so robot code that derives anything from
+    XrpConstants (such as the encoder distance per pulse) sees them as well.
+    """
+    for name, value in zip(names, values):
+        class_name, _, field = name.partition(".")
+        if class_name not in SWEEPABLE_CLASSES:
+            raise ValueError(f"{name}: only {SWEEPABLE_CLASSES} constants can be swept")
+
+        constants = getattr(XrpConstants, class_name)
+        if not hasattr(constants, field):
+            raise ValueError(f"{name}: XrpConstants.{class_name} has no field '{field}'")
+
+        setattr(constants, field, float(value))
+
+
+def run_sample(index: int, names: Sequence[str], values: Sequence[float], mode: str,
+               duration: float, seed: int) -> Tuple[int, List[float]]:
+    """
+    Run one headless simulation with perturbed constants. Runs in a worker process.
+
+    :return: The sample index and its RESULT_COLUMNS values
+    """
+    apply_constants(names, values)
+
+    # One telemetry file per sample is not useful for a sweep
+    from lib_6107.telemetry.constants import TelemetryConstants
+    TelemetryConstants.Recorder.Enabled = False
+
+    from headless import HeadlessSimulation
+
+    sim = HeadlessSimulation(deterministic=True, seed=seed)
+    wall_start = time.perf_counter()
+    sim.start()
+    try:
+        if mode == "match":
+            sim.run_match()
+        else:
+            sim.run(duration, mode)
+
+        pose = sim.pose
+
+    finally:
+        sim.close()
+
+    return index, [pose.X(), pose.Y(), pose.rotation().radians(), sim.time, time.perf_counter() - wall_start]
+
+
+def run_sweep(spec: Dict[str, Sequence], count: int, mode: str, duration: float,
+              seed: int = 0, workers: int = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Run the whole sweep on a process pool
+
+    :return: The swept field names, the (count, fields) sample values and the
+             (count, len(RESULT_COLUMNS)) results. Failed samples are NaN.
+    """
+    names, values = draw_samples(spec, count, seed)
+    results = np.full((count, len(RESULT_COLUMNS)), np.nan)
+
+    # The HAL and the command scheduler are per-process singletons, so every sample
+    # gets a fresh process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=context,
+                             max_tasks_per_child=1) as pool:
+        futures = [pool.submit(run_sample, index, names, values[index].tolist(), mode, duration, seed + index)
+                   for index in range(count)]
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                index, row = future.result()
+                results[index] = row
+
+            except Exception as e:
+                logger.error(f"sweep sample failed: {e}")
+
+            if done % max(1, count // 10) == 0:
+                logger.info(f"sweep: {done}/{count} samples complete")
+
+    return names, values, results
+
+
+def summarize(names: Sequence[str], values: np.ndarray, results: np.ndarray) -> str:
+    """
+    Human readable statistics of the final poses and timing
+    """
+    ok = ~np.isnan(results).any(axis=1)
+    lines = [f"{ok.sum()} of {len(results)} samples completed"]
+    if not ok.any():
+        return "\n".join(lines)
+
+    good = results[ok]
+    for column, name in enumerate(RESULT_COLUMNS):
+        data = good[:, column]
+        p5, p50, p95 = np.percentile(data, (5, 50, 95))
+        lines.append(f"  {name:>10}: mean {data.mean():9.4f}  std {data.std():8.4f}  "
+                     f"p5 {p5:9.4f}  p50 {p50:9.4f}  p95 {p95:9.4f}")
+
+    # Which constant moves the final position the most
+    distance = np.hypot(good[:, 0] - np.median(good[:, 0]), good[:, 1] - np.median(good[:, 1]))
+    if distance.std() > 0:
+        lines.append("  Correlation of each constant with the final position error:")
+        for column, name in enumerate(names):
+            samples = values[ok, column]
+            corr = np.corrcoef(samples, distance)[0, 1] if samples.std() > 0 else 0.0
+            lines.append(f"    {name:>28}: {corr:+.3f}")
+
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Monte Carlo sweep of XrpConstants with the headless simulator")
+    parser.add_argument("--samples", type=int, default=100, help="Number of samples to run")
+    parser.add_argument("--spec", help="JSON file of 'Class.Field': [kind, a, b] distributions")
+    parser.add_argument("--mode", default="autonomous",
+                        choices=("match", "autonomous", "teleop", "test", "disabled"),
+                        help="Robot mode to run each sample in")
+    parser.add_argument("--duration", type=float, default=15.0, help="Simulated seconds per sample")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the samples and the simulations")
+    parser.add_argument("--output", default="sweep.npz", help="Result file (.npz)")
+    parser.add_argument("--log-level", default="INFO", help="Python logging level")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper())
+
+    spec = DEFAULT_SPEC
+    if args.spec:
+        with open(args.spec, "r") as f:
+            spec = json.load(f)
+
+    wall_start = time.perf_counter()
+    names, values, results = run_sweep(spec, args.samples, args.mode, args.duration,
+                                       seed=args.seed, workers=args.workers)
+    wall = time.perf_counter() - wall_start
+
+    np.savez_compressed(args.output, names=np.array(names), values=values, results=results,
+                        columns=np.array(RESULT_COLUMNS), mode=args.mode, duration=args.duration,
+                        seed=args.seed)
+
+    print(f"Ran {args.samples} samples in {wall:.1f} s, results written to {args.output}")
+    print(summarize(names, values, results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
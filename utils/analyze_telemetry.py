@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Offline analysis of recorded robot telemetry and simulation sessions.
+#
+# Loads any number of files as NumPy column arrays and reports, per file and
+# over all of them together:
+#
+#   - path tracking error (follower reference and odometry vs ground truth)
+#   - wheel slip (encoder travel vs the ground truth pose)
+#   - loop time statistics
+#   - a summary per robot mode
+#
+# Session files (physics.py, XRP_RECORD_SESSION) are memory mapped directly.
+# Telemetry files (lib_6107.telemetry.recorder) are compressed, so the first
+# analysis unpacks them into a '<file>.columns' directory of .npy files that
+# later runs memory map.
+#
+#   python utils/analyze_telemetry.py robot/telemetry/*.xtlm sessions/
+#
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "robot"))
+
+from lib_6107.simulation.session_log import SESSION_MAGIC, SessionMode, read_session    # noqa: E402
+
+TELEMETRY_MAGIC = b"XRPTLM1\0"          # lib_6107.telemetry.recorder, which needs wpilib to import
+
+# Telemetry channels the analysis uses
+DISTANCE_CHANNEL = "drive/distance"         # Encoder distances (left, right)
+OUTPUT_CHANNEL = "drive/output"             # Motor outputs (left, right)
+MODE_CHANNEL = "robot/mode"                 # SessionMode value, written every loop
+GROUND_TRUTH_CHANNEL = "sim/pose"           # Simulated pose (x, y, theta)
+ODOMETRY_CHANNEL = "drive/pose"             # Robot's pose estimate (x, y, theta)
+REFERENCE_CHANNEL = "follower/reference"    # Trajectory follower's reference pose (x, y, theta)
+
+MODE_NAMES = {SessionMode.DISABLED: "disabled", SessionMode.AUTONOMOUS: "autonomous",
+              SessionMode.TELEOP: "teleop", SessionMode.TEST: "test"}
+
+SLIP_THRESHOLD = 0.0005                 # Meters per tick of encoder vs ground truth difference counted as slip
+LOOP_PERIOD = 0.020
+
+
+class Run:
+    """
+    Column arrays of one recorded run, one row per robot loop
+    """
+    def __init__(self, path: str, time: np.ndarray, mode: np.ndarray,
+                 left_distance: np.ndarray, right_distance: np.ndarray,
+                 left_output: np.ndarray, right_output: np.ndarray,
+                 pose: Optional[np.ndarray] = None, odometry: Optional[np.ndarray] = None,
+                 reference: Optional[np.ndarray] = None):
+        """
+        :param pose:      Ground truth (N, 3) x, y, theta, if known
+        :param odometry:  Robot's own (N, 3) pose estimate, if recorded
+        :param reference: Follower reference (N, 3) pose, if recorded
+        """
+        self.path = path
+        self.time = time
+        self.mode = mode
+        self.left_distance = left_distance
+        self.right_distance = right_distance
+        self.left_output = left_output
+        self.right_output = right_output
+        self.pose = pose
+        self.odometry = odometry
+        self.reference = reference
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+
+def load_session(path: str) -> Run:
+    """
+    Memory map a session file recorded by the physics engine
+    """
+    records = read_session(path)
+    pose = np.column_stack((records["x"], records["y"], records["theta"])) if len(records) else None
+    return Run(path, records["time"], records["mode"], records["left_distance"], records["right_distance"],
+               records["left_output"], records["right_output"], pose=pose)
+
+
+def telemetry_columns(path: str) -> Dict[str, tuple]:
+    """
+    Channel name -> (times, values) for a telemetry file, memory mapped from the
+    column cache next to it. The cache is rebuilt when the file changes.
+    """
+    cache = path + ".columns"
+    index_path = os.path.join(cache, "index.json")
+    stat = os.stat(path)
+    source = {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    index = None
+    if os.path.exists(index_path):
+        with open(index_path, "r") as f:
+            index = json.load(f)
+        if index.get("source") != source:
+            index = None
+
+    if index is None:
+        from lib_6107.telemetry.recorder import read_telemetry
+
+        os.makedirs(cache, exist_ok=True)
+        index = {"source": source, "channels": {}}
+        for number, (name, (times, values)) in enumerate(read_telemetry(path).items()):
+            np.save(os.path.join(cache, f"{number}.times.npy"), times)
+            np.save(os.path.join(cache, f"{number}.values.npy"), values)
+            index["channels"][name] = number
+
+        with open(index_path, "w") as f:
+            json.dump(index, f)
+
+    return {name: (np.load(os.path.join(cache, f"{number}.times.npy"), mmap_mode="r"),
+                   np.load(os.path.join(cache, f"{number}.values.npy"), mmap_mode="r"))
+            for name, number in index["channels"].items()}
+
+
+def _resample(channel: Optional[tuple], times: np.ndarray, hold: bool = True) -> Optional[np.ndarray]:
+    """
+    Linearly interpolate an (N, k) channel onto other timestamps
+
+    :param hold: Hold the first and last sample outside the channel's time span,
+                 otherwise those rows are NaN
+    """
+    if channel is None or len(channel[0]) == 0:
+        return None
+
+    source_times, values = channel
+    values = np.asarray(values, dtype=np.float64).reshape(len(source_times), -1)
+    columns = [np.interp(times, source_times, values[:, column]) for column in range(values.shape[1])]
+
+    # Interpolate the heading on the unwrapped angle
+    if values.shape[1] == 3:
+        columns[2] = np.interp(times, source_times, np.unwrap(values[:, 2]))
+
+    resampled = np.column_stack(columns)
+    if not hold:
+        resampled[(times < source_times[0]) | (times > source_times[-1])] = np.nan
+
+    return resampled
+
+
+def load_telemetry(path: str) -> Run:
+    """
+    Load a robot telemetry file onto the time base of the drive distance channel
+    """
+    channels = telemetry_columns(path)
+    if DISTANCE_CHANNEL not in channels:
+        raise ValueError(f"{path}: no '{DISTANCE_CHANNEL}' channel")
+
+    times, distance = channels[DISTANCE_CHANNEL]
+
+    mode = np.full(len(times), SessionMode.DISABLED, dtype=np.int8)
+    if MODE_CHANNEL in channels and len(channels[MODE_CHANNEL][0]):
+        mode_times, modes = channels[MODE_CHANNEL]
+        mode = np.asarray(modes)[np.clip(np.searchsorted(mode_times, times, side="right") - 1, 0, None)]
+
+    output = _resample(channels.get(OUTPUT_CHANNEL), times)
+    if output is None:
+        output = np.zeros((len(times), 2))
+
+    return Run(path, times, mode, distance[:, 0], distance[:, 1], output[:, 0], output[:, 1],
+               pose=_resample(channels.get(GROUND_TRUTH_CHANNEL), times),
+               odometry=_resample(channels.get(ODOMETRY_CHANNEL), times),
+               reference=_resample(channels.get(REFERENCE_CHANNEL), times, hold=False))
+
+
+def load(path: str) -> Run:
+    with open(path, "rb") as f:
+        magic = f.read(8)
+
+    if magic == SESSION_MAGIC:
+        return load_session(path)
+
+    if magic == TELEMETRY_MAGIC:
+        return load_telemetry(path)
+
+    raise ValueError(f"{path}: not a session or telemetry file")
+
+
+def expand(paths: Iterable[str]) -> List[str]:
+    """
+    Files, directories (searched recursively) and glob patterns to a list of files
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in ("**/*.xrps", "**/*.xtlm"):
+                files.extend(sorted(glob.glob(os.path.join(path, pattern), recursive=True)))
+        else:
+            files.extend(sorted(glob.glob(path)) or [path])
+    return files
+
+
+def tick_table(run: Run, track_width: float) -> Dict[str, np.ndarray]:
+    """
+    Per-tick quantities (one row per interval between loops) for a run
+    """
+    n = len(run) - 1
+    if n < 1:
+        return {}
+
+    mode = np.asarray(run.mode[1:], dtype=np.int64)
+    dt = np.diff(run.time)
+    encoder_left = np.diff(run.left_distance)
+    encoder_right = np.diff(run.right_distance)
+    output = (np.abs(run.left_output[1:]) + np.abs(run.right_output[1:])) / 2
+
+    table = {"dt": dt, "mode": mode, "encoder_left": encoder_left, "encoder_right": encoder_right,
+             "output": output}
+
+    nan = np.full(n, np.nan)
+    if run.pose is not None:
+        pose = np.asarray(run.pose)
+        heading = np.unwrap(pose[:, 2])
+        mid_heading = (heading[1:] + heading[:-1]) / 2
+        dx, dy = np.diff(pose[:, 0]), np.diff(pose[:, 1])
+        forward = dx * np.cos(mid_heading) + dy * np.sin(mid_heading)
+        turn = np.diff(heading) * track_width / 2
+
+        table["travel"] = np.hypot(dx, dy)
+        table["slip_left"] = encoder_left - (forward - turn)
+        table["slip_right"] = encoder_right - (forward + turn)
+
+        # The follower only runs in autonomous, anywhere else there is no path to track
+        tracking = nan
+        if run.reference is not None:
+            tracking = np.hypot(run.reference[1:, 0] - pose[1:, 0], run.reference[1:, 1] - pose[1:, 1])
+            tracking[mode != SessionMode.AUTONOMOUS] = np.nan
+
+        table["tracking"] = tracking
+        table["odometry"] = (np.hypot(run.odometry[1:, 0] - pose[1:, 0], run.odometry[1:, 1] - pose[1:, 1])
+                             if run.odometry is not None else nan)
+    else:
+        table["travel"] = (np.abs(encoder_left) + np.abs(encoder_right)) / 2
+        table["slip_left"] = table["slip_right"] = table["tracking"] = table["odometry"] = nan
+
+    return table
+
+
+def concatenate(tables: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    tables = [table for table in tables if table]
+    if not tables:
+        return {}
+    return {key: np.concatenate([table[key] for table in tables]) for key in tables[0]}
+
+
+def _stats(values: np.ndarray) -> str:
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return "n/a"
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return f"mean {values.mean():.4f}  p50 {p50:.4f}  p95 {p95:.4f}  p99 {p99:.4f}  max {values.max():.4f}"
+
+
+def summarize(table: Dict[str, np.ndarray], period: float = LOOP_PERIOD) -> str:
+    if not table:
+        return "  no data"
+
+    dt = table["dt"]
+    lines = [f"  {len(dt)} loops, {dt.sum():.1f} s"]
+
+    loop_ms = dt * 1e3
+    p50, p95, p99 = np.percentile(loop_ms, (50, 95, 99))
+    late = int(np.count_nonzero(dt > 1.5 * period))
+    lines.append(f"  loop time (ms): p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {loop_ms.max():.2f}, "
+                 f"{late} loops over {1.5 * period * 1e3:.0f} ms")
+
+    lines.append(f"  path tracking error (m): {_stats(table['tracking'])}")
+    lines.append(f"  odometry error (m):      {_stats(table['odometry'])}")
+
+    slip = np.concatenate((table["slip_left"], table["slip_right"]))
+    if not np.isnan(slip).all():
+        encoder = np.abs(np.concatenate((table["encoder_left"], table["encoder_right"]))).sum()
+        slipping = np.count_nonzero(np.abs(slip) > SLIP_THRESHOLD) / len(slip)
+        lines.append(f"  wheel slip: {np.abs(slip).sum():.3f} m total, "
+                     f"{np.abs(slip).sum() / encoder * 100 if encoder else 0.0:.1f}% of encoder travel, "
+                     f"{slipping * 100:.1f}% of wheel ticks over {SLIP_THRESHOLD * 1e3:.1f} mm")
+
+    lines.append(f"  {'mode':>10} {'time s':>8} {'dist m':>8} {'speed m/s':>10} {'|output|':>9} "
+                 f"{'slip %':>7} {'track m':>8}")
+    for mode in np.unique(table["mode"]):
+        mask = table["mode"] == mode
+        duration = table["dt"][mask].sum()
+        distance = table["travel"][mask].sum()
+        encoder = (np.abs(table["encoder_left"][mask]) + np.abs(table["encoder_right"][mask])).sum()
+        slip = np.abs(table["slip_left"][mask]).sum() + np.abs(table["slip_right"][mask]).sum()
+        tracking = table["tracking"][mask]
+        tracking = np.nanmean(tracking) if not np.isnan(tracking).all() else math.nan
+
+        lines.append(f"  {MODE_NAMES.get(int(mode), str(mode)):>10} {duration:8.1f} {distance:8.2f} "
+                     f"{distance / duration if duration else 0.0:10.3f} {table['output'][mask].mean():9.3f} "
+                     f"{slip / encoder * 100 if encoder else 0.0:7.1f} {tracking:8.4f}")
+
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze recorded robot telemetry and simulation sessions")
+    parser.add_argument("paths", nargs="+", help="Session/telemetry files, directories or glob patterns")
+    parser.add_argument("--track-width", type=float, default=None,
+                        help="Track width (m) for the slip analysis, defaults to XrpConstants")
+    parser.add_argument("--period", type=float, default=LOOP_PERIOD, help="Robot loop period in seconds")
+    parser.add_argument("--quiet", action="store_true", help="Only print the combined summary")
+    args = parser.parse_args(argv)
+
+    track_width = args.track_width
+    if track_width is None:
+        from lib_6107.constants import XrpConstants
+        track_width = XrpConstants.Physical.TrackWidth
+
+    files = expand(args.paths)
+    tables = []
+    for path in files:
+        try:
+            table = tick_table(load(path), track_width)
+
+        except (OSError, ValueError) as e:
+            print(f"{path}: skipped, {e}", file=sys.stderr)
+            continue
+
+        tables.append(table)
+        if not args.quiet:
+            print(path)
+            print(summarize(table, args.period))
+
+    if len(tables) > 1 or args.quiet:
+        print(f"All {len(tables)} runs")
+        print(summarize(concatenate(tables), args.period))
+
+    return 0 if tables else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())